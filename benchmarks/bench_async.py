@@ -0,0 +1,145 @@
+"""
+Throughput of the generated async CRUD routes vs. the sync ones, through WSGI.
+
+Builds one app with `register_crud_routes` over a `BaseService` and one with
+`register_async_crud_routes` over an `AsyncBaseService`, both for `Role`, and
+sends them the same requests through the WSGI interface: alternately a page
+of 20 roles and one role by id. At every concurrency level both apps get that
+many worker threads, like a threaded WSGI server. Reports requests per second.
+
+This measures what the shipped async routes deliver: Flask runs every async
+view on its own event loop inside the worker thread, so the async engine
+uses `NullPool` as `dev_kit.web.async_routing` requires (and is warmed up
+with one connection), and each request opens its own connection. The sync
+engine pools one connection per worker.
+Conditional responses are turned off on the sync routes, which the async
+routes don't have.
+
+SQLite has no network round trips, so its numbers mostly show the overhead of
+the async machinery. Point the benchmark at a networked database to include
+connection setup and query latency:
+
+    BENCH_SYNC_URL=postgresql+psycopg://... BENCH_ASYNC_URL=postgresql+asyncpg://... \
+        python benchmarks/bench_async.py
+
+Run with (needs the `async` extra and aiosqlite):
+    python benchmarks/bench_async.py
+"""
+
+import asyncio
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from apiflask import APIBlueprint, APIFlask
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_scoped_session, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from dev_kit.async_services import AsyncBaseService
+from dev_kit.modules.users.models import Base, Role
+from dev_kit.modules.users.schemas import role_schemas
+from dev_kit.services import BaseService
+from dev_kit.web.async_routing import register_async_crud_routes
+from dev_kit.web.routing import register_crud_routes
+
+ROWS = 1000
+REQUESTS = 2000
+CONCURRENCY = (1, 8, 32)
+PUBLIC = {"auth_required": False}
+
+
+def seed(url: str) -> None:
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with sessionmaker(engine)() as session:
+        session.add_all(Role(name=f"role{i:04d}", display_name=f"Role {i}") for i in range(ROWS))
+        session.commit()
+    engine.dispose()
+
+
+def make_sync_app(url: str, workers: int):
+    engine = create_engine(url, pool_size=workers, max_overflow=0)
+    session = scoped_session(sessionmaker(engine))
+    app = APIFlask(__name__)
+    bp = APIBlueprint("roles", __name__, url_prefix="/roles")
+    register_crud_routes(
+        bp=bp,
+        service=BaseService(model=Role, db_session=session),
+        schemas=role_schemas,
+        entity_name="role",
+        id_field="id",
+        routes_config={
+            "list": {**PUBLIC, "conditional": False},
+            "get": {**PUBLIC, "conditional": False},
+        },
+    )
+    app.register_blueprint(bp)
+    app.teardown_appcontext(lambda exc: session.remove())
+    return app, engine.dispose
+
+
+async def warm_up(engine) -> None:
+    async with engine.connect():
+        pass
+
+
+def make_async_app(url: str):
+    engine = create_async_engine(url, poolclass=NullPool)
+    # See `dev_kit.web.async_routing`: the first connection must not race others
+    asyncio.run(warm_up(engine))
+    session = async_scoped_session(async_sessionmaker(engine), scopefunc=asyncio.current_task)
+    app = APIFlask(__name__)
+    bp = APIBlueprint("roles", __name__, url_prefix="/roles")
+    register_async_crud_routes(
+        bp=bp,
+        service=AsyncBaseService(model=Role, db_session=session),
+        schemas=role_schemas,
+        entity_name="role",
+        id_field="id",
+        routes_config={"list": PUBLIC, "get": PUBLIC},
+    )
+    app.register_blueprint(bp)
+    return app, lambda: asyncio.run(engine.dispose())
+
+
+def bench(app, workers: int) -> float:
+    def handle(i):
+        if i % 2:
+            url = f"/roles/{random.randint(1, ROWS)}"
+        else:
+            url = f"/roles/?page={random.randint(1, ROWS // 20)}&per_page=20"
+        resp = app.test_client().get(url)
+        assert resp.status_code == 200, resp.status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(workers) as pool:
+        list(pool.map(handle, range(REQUESTS)))
+    return REQUESTS / (time.perf_counter() - started)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        sync_url = os.environ.get("BENCH_SYNC_URL", f"sqlite:///{path}")
+        async_url = os.environ.get("BENCH_ASYNC_URL", f"sqlite+aiosqlite:///{path}")
+        seed(sync_url)
+
+        print(f"{REQUESTS} requests against {sync_url.split(':')[0]}")
+        print(f"{'workers':>8} {'sync (req/s)':>13} {'async (req/s)':>14} {'ratio':>6}")
+        for workers in CONCURRENCY:
+            sync_app, dispose_sync = make_sync_app(sync_url, workers)
+            async_app, dispose_async = make_async_app(async_url)
+            sync_rps = bench(sync_app, workers)
+            async_rps = bench(async_app, workers)
+            dispose_sync()
+            dispose_async()
+            print(f"{workers:>8} {sync_rps:>13.0f} {async_rps:>14.0f} {async_rps / sync_rps:>5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
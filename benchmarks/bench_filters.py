@@ -0,0 +1,122 @@
+"""
+Micro-benchmark: compiled filter plans vs. the previous per-request filter path.
+
+Builds 1,000 distinct field/operator combinations against the `User` model and
+reports two timings for each path:
+
+- build: turning a filters dict into a filtered Query (the step the filter
+  plan replaces);
+- execute: the same plus running the statement against an empty in-memory
+  table, i.e. the compiled-statement cache lookup and parameter binding that
+  a real list request pays, without row fetching.
+
+Run with:
+    python benchmarks/bench_filters.py
+"""
+
+import itertools
+import random
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from dev_kit.database.filters import compile_filter_plan
+from dev_kit.modules.users.models import Base, User
+
+# Raw query-string values, as the list route receives them.
+FIELDS = {
+    "id": "5",
+    "uuid": "0d6c1a9e-0000-4000-8000-000000000000",
+    "username": "alice",
+    "password_hash": "x",
+    "is_active": "true",
+    "created_at": "2024-01-01T00:00:00",
+    "updated_at": "2024-01-01T00:00:00",
+    "deleted_at": "2024-03-01T00:00:00",
+    "last_login_at": "2024-06-01T00:00:00",
+}
+TEXT_FIELDS = {"uuid", "username", "password_hash"}
+COMPARISONS = ["", "__ne", "__lt", "__lte", "__gt", "__gte", "__in"]
+N_COMBINATIONS = 1000
+ROUNDS = 5
+# Large enough that every combination stays in the compiled-statement cache.
+QUERY_CACHE_SIZE = 4 * N_COMBINATIONS
+
+
+def legacy_apply_filters(model, query, filters):
+    """The filter path as it was before filter plans were introduced."""
+    for key, value in filters.items():
+        parts = key.split("__")
+        field_name = parts[0]
+        op = parts[1] if len(parts) > 1 else "eq"
+        if not hasattr(model, field_name):
+            continue
+        column = getattr(model, field_name)
+        if op == "in":
+            if isinstance(value, str):
+                parsed = [v for v in (x.strip() for x in value.split(",")) if v]
+            else:
+                parsed = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            query = query.filter(column.in_(parsed))
+        elif op == "like":
+            query = query.filter(column.like(f"%{value}%"))
+        elif op == "ilike":
+            query = query.filter(column.ilike(f"%{value}%"))
+        else:
+            attr = {
+                "eq": "__eq__",
+                "ne": "__ne__",
+                "lt": "__lt__",
+                "lte": "__le__",
+                "gt": "__gt__",
+                "gte": "__ge__",
+            }[op]
+            query = query.filter(getattr(column, attr)(value))
+    return query
+
+
+def compiled_apply_filters(model, query, filters):
+    clauses = compile_filter_plan(model).build(filters, lambda op: None)
+    return query.filter(*clauses) if clauses else query
+
+
+def make_workload(seed: int = 42):
+    rng = random.Random(seed)
+    keys = [f + op for f, op in itertools.product(FIELDS, COMPARISONS)]
+    keys += [f + op for f, op in itertools.product(TEXT_FIELDS, ["__like", "__ilike"])]
+    workload = []
+    for _ in range(N_COMBINATIONS):
+        chosen = rng.sample(keys, rng.randint(1, 4))
+        workload.append({k: FIELDS[k.split("__")[0]] for k in chosen})
+    return workload
+
+
+def run(apply, session, workload, execute: bool = True) -> float:
+    started = time.perf_counter()
+    for filters in workload:
+        query = apply(User, session.query(User), filters)
+        if execute:
+            query.all()
+    return time.perf_counter() - started
+
+
+def main():
+    engine = create_engine("sqlite:///:memory:", query_cache_size=QUERY_CACHE_SIZE)
+    Base.metadata.create_all(engine)
+    workload = make_workload()
+    with Session(engine) as session:
+        compile_filter_plan(User)  # plan compilation happens at repository construction
+        run(compiled_apply_filters, session, workload)  # warm the compiled-statement cache
+        for name, apply in (("legacy", legacy_apply_filters), ("compiled", compiled_apply_filters)):
+            build = min(run(apply, session, workload, execute=False) for _ in range(ROUNDS))
+            execute = min(run(apply, session, workload) for _ in range(ROUNDS))
+            print(
+                f"{name:>9}: build {build / N_COMBINATIONS * 1e6:6.1f} us/query, "
+                f"execute {execute / N_COMBINATIONS * 1e6:6.1f} us/query "
+                f"(best of {ROUNDS} over {N_COMBINATIONS} combinations)"
+            )
+
+
+if __name__ == "__main__":
+    main()
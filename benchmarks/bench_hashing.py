@@ -0,0 +1,35 @@
+"""
+Password verification cost per hashing policy on this machine.
+
+For each policy, reports the median time to verify one password and the
+resulting logins per second a single core (one hashing worker) can sustain.
+Multiply by `HASHING_MAX_WORKERS` to estimate the login capacity of a process.
+
+Run with:
+    python benchmarks/bench_hashing.py [method ...]
+
+e.g. `python benchmarks/bench_hashing.py scrypt:16384:8:1 pbkdf2:sha256:600000`.
+"""
+
+import sys
+
+from dev_kit.modules.users.hashing import HashingPolicy, measure_verify_latency
+
+DEFAULT_METHODS = [
+    "scrypt:32768:8:1",  # werkzeug's default
+    "scrypt:16384:8:1",
+    "pbkdf2:sha256:1000000",  # werkzeug's default for pbkdf2
+    "pbkdf2:sha256:600000",
+    "pbkdf2:sha512:210000",
+]
+
+
+def main(methods):
+    print(f"{'policy':<26} {'verify (ms)':>12} {'logins/s/core':>14}")
+    for method in methods:
+        latency = measure_verify_latency(HashingPolicy(method))
+        print(f"{method:<26} {latency * 1000:>12.1f} {1 / latency:>14.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or DEFAULT_METHODS)
@@ -0,0 +1,65 @@
+"""
+Cost of recording a latency observation: the thread-sharded `Histogram` vs.
+the same histogram guarded by one lock shared by all threads.
+
+Each thread records OBSERVATIONS values; reports observations per second at
+every thread count. The recording path is what runs on every request, so it
+should stay flat as threads are added.
+
+Run with:
+    python benchmarks/bench_metrics.py
+"""
+
+import random
+import threading
+import time
+from bisect import bisect_left
+
+from dev_kit.web.metrics import LATENCY_BUCKETS, Histogram
+
+OBSERVATIONS = 200_000
+THREADS = (1, 4, 16)
+
+
+class LockedHistogram:
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        with self.lock:
+            counts = self.samples.get(labels)
+            if counts is None:
+                counts = self.samples[labels] = [0] * (len(self.buckets) + 2)
+            counts[bisect_left(self.buckets, value)] += 1
+            counts[-1] += value
+
+
+def run(histogram, threads: int) -> float:
+    values = [random.expovariate(20) for _ in range(1000)]
+
+    def work():
+        observe = histogram.observe
+        for i in range(OBSERVATIONS):
+            observe(values[i % 1000], "GET", "users.list_items")
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return threads * OBSERVATIONS / (time.perf_counter() - started)
+
+
+def main():
+    print(f"{'threads':>8} {'sharded (obs/s)':>16} {'locked (obs/s)':>15} {'ratio':>6}")
+    for threads in THREADS:
+        sharded = run(Histogram("latency", "", ("method", "endpoint"), LATENCY_BUCKETS), threads)
+        locked = run(LockedHistogram(LATENCY_BUCKETS), threads)
+        print(f"{threads:>8} {sharded:>16,.0f} {locked:>15,.0f} {sharded / locked:>5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
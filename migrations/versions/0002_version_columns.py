@@ -0,0 +1,32 @@
+"""version columns for users, roles and permissions
+
+Revision ID: 0002_version_columns
+Revises: 0001_initial_users_rbac
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0002_version_columns'
+down_revision = '0001_initial_users_rbac'
+branch_labels = None
+depends_on = None
+
+TABLES = ('users', 'roles', 'permissions')
+
+
+def upgrade() -> None:
+    # Existing rows start at version 1, like new ones (see VersionMixin)
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(
+                sa.Column('version', sa.Integer(), nullable=False, server_default=sa.text('1'))
+            )
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('version')
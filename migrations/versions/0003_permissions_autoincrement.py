@@ -0,0 +1,47 @@
+"""rebuild permissions with AUTOINCREMENT on SQLite
+
+Revision ID: 0003_permissions_autoincrement
+Revises: 0002_version_columns
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0003_permissions_autoincrement'
+down_revision = '0002_version_columns'
+branch_labels = None
+depends_on = None
+
+
+def _rebuild(autoincrement: bool) -> None:
+    # Compact tokens use permission ids as bit positions: SQLite reuses the
+    # largest deleted rowid unless the table is AUTOINCREMENT. Other databases
+    # never hand out a sequence value twice.
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    with op.batch_alter_table(
+        'permissions',
+        recreate='always',
+        table_kwargs={'sqlite_autoincrement': autoincrement},
+    ):
+        pass
+
+
+def upgrade() -> None:
+    _rebuild(autoincrement=True)
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    # Start above every id still referenced, not just the largest remaining one.
+    # Ids deleted before this revision without a trace can be handed out once
+    # more; the compact token epoch rejects the tokens naming them.
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'permissions'")
+    op.execute(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'permissions', max("
+        "coalesce((SELECT max(id) FROM permissions), 0), "
+        "coalesce((SELECT max(permission_id) FROM role_permissions), 0))"
+    )
+
+
+def downgrade() -> None:
+    _rebuild(autoincrement=False)
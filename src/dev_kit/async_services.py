@@ -0,0 +1,177 @@
+# src/dev_kit/async_services.py
+"""
+Provides `AsyncBaseService`, the asyncio counterpart of `BaseService`.
+
+It orchestrates an `AsyncBaseRepository` on an `AsyncSession`, running each
+write in a savepoint through the `handle_async_session` decorator, with the
+same hooks and semantics as the sync service. Requires the `async` extra.
+"""
+
+import inspect as pyinspect
+from functools import wraps
+from typing import Any, AsyncIterator, Dict, Generic, List, Optional, Type, TypeVar
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dev_kit.database.async_repository import AsyncBaseRepository
+from dev_kit.database.cache import invalidate_on_transaction_end
+from dev_kit.database.repository import CursorPaginationResult, Loading, PaginationResult
+from dev_kit.exceptions import NotFoundError
+from dev_kit.services import server_generated_attributes
+
+TModel = TypeVar("TModel")
+TRepo = TypeVar("TRepo", bound=AsyncBaseRepository)
+
+
+def handle_async_session(func):
+    """Async form of `handle_session`: runs the operation in a savepoint."""
+
+    @wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        async with self._db_session.begin_nested():
+            return await func(self, *args, **kwargs)
+
+    return wrapper
+
+
+async def _resolve(value: Any) -> Any:
+    """Awaits hook results, so hooks may be overridden with plain or `async` methods."""
+    return await value if pyinspect.isawaitable(value) else value
+
+
+class AsyncBaseService(Generic[TModel]):
+    """
+    A generic async service layer that encapsulates business logic and manages transactions.
+
+    The hooks (`pre_create_hook`, `pre_update_hook`) are those of
+    `BaseService` and may be overridden with either plain or `async` methods.
+    """
+
+    def __init__(
+        self,
+        model: Type[TModel],
+        db_session: AsyncSession,
+        repository_class: Type[TRepo] = None,
+    ):
+        """
+        Initializes the service and its underlying repository.
+
+        Args:
+            model: The SQLAlchemy model class this service will manage.
+            db_session: The `AsyncSession` (or `async_scoped_session`) to use.
+            repository_class (optional): A custom repository class to use.
+                                         Defaults to AsyncBaseRepository.
+        """
+        self.model = model
+        self._db_session = db_session
+        repo_cls = repository_class or AsyncBaseRepository
+        self.repo: TRepo = repo_cls(model=self.model, db_session=self._db_session)
+        self._server_generated = server_generated_attributes(model)
+
+    def _after_write(self) -> None:
+        """Called after every successful write so derived read caches can be dropped."""
+        invalidate_on_transaction_end(self._db_session, self.repo.invalidate_count_cache)
+
+    async def _load_server_generated(self, entity: TModel) -> None:
+        """Loads the server-generated attributes a flush left expired on `entity`."""
+        unloaded = inspect(entity).unloaded
+        missing = [name for name in self._server_generated if name in unloaded]
+        if missing:
+            await self._db_session.refresh(entity, attribute_names=missing)
+
+    def pre_create_hook(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Optional hook to modify data before creating an entity."""
+        return data
+
+    def pre_update_hook(self, instance: TModel, data: Dict[str, Any]):
+        """Optional hook to apply updates to an entity instance."""
+        for key, value in data.items():
+            if hasattr(instance, key):
+                setattr(instance, key, value)
+
+    async def _find(self, entity_id: Any, id_field: str) -> TModel:
+        finder = getattr(self.repo, f"get_by_{id_field}", self.repo.get_by_id)
+        entity = await finder(entity_id)
+        if not entity:
+            raise NotFoundError(entity_name=self.model.__name__, entity_id=entity_id)
+        return entity
+
+    @handle_async_session
+    async def create(self, data: Dict[str, Any]) -> TModel:
+        """Creates a new entity after processing it through the pre-create hook."""
+        processed_data = await _resolve(self.pre_create_hook(data))
+        entity = await self.repo.create(processed_data)
+        await self._db_session.flush()
+        await self._load_server_generated(entity)
+        self._after_write()
+        return entity
+
+    @handle_async_session
+    async def update(self, entity_id: Any, data: Dict[str, Any], id_field: str = "id") -> TModel:
+        """Updates an existing entity after finding it by the specified field."""
+        entity = await self._find(entity_id, id_field)
+        await _resolve(self.pre_update_hook(entity, data))
+        await self._db_session.flush()
+        await self._load_server_generated(entity)
+        self._after_write()
+        return entity
+
+    @handle_async_session
+    async def delete(self, entity_id: Any, id_field: str = "id", soft: bool = True) -> None:
+        """Deletes an entity after finding it by the specified field."""
+        entity = await self._find(entity_id, id_field)
+        await self.repo.delete(entity, soft=soft)
+        self._after_write()
+        return None
+
+    async def get_by_id(
+        self, id_: Any, include_soft_deleted: bool = False, loading: Loading = None
+    ) -> Optional[TModel]:
+        """Fetches a single record by its ID."""
+        return await self.repo.get_by_id(id_, include_soft_deleted, loading=loading)
+
+    async def get_by_uuid(
+        self, uuid_: str, include_soft_deleted: bool = False, loading: Loading = None
+    ) -> Optional[TModel]:
+        """Fetches a single record by its UUID."""
+        return await self.repo.get_by_uuid(uuid_, include_soft_deleted, loading=loading)
+
+    async def paginate(
+        self,
+        page: int = 1,
+        per_page: int = 20,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[List[str]] = None,
+        include_soft_deleted: bool = False,
+        count: str = "exact",
+        loading: Loading = None,
+    ) -> PaginationResult[TModel]:
+        """Fetches records with pagination. See `BaseRepository.paginate` for `count`."""
+        return await self.repo.paginate(
+            page, per_page, filters, order_by, include_soft_deleted, count=count, loading=loading
+        )
+
+    async def paginate_by_cursor(
+        self,
+        cursor: Optional[str] = None,
+        per_page: int = 20,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[List[str]] = None,
+        include_soft_deleted: bool = False,
+        loading: Loading = None,
+    ) -> CursorPaginationResult[TModel]:
+        """Fetches records with keyset (cursor) pagination."""
+        return await self.repo.paginate_by_cursor(
+            cursor, per_page, filters, order_by, include_soft_deleted, loading=loading
+        )
+
+    def stream(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[List[str]] = None,
+        include_soft_deleted: bool = False,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[TModel]:
+        """Yields every matching record in batches. See `AsyncBaseRepository.stream`."""
+        return self.repo.stream(filters, order_by, include_soft_deleted, batch_size)
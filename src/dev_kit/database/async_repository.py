@@ -0,0 +1,326 @@
+# src/dev_kit/database/async_repository.py
+"""
+An asyncio counterpart of `BaseRepository`, built on SQLAlchemy's `AsyncSession`.
+
+It shares the sync repository's statement building (`QueryBuildingMixin`:
+filter plans, ordering, soft-delete filtering, keyset conditions; and the
+cursors), so filters, sorting and pagination behave identically; only the round trips are awaited. Requires the
+`async` extra (SQLAlchemy's greenlet support) and an async driver such as
+asyncpg, aiomysql or aiosqlite.
+
+Lazy loading is not available on an `AsyncSession`: relationships read after
+a query must be named in its `loading` spec.
+"""
+
+import math
+import threading
+import time
+from functools import wraps
+from typing import Any, AsyncIterator, Dict, Generic, List, Optional, Type
+
+from flask import current_app
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dev_kit.database.filters import compile_filter_plan
+from dev_kit.database.loading import LoadingSpec
+from dev_kit.database.repository import (
+    COUNT_STRATEGIES,
+    CursorPaginationResult,
+    Loading,
+    PaginationResult,
+    QueryBuildingMixin,
+    T,
+    decode_cursor,
+    encode_cursor,
+)
+from dev_kit.exceptions import BusinessLogicError, DatabaseError, DuplicateEntryError
+
+
+def handle_async_db_errors(func):
+    """Async form of `handle_db_errors`: maps SQLAlchemy errors and rolls back."""
+
+    @wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        try:
+            return await func(self, *args, **kwargs)
+        except IntegrityError as e:
+            current_app.logger.warning(
+                f"Integrity error in {func.__name__} for {self.model.__name__}: {e}",
+                exc_info=True,
+            )
+            await self._db_session.rollback()
+            raise DuplicateEntryError("Duplicate key or unique constraint violated.") from e
+        except SQLAlchemyError as e:
+            current_app.logger.error(
+                f"Database error in {func.__name__} for {self.model.__name__}: {e}",
+                exc_info=True,
+            )
+            await self._db_session.rollback()
+            raise DatabaseError(original_exception=e) from e
+
+    return wrapper
+
+
+class AsyncBaseRepository(QueryBuildingMixin, Generic[T]):
+    """
+    Generic async repository providing common CRUD operations for a SQLAlchemy model.
+
+    Mirrors `BaseRepository`'s reads and writes with `async` methods. Like it,
+    it never commits: transactions belong to the service layer. The
+    second-level cache, bulk operations and projections (`columns`) are only
+    available on the sync repository, and the `estimated` count strategy
+    counts exactly (as the sync one does on dialects without estimates).
+    """
+
+    def __init__(self, model: Type[T], db_session: AsyncSession):
+        """
+        Initializes the repository with a specific SQLAlchemy model and session.
+
+        Args:
+            model: The SQLAlchemy model class.
+            db_session: The `AsyncSession` (or `async_scoped_session`) to use.
+        """
+        self.model = model
+        self._db_session = db_session
+        self._filter_plan = compile_filter_plan(model)
+        self._loading_specs: Dict[frozenset, LoadingSpec] = {}
+        self._count_cache: Dict[tuple, tuple] = {}
+        # Flask runs each async view on its own event loop thread
+        self._count_cache_lock = threading.Lock()
+
+    def _select(self, loading: Loading = None):
+        """Returns a base SELECT for the repository's model, with `loading` applied."""
+        stmt = select(self.model)
+        loading = self._loading(loading)
+        return stmt.options(*loading.options) if loading is not None else stmt
+
+    @handle_async_db_errors
+    async def create(self, data: Dict[str, Any]) -> T:
+        """Creates a new model instance but does not commit it."""
+        entity = self.model(**data)
+        self._db_session.add(entity)
+        return entity
+
+    @handle_async_db_errors
+    async def get_by_id(
+        self, id_: Any, include_soft_deleted: bool = False, loading: Loading = None
+    ) -> Optional[T]:
+        """Fetches a single record by its primary key (from the identity map when loaded)."""
+        loading = self._loading(loading)
+        options = loading.options if loading is not None else None
+        entity = await self._db_session.get(self.model, id_, options=options)
+        return self._visible(entity, include_soft_deleted)
+
+    @handle_async_db_errors
+    async def get_by_unique(
+        self, field: str, value: Any, include_soft_deleted: bool = False, loading: Loading = None
+    ) -> Optional[T]:
+        """Fetches a single record by a unique column (e.g. `uuid` or `username`)."""
+        if field == "id":
+            return await self.get_by_id(value, include_soft_deleted, loading)
+        stmt = self._select(loading).where(getattr(self.model, field) == value)
+        entity = (await self._db_session.scalars(stmt)).first()
+        return self._visible(entity, include_soft_deleted)
+
+    async def get_by_uuid(
+        self, uuid: str, include_soft_deleted: bool = False, loading: Loading = None
+    ) -> Optional[T]:
+        """Fetches a single record by its UUID."""
+        return await self.get_by_unique("uuid", uuid, include_soft_deleted, loading)
+
+    @handle_async_db_errors
+    async def get_many(
+        self,
+        values: List[Any],
+        id_field: str = "id",
+        include_soft_deleted: bool = False,
+        loading: Loading = None,
+    ) -> List[T]:
+        """Fetches every record whose `id_field` is in `values`, in one `IN` query."""
+        if not values:
+            return []
+        stmt = self._select(loading).where(getattr(self.model, id_field).in_(list(values)))
+        stmt = self._filter_soft_deleted(stmt, include_soft_deleted)
+        found = {getattr(e, id_field): e for e in (await self._db_session.scalars(stmt)).all()}
+        return [found[value] for value in dict.fromkeys(values) if value in found]
+
+    @handle_async_db_errors
+    async def delete(self, entity: T, soft: bool = True) -> None:
+        """
+        Deletes a model instance.
+
+        Args:
+            entity: The model instance to delete.
+            soft: If True and the model has `deleted_at`, performs a soft delete.
+                  Otherwise, performs a hard delete.
+        """
+        if soft and hasattr(entity, "deleted_at"):
+            entity.deleted_at = func.now()
+            self._db_session.add(entity)
+            # The flush expires the SQL expression, and it can't be lazy loaded later
+            await self._db_session.flush()
+            await self._db_session.refresh(entity, attribute_names=["deleted_at"])
+        else:
+            await self._db_session.delete(entity)
+
+    def invalidate_count_cache(self) -> None:
+        """Drops all memoized totals; called by the service layer after writes."""
+        with self._count_cache_lock:
+            self._count_cache.clear()
+
+    async def _exact_count(self, stmt) -> int:
+        count_stmt = stmt.with_only_columns(func.count(self.model.id)).order_by(None)
+        return (await self._db_session.execute(count_stmt)).scalar()
+
+    async def _cached_count(self, stmt, key: tuple) -> tuple:
+        """Returns `(total, is_fresh)`, serving from the TTL cache when possible."""
+        now = time.monotonic()
+        entry = self._count_cache.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1], False
+        total = await self._exact_count(stmt)
+        with self._count_cache_lock:
+            if len(self._count_cache) >= self.count_cache_max_entries:
+                # Dicts keep insertion order, so this evicts the oldest entry.
+                self._count_cache.pop(next(iter(self._count_cache)), None)
+            self._count_cache[key] = (now + self.count_cache_ttl, total)
+        return total, True
+
+    @handle_async_db_errors
+    async def paginate(
+        self,
+        page: int = 1,
+        per_page: int = 20,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[List[str]] = None,
+        include_soft_deleted: bool = False,
+        count: str = "exact",
+        loading: Loading = None,
+    ) -> PaginationResult[T]:
+        """
+        Performs a paginated query. See `BaseRepository.paginate`.
+
+        Raises:
+            BusinessLogicError: If `count` is not one of `COUNT_STRATEGIES`.
+        """
+        if count not in COUNT_STRATEGIES:
+            raise BusinessLogicError(
+                f"Unknown count strategy '{count}'. Expected one of {', '.join(COUNT_STRATEGIES)}."
+            )
+        filters_copy = filters.copy() if filters else {}
+        stmt = select(self.model)
+        stmt = self._filter_soft_deleted(stmt, include_soft_deleted)
+        stmt = self._apply_filters(stmt, filters_copy)
+
+        total_count: Optional[int] = None
+        total_is_exact = False
+        if count in ("exact", "estimated"):
+            total_count, total_is_exact = await self._exact_count(stmt), True
+        elif count == "cached":
+            key = self._count_cache_key(filters_copy, include_soft_deleted)
+            total_count, total_is_exact = await self._cached_count(stmt, key)
+
+        stmt = self._apply_ordering(stmt, order_by)
+        loading = self._loading(loading)
+        if loading is not None:
+            stmt = stmt.options(*loading.options)
+        stmt = stmt.offset((page - 1) * per_page)
+
+        if total_is_exact:
+            items = list((await self._db_session.scalars(stmt.limit(per_page))).all())
+            total_pages = math.ceil(total_count / per_page) if total_count > 0 else 0
+            has_next = page < total_pages
+        else:
+            # Totals we didn't just count can't be trusted for has_next.
+            rows = (await self._db_session.scalars(stmt.limit(per_page + 1))).all()
+            items, has_next = list(rows[:per_page]), len(rows) > per_page
+            total_pages = math.ceil(total_count / per_page) if total_count else total_count
+
+        return PaginationResult(
+            items=items,
+            total=total_count,
+            page=page,
+            per_page=per_page,
+            total_pages=total_pages,
+            has_next=has_next,
+            has_prev=(page > 1),
+            total_is_exact=total_is_exact,
+        )
+
+    @handle_async_db_errors
+    async def paginate_by_cursor(
+        self,
+        cursor: Optional[str] = None,
+        per_page: int = 20,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[List[str]] = None,
+        include_soft_deleted: bool = False,
+        loading: Loading = None,
+    ) -> CursorPaginationResult[T]:
+        """
+        Performs a keyset (cursor) paginated query. See `BaseRepository.paginate_by_cursor`.
+
+        Raises:
+            BusinessLogicError: If the cursor is malformed or was issued for a
+                                different sort order.
+        """
+        keys = self._keyset_ordering(order_by)
+        order_spec = [f"-{name}" if descending else name for name, descending in keys]
+
+        stmt = self._select(loading)
+        stmt = self._filter_soft_deleted(stmt, include_soft_deleted)
+        stmt = self._apply_filters(stmt, filters.copy() if filters else {})
+
+        backwards = False
+        if cursor:
+            cursor_spec, values, backwards = decode_cursor(cursor)
+            if cursor_spec != order_spec or len(values) != len(keys):
+                raise BusinessLogicError("Pagination cursor does not match the sort order.")
+            stmt = stmt.where(self._keyset_condition(keys, values, backwards))
+
+        for name, descending in keys:
+            column = getattr(self.model, name)
+            # Walking backwards reads the preceding rows nearest-first.
+            stmt = stmt.order_by(column.desc() if descending != backwards else column.asc())
+
+        rows = list((await self._db_session.scalars(stmt.limit(per_page + 1))).all())
+        has_more = len(rows) > per_page
+        items = rows[:per_page]
+        if backwards:
+            items.reverse()
+
+        def cursor_for(item, to_previous: bool) -> str:
+            values = [getattr(item, name) for name, _ in keys]
+            return encode_cursor(order_spec, values, backwards=to_previous)
+
+        has_next = True if backwards else has_more
+        has_prev = has_more if backwards else bool(cursor)
+        return CursorPaginationResult(
+            items=items,
+            per_page=per_page,
+            has_next=has_next,
+            has_prev=has_prev,
+            next_cursor=cursor_for(items[-1], False) if items and has_next else None,
+            prev_cursor=cursor_for(items[0], True) if items and has_prev else None,
+        )
+
+    async def stream(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[List[str]] = None,
+        include_soft_deleted: bool = False,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[T]:
+        """Yields every record matching `filters`, fetched `batch_size` rows at a time."""
+        stmt = self._filter_soft_deleted(select(self.model), include_soft_deleted)
+        stmt = self._apply_filters(stmt, filters.copy() if filters else {})
+        for name, descending in self._keyset_ordering(order_by):
+            column = getattr(self.model, name)
+            stmt = stmt.order_by(column.desc() if descending else column.asc())
+        result = await self._db_session.stream_scalars(
+            stmt, execution_options={"yield_per": batch_size}
+        )
+        async for entity in result:
+            yield entity
@@ -0,0 +1,225 @@
+# src/dev_kit/database/cache.py
+"""
+A pluggable second-level cache for repository reads.
+
+Repositories cache plain column snapshots (never live ORM instances), keyed per
+model namespace. Invalidation is generation based: every namespace has a
+generation token that is part of each key, and invalidating a model just
+replaces its token, which makes all of its previous entries unreachable at
+once. This works the same way for the in-process `LRUTTLCache` and for shared
+backends (Redis, memcached, ...) implementing `CacheBackend`.
+
+Writes made through `BaseService` invalidate the model's namespace immediately
+and again when the surrounding transaction commits or rolls back, so entries
+populated from uncommitted state inside that transaction never outlive it.
+`invalidate_on_transaction_end` does the same for any other derived cache.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Returned by `CacheBackend.get` when a key is absent or expired.
+MISS = object()
+
+# `Session.info` key of the invalidation callbacks to run when the transaction ends.
+PENDING_INVALIDATIONS_KEY = "dev_kit.cache_invalidations"
+
+
+class CacheStats:
+    """Hit/miss/eviction counters of a cache backend."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+class CacheBackend:
+    """
+    The interface repository caches are stored in.
+
+    Implementations must be safe to share between threads. Values are plain
+    Python structures (dicts, tuples, lists of scalars) and may be serialized by
+    shared backends.
+    """
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    def get(self, key: Hashable) -> Any:
+        """Returns the value stored under `key`, or `MISS`."""
+        raise NotImplementedError
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Stores `value` under `key` for `ttl` seconds (the backend default if None)."""
+        raise NotImplementedError
+
+    def delete(self, key: Hashable) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class LRUTTLCache(CacheBackend):
+    """
+    An in-process cache bounded by entry count (LRU eviction) and entry age (TTL).
+
+    Args:
+        max_entries: The number of entries kept before the least recently used
+                     one is evicted.
+        ttl: The default lifetime of an entry in seconds; None keeps entries
+             until they are evicted.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = 60.0):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return MISS
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.stats.misses += 1
+                return MISS
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class ModelCache:
+    """
+    A namespaced, generation-versioned view over a `CacheBackend`.
+
+    `stats` counts the hits and misses of this namespace's entries only (the
+    backend's own counters also include generation lookups); evictions are
+    reported by the backend.
+
+    Args:
+        backend: Where entries are stored; may be shared by many namespaces.
+        namespace: Usually the model's table name.
+        ttl: Lifetime of entries written through this view (backend default if None).
+    """
+
+    def __init__(self, backend: CacheBackend, namespace: str, ttl: Optional[float] = None):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self._generation_key = ("dev_kit.generation", namespace)
+        self.stats = CacheStats()
+
+    def _generation(self) -> str:
+        generation = self.backend.get(self._generation_key)
+        if generation is MISS:
+            # A lost token (evicted or expired) must never resurrect old entries,
+            # so a fresh one is drawn rather than restarting from a known value.
+            generation = uuid.uuid4().hex
+            self.backend.set(self._generation_key, generation, ttl=self.ttl)
+        return generation
+
+    def _key(self, key: Hashable) -> tuple:
+        return (self.namespace, self._generation(), key)
+
+    def get(self, key: Hashable) -> Any:
+        value = self.backend.get(self._key(key))
+        if value is MISS:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self.backend.set(self._key(key), value, ttl=self.ttl)
+
+    def invalidate(self) -> None:
+        """Makes every entry of this namespace unreachable."""
+        self.backend.set(self._generation_key, uuid.uuid4().hex, ttl=self.ttl)
+
+    def invalidate_on_transaction_end(self, session: Session) -> None:
+        """Invalidates now and again when `session`'s transaction commits or rolls back."""
+        invalidate_on_transaction_end(session, self.invalidate)
+
+
+def invalidate_on_transaction_end(session: Session, invalidate: Callable[[], None]) -> None:
+    """
+    Calls `invalidate` now and again when `session`'s transaction commits or rolls back.
+
+    The second call drops what concurrent readers cached from the old state
+    while the transaction was still open. Registering the same
+    callback (e.g. the same bound method) twice in a transaction runs it once.
+    """
+    invalidate()
+    _install_session_listeners()
+    session.info.setdefault(PENDING_INVALIDATIONS_KEY, set()).add(invalidate)
+
+
+def _after_commit(session: Session) -> None:
+    # Also emitted when a savepoint is released; only the outermost commit counts.
+    if session.in_nested_transaction():
+        return
+    for invalidate in session.info.pop(PENDING_INVALIDATIONS_KEY, None) or ():
+        invalidate()
+
+
+def _after_rollback(session: Session) -> None:
+    # A rolled back savepoint may have been read from; the outer writes stay pending.
+    if session.in_nested_transaction():
+        pending = session.info.get(PENDING_INVALIDATIONS_KEY, ())
+    else:
+        pending = session.info.pop(PENDING_INVALIDATIONS_KEY, None) or ()
+    for invalidate in pending:
+        invalidate()
+
+
+_listeners_installed = False
+_listeners_lock = threading.Lock()
+
+
+def _install_session_listeners() -> None:
+    """Registers the transaction-end hooks on `Session` once per process."""
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    with _listeners_lock:
+        if not _listeners_installed:
+            event.listen(Session, "after_commit", _after_commit)
+            event.listen(Session, "after_rollback", _after_rollback)
+            _listeners_installed = True
@@ -1,4 +1,6 @@
 # src/dev_kit/database/extensions.py
 from flask_sqlalchemy import SQLAlchemy
 
-db = SQLAlchemy()
+from dev_kit.database.replicas import FlaskReplicaSession
+
+db = SQLAlchemy(session_options={"class_": FlaskReplicaSession})
@@ -0,0 +1,196 @@
+# src/dev_kit/database/filters.py
+"""
+Compiled filter plans for repository list queries.
+
+A filter plan is built once per model and maps every allowed `field__op` key
+(plus the bare `field` shorthand for `eq`) to a ready-made clause builder that
+already knows its column and how to coerce raw query-string values to the
+column's Python type. Applying filters then costs one dictionary lookup and
+one bound-parameter clause per key.
+
+The SQL itself is cached by SQLAlchemy's compiled cache, which is keyed on the
+statement structure: because every value is passed as a bound parameter, two
+requests using the same filter keys share one compiled statement regardless
+of their values.
+"""
+
+import datetime
+import decimal
+import threading
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import inspect
+
+from dev_kit.exceptions import BusinessLogicError
+
+# Operators that compare a column against a single coerced value.
+COMPARISON_OPERATORS: Dict[str, str] = {
+    "eq": "__eq__",
+    "ne": "__ne__",
+    "lt": "__lt__",
+    "lte": "__le__",
+    "gt": "__gt__",
+    "gte": "__ge__",
+}
+FILTER_OPERATORS: Tuple[str, ...] = (*COMPARISON_OPERATORS, "like", "ilike", "in")
+
+_TRUE_STRINGS = frozenset({"1", "true", "t", "yes", "y", "on"})
+_FALSE_STRINGS = frozenset({"0", "false", "f", "no", "n", "off"})
+
+
+def _coerce_bool(value: str) -> bool:
+    lowered = value.strip().lower()
+    if lowered in _TRUE_STRINGS:
+        return True
+    if lowered in _FALSE_STRINGS:
+        return False
+    raise ValueError(value)
+
+
+_STRING_COERCERS: Dict[type, Callable[[str], Any]] = {
+    bool: _coerce_bool,
+    int: int,
+    float: float,
+    decimal.Decimal: decimal.Decimal,
+    datetime.datetime: datetime.datetime.fromisoformat,
+    datetime.date: datetime.date.fromisoformat,
+    datetime.time: datetime.time.fromisoformat,
+}
+
+
+def _python_type(column) -> Optional[type]:
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
+
+
+def _operators_for(python_type: Optional[type]) -> Tuple[str, ...]:
+    """The operators that are meaningful for a column of the given Python type."""
+    if python_type is bool:
+        return ("eq", "ne", "in")
+    if python_type in _STRING_COERCERS:
+        # Pattern matching on numbers and timestamps is not portable.
+        return (*COMPARISON_OPERATORS, "in")
+    return FILTER_OPERATORS
+
+
+def _make_coercer(python_type: Optional[type]) -> Callable[[Any], Any]:
+    """Returns a function converting raw (string) values to the column's Python type."""
+    convert = _STRING_COERCERS.get(python_type)
+    if convert is None:
+        return lambda value: value
+
+    def coerce(value: Any) -> Any:
+        # Values coming from a loaded schema are already typed; only parse strings.
+        return convert(value) if isinstance(value, str) else value
+
+    return coerce
+
+
+class FilterClause(NamedTuple):
+    """A precompiled entry of a filter plan."""
+
+    field_name: str
+    op: str
+    build: Callable[[Any], Any]
+
+
+class FilterPlan:
+    """
+    The precomputed table of allowed filter keys for one model.
+
+    Every column gets the operators that make sense for its type: booleans allow
+    eq/ne/in, numbers and temporal types add ordering comparisons, and text (or
+    types without a Python equivalent) additionally allow like/ilike.
+
+    Use `compile_filter_plan` to obtain the (shared, cached) plan for a model.
+    """
+
+    def __init__(self, model: type):
+        self.model = model
+        self.fields: frozenset = frozenset()
+        self.clauses: Dict[str, FilterClause] = {}
+        self._compile()
+
+    def _compile(self) -> None:
+        fields = []
+        for column_attr in inspect(self.model).column_attrs:
+            name = column_attr.key
+            column = getattr(self.model, name)
+            python_type = _python_type(column_attr.expression)
+            coerce = _make_coercer(python_type)
+            fields.append(name)
+            for op in _operators_for(python_type):
+                clause = FilterClause(name, op, self._builder(column, op, coerce, name))
+                self.clauses[f"{name}__{op}"] = clause
+            self.clauses[name] = self.clauses[f"{name}__eq"]
+        self.fields = frozenset(fields)
+
+    @staticmethod
+    def _builder(column, op: str, coerce: Callable[[Any], Any], name: str):
+        def coerced(value: Any) -> Any:
+            try:
+                return coerce(value)
+            except (ValueError, TypeError, decimal.InvalidOperation) as e:
+                raise BusinessLogicError(
+                    f"Invalid value for filter '{name}__{op}': {value!r}."
+                ) from e
+
+        if op == "in":
+
+            def build_in(value: Any):
+                # Accept both lists and comma-separated strings.
+                if isinstance(value, str):
+                    parsed = [v for v in (x.strip() for x in value.split(",")) if v]
+                else:
+                    parsed = list(value) if isinstance(value, (list, tuple, set)) else [value]
+                return column.in_([coerced(v) for v in parsed])
+
+            return build_in
+        if op == "like":
+            return lambda value: column.like(f"%{value}%")
+        if op == "ilike":
+            return lambda value: column.ilike(f"%{value}%")
+
+        compare = getattr(column, COMPARISON_OPERATORS[op])
+        return lambda value: compare(coerced(value))
+
+    def build(
+        self, filters: Optional[Dict[str, Any]], on_unknown_operator: Callable[[str], None]
+    ) -> List[Any]:
+        """
+        Turns a filters dictionary into a list of SQL clauses.
+
+        Keys naming fields that aren't columns of the model are ignored; keys
+        naming a known field with an unsupported operator are reported through
+        `on_unknown_operator` and ignored.
+
+        Raises:
+            BusinessLogicError: If a value can't be coerced to the column's type.
+        """
+        clauses = []
+        for key, value in (filters or {}).items():
+            entry = self.clauses.get(key)
+            if entry is not None:
+                clauses.append(entry.build(value))
+                continue
+            field_name, _, op = key.partition("__")
+            if op and field_name in self.fields:
+                on_unknown_operator(op)
+        return clauses
+
+
+_plans: Dict[type, FilterPlan] = {}
+_plans_lock = threading.Lock()
+
+
+def compile_filter_plan(model: type) -> FilterPlan:
+    """Returns the filter plan for `model`, compiling it on first use."""
+    plan = _plans.get(model)
+    if plan is None:
+        with _plans_lock:
+            plan = _plans.get(model)
+            if plan is None:
+                plan = _plans[model] = FilterPlan(model)
+    return plan
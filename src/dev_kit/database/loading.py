@@ -0,0 +1,178 @@
+# src/dev_kit/database/loading.py
+"""
+Declarative eager-loading specs for repository reads.
+
+Serializing a list of models whose schema touches relationships lazy-loads
+each relationship once per row. A loading spec names the relationships to load
+up front and how, so a page costs a fixed number of queries whatever its size:
+
+    {"roles": "selectin", "roles.permissions": "selectin", "owner": "joined"}
+
+Keys are dotted relationship paths from the model; values are one of
+`LOADER_STRATEGIES`. Intermediate paths that aren't listed are loaded with
+"selectin". Relationships the spec doesn't mention get the `default` strategy,
+which is "raise": touching them raises instead of silently issuing a query per
+row. `spec_from_schema` derives a spec from an output schema's nested fields.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+from marshmallow import fields as ma_fields
+from sqlalchemy import inspect
+from sqlalchemy.orm import (
+    defaultload,
+    joinedload,
+    lazyload,
+    noload,
+    raiseload,
+    selectinload,
+    subqueryload,
+)
+
+# Strategies accepted in loading specs, mapped to their loader option factories.
+_LOADERS = {
+    "selectin": selectinload,
+    "joined": joinedload,
+    "subquery": subqueryload,
+    "lazy": lazyload,
+    "noload": noload,
+    # Only raises when the load would emit SQL; related objects already in the
+    # session (e.g. a many-to-one target) are still returned.
+    "raise": lambda attr: raiseload(attr, sql_only=True),
+}
+LOADER_STRATEGIES = tuple(_LOADERS)
+EAGER_STRATEGIES = ("selectin", "joined", "subquery")
+
+
+def _check_strategy(strategy: str) -> None:
+    if strategy not in _LOADERS:
+        raise ValueError(
+            f"Unknown loading strategy '{strategy}'. Expected one of {', '.join(LOADER_STRATEGIES)}."
+        )
+
+
+class LoadingSpec:
+    """
+    A loading spec compiled into SQLAlchemy loader options for one model.
+
+    Args:
+        model: The model the paths start from.
+        spec: Dotted relationship paths mapped to strategies.
+        default: Strategy for relationships the spec doesn't mention; None
+                 leaves the mapper's configured loading in place.
+
+    Raises:
+        ValueError: If a path doesn't name a relationship or a strategy is unknown.
+    """
+
+    def __init__(
+        self, model: type, spec: Mapping[str, str], default: Optional[str] = "raise"
+    ):
+        if default is not None:
+            _check_strategy(default)
+        self.model = model
+        self.spec = dict(spec)
+        self.default = default
+        tree: Dict[str, Any] = {}
+        for path, strategy in sorted(self.spec.items()):
+            _check_strategy(strategy)
+            node = tree
+            for name in path.split("."):
+                node = node.setdefault(name, ["selectin", {}])
+                children = node
+                node = node[1]
+            children[0] = strategy
+        self.options = self._build(model, tree)
+
+    def _build(self, model: type, tree: Dict[str, Any]) -> List[Any]:
+        relationships = inspect(model).relationships
+        options = []
+        for name, (strategy, children) in tree.items():
+            if name not in relationships:
+                raise ValueError(f"'{model.__name__}' has no relationship '{name}'.")
+            loader = _LOADERS[strategy](getattr(model, name))
+            nested = self._build(relationships[name].mapper.class_, children)
+            if strategy in EAGER_STRATEGIES and nested:
+                loader = loader.options(*nested)
+            options.append(loader)
+        if self.default is not None:
+            options.append(_LOADERS[self.default]("*"))
+        return options
+
+    @property
+    def is_eager(self) -> bool:
+        """Whether the spec loads any relationship up front."""
+        return any(strategy in EAGER_STRATEGIES for strategy in self.spec.values())
+
+    def __repr__(self) -> str:
+        return f"LoadingSpec({self.model.__name__}, {self.spec!r}, default={self.default!r})"
+
+
+def compile_loading(
+    model: type, loading: Union[None, LoadingSpec, Mapping[str, str]]
+) -> Optional[LoadingSpec]:
+    """Returns `loading` as a `LoadingSpec` for `model` (None stays None)."""
+    if loading is None or isinstance(loading, LoadingSpec):
+        return loading
+    return LoadingSpec(model, loading)
+
+
+def _nested_schema(field: ma_fields.Field):
+    """The schema a (possibly list-wrapped) nested field serializes with, if any."""
+    if isinstance(field, ma_fields.List):
+        field = field.inner
+    if isinstance(field, (ma_fields.Nested, ma_fields.Pluck)):
+        return field.schema
+    return None
+
+
+def _relationship_fields(schema, model: type, prefix: str, spec: Dict[str, str]) -> bool:
+    """Adds the relationships `schema` touches to `spec`; returns whether it is opaque."""
+    relationships = inspect(model).relationships
+    opaque = False
+    for name, field in schema.fields.items():
+        if field.load_only:
+            continue
+        if isinstance(field, (ma_fields.Method, ma_fields.Function)):
+            # Arbitrary code may read any relationship
+            opaque = True
+            continue
+        attribute = (field.attribute or name).split(".")[0]
+        relationship = relationships.get(attribute)
+        if relationship is None:
+            continue
+        path = f"{prefix}{attribute}"
+        spec[path] = "selectin" if relationship.uselist else "joined"
+        nested = _nested_schema(field)
+        if nested is not None:
+            opaque |= _relationship_fields(nested, relationship.mapper.class_, f"{path}.", spec)
+    return opaque
+
+
+def spec_from_schema(schema, model: type) -> Tuple[Dict[str, str], bool]:
+    """
+    Derives a loading spec from the relationship fields an output schema dumps.
+
+    Collections are loaded with "selectin" and many-to-one relationships with
+    "joined"; nested schemas are followed recursively.
+
+    Args:
+        schema: A marshmallow schema class or instance.
+        model: The model `schema` serializes.
+
+    Returns:
+        The spec, and whether the schema has `Method`/`Function` fields that may
+        read relationships the spec can't see (in which case relationships
+        outside the spec should not be set to "raise").
+    """
+    if isinstance(schema, type):
+        schema = schema()
+    spec: Dict[str, str] = {}
+    opaque = _relationship_fields(schema, model, "", spec)
+    return spec, opaque
+
+
+def loading_for_schema(schema, model: type) -> LoadingSpec:
+    """Builds the `LoadingSpec` serializing `model` with `schema` needs."""
+    spec, opaque = spec_from_schema(schema, model)
+    return LoadingSpec(model, spec, default=None if opaque else "raise")
@@ -37,9 +37,13 @@ class TimestampMixin:
     """Adds `created_at` and `updated_at` timestamp columns.
 
     `created_at` is set on creation, and `updated_at` is updated automatically
-    on any modification.
+    on any modification. Both are generated by the database, so the mapper uses
+    `eager_defaults` to fetch them in the same INSERT/UPDATE via `RETURNING`
+    where the dialect supports it instead of expiring them after a flush.
     """
 
+    __mapper_args__ = {"eager_defaults": True}
+
     created_at = Column(
         TIMESTAMP, nullable=False, server_default=text("CURRENT_TIMESTAMP"), index=True
     )
@@ -51,6 +55,24 @@ class TimestampMixin:
     )
 
 
+@declarative_mixin
+class VersionMixin:
+    """Adds a `version` counter, incremented by every UPDATE of the row.
+
+    Unlike `updated_at`, whose resolution is the database's (one second on
+    SQLite), it changes on every write, so the generated routes can use it as
+    an exact validator for conditional requests.
+    """
+
+    version = Column(
+        INTEGER,
+        nullable=False,
+        default=1,
+        server_default=text("1"),
+        onupdate=text("version + 1"),
+    )
+
+
 @declarative_mixin
 class SoftDeleteMixin:
     """Adds a `deleted_at` timestamp for implementing soft deletes."""
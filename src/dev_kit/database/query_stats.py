@@ -0,0 +1,275 @@
+# src/dev_kit/database/query_stats.py
+"""
+In-process statement statistics, in the spirit of `pg_stat_statements`.
+
+`QueryStats.attach(engine)` listens to the statements an engine runs and
+aggregates them by fingerprint: the SQL text with literals and bound
+parameters replaced by `?`, `IN` lists and multi-row `VALUES` collapsed and
+whitespace normalized, so the same query with different values (or a
+different number of `IN` items) lands on one entry. It works on any backend
+and needs no database privileges.
+
+Each entry counts calls, total, mean, max and p95 latency (the p95 over the
+latest `sample_size` timings) and rows. Rows are what the driver reports as
+`cursor.rowcount`; drivers that don't report it for SELECTs (such as
+sqlite3) only count the rows of writes. The table is bounded: when it holds
+`max_entries` fingerprints, the least-called one makes room for a new one.
+
+Statements slower than `slow_threshold` seconds are logged to the
+`dev_kit.database.query_stats` logger with the shapes (types, lengths) of
+their parameters, never their values, and the plan of SELECTs, captured on
+the same connection with `EXPLAIN` (`EXPLAIN QUERY PLAN` on SQLite) inside a
+savepoint, so a failing `EXPLAIN` can't abort the caller's transaction. The
+plan is skipped for statements whose results are streamed (`stream_results`,
+`yield_per`), whose cursor is still being read.
+
+With Flask-SQLAlchemy, `init_query_stats(app, db)` attaches a `QueryStats`
+to every engine of `db`; see `dev_kit.web.query_stats` for the admin route.
+"""
+
+import logging
+import math
+import re
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+SORT_KEYS = ("total", "mean", "p95", "max", "calls", "rows")
+
+_EXPLAIN_PREFIXES = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "postgresql": "EXPLAIN ",
+    "mysql": "EXPLAIN ",
+    "mariadb": "EXPLAIN ",
+}
+
+_EXPLAIN_SAVEPOINT = "dev_kit_explain"
+
+_STRING = re.compile(r"'(?:''|[^'])*'")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|(?<![:\w]):\w+|\$\d+")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN \(\?(?:, \?)*\)", re.IGNORECASE)
+_VALUES_ROWS = re.compile(r"(\(\?(?:, \?)*\))(?:, \1)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """Normalizes `statement` so that runs differing only in their values match."""
+    text = _WHITESPACE.sub(" ", statement).strip()
+    text = _STRING.sub("?", text)
+    text = _PLACEHOLDER.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = re.sub(r"\?\s*,\s*", "?, ", text)
+    text = _IN_LIST.sub("IN (...)", text)
+    return _VALUES_ROWS.sub(r"\1, ...", text)
+
+
+def _shape(value: Any) -> str:
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def parameter_shapes(parameters: Any, executemany: bool = False) -> Any:
+    """The types (and lengths, for sequences) of bound parameters, without their values."""
+    if executemany:
+        rows = list(parameters or ())
+        return f"{len(rows)} x {parameter_shapes(rows[0]) if rows else None}"
+    if isinstance(parameters, dict):
+        return {key: _shape(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_shape(value) for value in parameters]
+    return parameters
+
+
+class _Entry:
+    __slots__ = ("calls", "total", "max", "rows", "samples")
+
+    def __init__(self, sample_size: int):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.samples: Deque[float] = deque(maxlen=sample_size)
+
+    def p95(self) -> float:
+        ordered = sorted(self.samples)
+        return ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)] if ordered else 0.0
+
+    def as_dict(self, fingerprint: str) -> Dict[str, Any]:
+        return {
+            "fingerprint": fingerprint,
+            "calls": self.calls,
+            "rows": self.rows,
+            "total_ms": self.total * 1000,
+            "mean_ms": self.total / self.calls * 1000 if self.calls else 0.0,
+            "p95_ms": self.p95() * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+class QueryStats:
+    """
+    A bounded table of statement statistics keyed by fingerprint.
+
+    Args:
+        max_entries: How many fingerprints are tracked at most.
+        slow_threshold: Statements taking longer (in seconds) are logged with
+                        their plan; None disables the slow-query log.
+        sample_size: How many of the latest timings per fingerprint the p95
+                     is computed over.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        slow_threshold: Optional[float] = 0.5,
+        sample_size: int = 256,
+    ):
+        self.max_entries = max_entries
+        self.slow_threshold = slow_threshold
+        self.sample_size = sample_size
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self._starts_key = f"dev_kit.query_stats.{id(self)}"
+
+    def attach(self, engine: Engine) -> None:
+        """Starts collecting the statements `engine` runs."""
+        if not event.contains(engine, "after_cursor_execute", self._after_cursor_execute):
+            event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+            event.listen(engine, "handle_error", self._handle_error)
+
+    def detach(self, engine: Engine) -> None:
+        """Stops collecting the statements `engine` runs."""
+        if event.contains(engine, "after_cursor_execute", self._after_cursor_execute):
+            event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+            event.remove(engine, "handle_error", self._handle_error)
+
+    def record(self, statement: str, elapsed: float, rows: int = -1) -> None:
+        """Adds one run of `statement` that took `elapsed` seconds."""
+        key = fingerprint(statement)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_entries:
+                    del self._entries[min(self._entries, key=lambda k: self._entries[k].calls)]
+                entry = self._entries[key] = _Entry(self.sample_size)
+            entry.calls += 1
+            entry.total += elapsed
+            entry.max = max(entry.max, elapsed)
+            if rows > 0:
+                entry.rows += rows
+            entry.samples.append(elapsed)
+
+    def snapshot(self, sort: str = "total", limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        The entries as dicts, ordered by `sort` (one of `SORT_KEYS`), descending.
+
+        Times are in milliseconds.
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key '{sort}'. Expected one of {', '.join(SORT_KEYS)}.")
+        with self._lock:
+            rows = [entry.as_dict(key) for key, entry in self._entries.items()]
+        field = sort if sort in ("calls", "rows") else f"{sort}_ms"
+        rows.sort(key=lambda row: row[field], reverse=True)
+        return rows[:limit] if limit is not None else rows
+
+    def reset(self) -> None:
+        """Drops every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(self._starts_key, []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get(self._starts_key)
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        self.record(statement, elapsed, getattr(cursor, "rowcount", -1))
+        if self.slow_threshold is not None and elapsed >= self.slow_threshold:
+            self._log_slow(conn, statement, parameters, context, executemany, elapsed)
+
+    def _handle_error(self, context) -> None:
+        # A failed statement never reaches after_cursor_execute
+        conn = context.connection
+        starts = conn.info.get(self._starts_key) if conn is not None else None
+        if starts:
+            starts.pop()
+
+    def _log_slow(self, conn, statement, parameters, context, executemany, elapsed) -> None:
+        plan = None
+        # A server-side cursor still being read can't share its connection
+        streamed = context is not None and (
+            context.execution_options.get("stream_results") or getattr(context, "_is_server_side", False)
+        )
+        if not executemany and not streamed:
+            plan = self._explain(conn, statement, parameters)
+        logger.warning(
+            "Slow query (%.1f ms): %s\nParameters: %s\nPlan:\n%s",
+            elapsed * 1000,
+            fingerprint(statement),
+            parameter_shapes(parameters, executemany),
+            plan or "(not available)",
+        )
+
+    @staticmethod
+    def _explain(conn, statement: str, parameters: Any) -> Optional[str]:
+        """
+        Captures the plan of a SELECT on the DBAPI connection, bypassing the events.
+
+        It runs in a savepoint of the caller's transaction: on PostgreSQL an
+        error would otherwise leave the whole transaction aborted.
+        """
+        prefix = _EXPLAIN_PREFIXES.get(conn.dialect.name)
+        if prefix is None or not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            return None
+        cursor = conn.connection.dbapi_connection.cursor()
+        plan = None
+        try:
+            cursor.execute(f"SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+            try:
+                cursor.execute(prefix + statement, parameters)
+                plan = "\n".join(" | ".join(str(value) for value in row) for row in cursor.fetchall())
+            except Exception:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+                raise
+            finally:
+                cursor.execute(f"RELEASE SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+        except Exception:  # The plan is best-effort; never fail the query over it
+            logger.debug("Could not capture the plan of a slow query", exc_info=True)
+        finally:
+            cursor.close()
+        return plan
+
+
+def init_query_stats(app, db, stats: Optional[QueryStats] = None) -> QueryStats:
+    """
+    Attaches a `QueryStats` to every engine of a Flask-SQLAlchemy `db`.
+
+    Unless `stats` is given, it is built from the `QUERY_STATS_MAX_ENTRIES`
+    (1000) and `SLOW_QUERY_THRESHOLD` (0.5 seconds, None to disable) config.
+    The instance is kept in `app.extensions["dev_kit.query_stats"]`.
+    """
+    if stats is None:
+        stats = QueryStats(
+            max_entries=app.config.get("QUERY_STATS_MAX_ENTRIES", 1000),
+            slow_threshold=app.config.get("SLOW_QUERY_THRESHOLD", 0.5),
+        )
+    with app.app_context():
+        for engine in db.engines.values():
+            stats.attach(engine)
+    app.extensions["dev_kit.query_stats"] = stats
+    return stats
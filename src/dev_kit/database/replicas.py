@@ -0,0 +1,205 @@
+# src/dev_kit/database/replicas.py
+"""
+Routes reads to a read replica while writes stay on the primary.
+
+`ReplicaSession` is a `Session` that sends SELECTs issued inside a
+`replica_reads` scope to its `replica_bind`. The read methods of
+`BaseRepository` and the GET routes of `register_crud_routes` enter that
+scope; everything else uses the primary: flushes and INSERT/UPDATE/DELETE
+statements, `SELECT ... FOR UPDATE`, any other statement, and every query
+run inside a `primary_reads` scope (entered by `handle_session` and the bulk
+operations of `BaseService`, so a write always reads what it is about to
+change from the primary).
+
+Reads stay consistent with the session's own writes: once it has written,
+every read goes to the primary until the session is closed (with
+Flask-SQLAlchemy, the end of the request) and for `replica_lag` seconds
+afterwards. `init_replica_routing` carries that window over to the client's
+next requests with a cookie.
+
+The shared `db` uses `FlaskReplicaSession`, which takes the replica from the
+`replica` bind key and the lag from `REPLICA_LAG_SECONDS`; without a
+`replica` bind it behaves like the default session:
+
+    app.config["SQLALCHEMY_BINDS"] = {"replica": "postgresql://...@replica/app"}
+    app.config["REPLICA_LAG_SECONDS"] = 5
+    init_replica_routing(app, db.session)
+"""
+
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Optional
+
+from flask import current_app, has_app_context, request
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy import Select, UpdateBase
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+REPLICA_BIND_KEY = "replica"
+REPLICA_LAG_CONFIG = "REPLICA_LAG_SECONDS"
+REPLICA_COOKIE = "dev_kit_primary_until"
+
+_READ_DEPTH = "dev_kit.replica_reads"
+_PRIMARY_DEPTH = "dev_kit.primary_reads"
+_WROTE = "dev_kit.wrote"
+_PRIMARY_UNTIL = "dev_kit.primary_until"
+
+
+@contextmanager
+def _scope(session: Session, key: str):
+    session.info[key] = session.info.get(key, 0) + 1
+    try:
+        yield
+    finally:
+        session.info[key] -= 1
+
+
+def replica_reads(session: Session):
+    """
+    Context manager (or decorator) letting the SELECTs run in it use the replica.
+
+    Has no effect on sessions that aren't a `ReplicaSession`.
+    """
+    return _scope(session, _READ_DEPTH)
+
+
+def primary_reads(session: Session):
+    """Context manager (or decorator) keeping every query run in it on the primary."""
+    return _scope(session, _PRIMARY_DEPTH)
+
+
+def replica_read(func):
+    """Decorator running a repository method in a `replica_reads` scope of its session."""
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with replica_reads(self._db_session):
+            return func(self, *args, **kwargs)
+
+    return wrapper
+
+
+def has_written(session: Session) -> bool:
+    """Whether `session` has written since it was last closed."""
+    return session.info.get(_WROTE, False)
+
+
+class ReplicaSession(Session):
+    """
+    A `Session` routing the reads of `replica_reads` scopes to `replica_bind`.
+
+    Only statements that would run on the session's default bind are
+    rerouted; models bound elsewhere are left alone.
+
+    Args:
+        replica_bind: The replica's engine; None routes everything to the primary.
+        replica_lag: Seconds the session keeps reading from the primary after
+                     it is closed, if it has written.
+    """
+
+    def __init__(
+        self,
+        *args,
+        replica_bind: Optional[Engine | Connection] = None,
+        replica_lag: float = 0.0,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self._replica_bind = replica_bind
+        self._replica_lag = replica_lag
+
+    @property
+    def replica_bind(self) -> Optional[Engine | Connection]:
+        return self._replica_bind
+
+    @property
+    def replica_lag(self) -> float:
+        return self._replica_lag
+
+    def _default_bind(self) -> Optional[Engine | Connection]:
+        return self.bind
+
+    def _reads_from_primary(self) -> bool:
+        info = self.info
+        return (
+            not info.get(_READ_DEPTH)
+            or info.get(_PRIMARY_DEPTH, 0) > 0
+            or info.get(_WROTE, False)
+            or info.get(_PRIMARY_UNTIL, 0.0) > time.time()
+        )
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, bind: Any = None, **kwargs: Any):
+        primary = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info[_WROTE] = True
+            return primary
+        if (
+            bind is None
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+            and not self._reads_from_primary()
+        ):
+            replica = self.replica_bind
+            if replica is not None and primary is self._default_bind():
+                return replica
+        return primary
+
+    def close(self) -> None:
+        if self.info.pop(_WROTE, False):
+            until = time.time() + self.replica_lag
+            self.info[_PRIMARY_UNTIL] = max(until, self.info.get(_PRIMARY_UNTIL, 0.0))
+        super().close()
+
+
+class FlaskReplicaSession(ReplicaSession, FlaskSession):
+    """
+    The `ReplicaSession` of Flask-SQLAlchemy's `db.session`.
+
+    The replica is the engine of the `replica` bind key (`SQLALCHEMY_BINDS`)
+    and the lag is the `REPLICA_LAG_SECONDS` config value (0 by default).
+    """
+
+    @property
+    def replica_bind(self) -> Optional[Engine]:
+        return self._db.engines.get(REPLICA_BIND_KEY)
+
+    @property
+    def replica_lag(self) -> float:
+        return current_app.config.get(REPLICA_LAG_CONFIG, 0.0) if has_app_context() else 0.0
+
+    def _default_bind(self) -> Optional[Engine]:
+        return self._db.engines.get(None)
+
+
+def init_replica_routing(app, session: Session) -> None:
+    """
+    Keeps a client that wrote reading from the primary on its next requests.
+
+    A response to a request that wrote through `session` sets a cookie
+    holding the end of the `REPLICA_LAG_SECONDS` window; requests carrying
+    it read from the primary until then.
+    """
+
+    @app.before_request
+    def _restore_primary_window():
+        raw = request.cookies.get(REPLICA_COOKIE)
+        if raw:
+            try:
+                session.info[_PRIMARY_UNTIL] = float(raw)
+            except ValueError:
+                pass
+
+    @app.after_request
+    def _remember_primary_window(response):
+        lag = app.config.get(REPLICA_LAG_CONFIG, 0.0)
+        if lag and has_written(session):
+            response.set_cookie(
+                REPLICA_COOKIE,
+                f"{time.time() + lag:.3f}",
+                max_age=max(1, int(lag + 0.999)),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
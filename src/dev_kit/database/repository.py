@@ -6,19 +6,97 @@ This module contains the BaseRepository class which encapsulates common
 database operations (CRUD, pagination, filtering) for a given model.
 """
 
+import base64
+import binascii
+import datetime
+import decimal
+import json
 import math
+import threading
+import time
 from functools import wraps
-from typing import Any, Dict, Generic, List, NamedTuple, Optional, Type, TypeVar
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from flask import current_app
-from sqlalchemy import func
-from sqlalchemy.exc import SQLAlchemyError, IntegrityError
-from sqlalchemy.orm import DeclarativeMeta, Session
+from sqlalchemy import (
+    UniqueConstraint,
+    and_,
+    delete,
+    func,
+    insert,
+    inspect,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.exc import CompileError, SQLAlchemyError, IntegrityError
+from sqlalchemy.orm import DeclarativeMeta, RelationshipDirection, Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.session import make_transient_to_detached
 
-from dev_kit.exceptions import DatabaseError
+from dev_kit.database.cache import MISS, PENDING_INVALIDATIONS_KEY, CacheBackend, ModelCache
+from dev_kit.database.filters import compile_filter_plan
+from dev_kit.database.loading import LoadingSpec
+from dev_kit.database.replicas import replica_read, replica_reads
+from dev_kit.exceptions import BusinessLogicError, DatabaseError
 
 T = TypeVar("T", bound=DeclarativeMeta)
 
+# Strategies accepted by `BaseRepository.paginate(count=...)`.
+COUNT_STRATEGIES = ("exact", "none", "estimated", "cached")
+
+# A loading spec as accepted by the read methods (see `dev_kit.database.loading`).
+Loading = Union[None, LoadingSpec, Mapping[str, str]]
+
+# `Session.info` key of the per-session secondary index over unique columns.
+IDENTITY_INDEX_KEY = "dev_kit.identity_index"
+_MISSING = object()
+
+
+def unique_attributes(model: Optional[type]) -> Tuple[str, ...]:
+    """
+    Returns the mapped attributes of `model` backed by a single-column unique key.
+
+    Covers `unique=True` columns, single-column unique constraints and unique
+    indexes. The primary key is excluded: the session's identity map already
+    indexes it.
+    """
+    if model is None:
+        return ()
+    mapper = inspect(model)
+    unique_columns = set()
+    for table in mapper.tables:
+        unique_columns.update(c for c in table.columns if c.unique)
+        for constraint in table.constraints:
+            if isinstance(constraint, UniqueConstraint) and len(constraint.columns) == 1:
+                unique_columns.update(constraint.columns)
+        unique_columns.update(
+            c for index in table.indexes if index.unique and len(index.columns) == 1
+            for c in index.columns
+        )
+    return tuple(
+        attr.key
+        for attr in mapper.column_attrs
+        if len(attr.columns) == 1
+        and attr.columns[0] in unique_columns
+        and not attr.columns[0].primary_key
+    )
+
 
 class PaginationResult(Generic[T], NamedTuple):
     """A structured result for paginated queries."""
@@ -30,6 +108,75 @@ class PaginationResult(Generic[T], NamedTuple):
     total_pages: int
     has_next: bool
     has_prev: bool
+    total_is_exact: bool = True
+
+
+class CursorPaginationResult(Generic[T], NamedTuple):
+    """A structured result for keyset (cursor) paginated queries."""
+
+    items: List[T]
+    per_page: int
+    has_next: bool
+    has_prev: bool
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+
+
+def _encode_cursor_value(value: Any) -> Any:
+    """Tags non-JSON-native sort key values so they survive the round trip."""
+    if isinstance(value, datetime.datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"$d": value.isoformat()}
+    if isinstance(value, decimal.Decimal):
+        return {"$dec": str(value)}
+    return value
+
+
+def _decode_cursor_value(value: Any) -> Any:
+    """Reverses `_encode_cursor_value`."""
+    if isinstance(value, dict):
+        if "$dt" in value:
+            return datetime.datetime.fromisoformat(value["$dt"])
+        if "$d" in value:
+            return datetime.date.fromisoformat(value["$d"])
+        if "$dec" in value:
+            return decimal.Decimal(value["$dec"])
+    return value
+
+
+def encode_cursor(order_spec: List[str], values: List[Any], backwards: bool = False) -> str:
+    """
+    Encodes a keyset position into an opaque, URL-safe cursor string.
+
+    Args:
+        order_spec: The normalized sort spec the cursor was produced for.
+        values: The sort key values of the boundary row, in `order_spec` order.
+        backwards: Whether the cursor fetches the page *before* the boundary row.
+    """
+    payload = {
+        "o": order_spec,
+        "v": [_encode_cursor_value(v) for v in values],
+        "b": backwards,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[List[str], List[Any], bool]:
+    """
+    Decodes a cursor produced by `encode_cursor`.
+
+    Raises:
+        BusinessLogicError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = [_decode_cursor_value(v) for v in payload["v"]]
+        return list(payload["o"]), values, bool(payload.get("b", False))
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise BusinessLogicError("Invalid pagination cursor.") from e
 
 
 def handle_db_errors(func):
@@ -60,7 +207,127 @@ def handle_db_errors(func):
     return wrapper
 
 
-class BaseRepository(Generic[T]):
+class QueryBuildingMixin:
+    """
+    Statement building shared by `BaseRepository` and `AsyncBaseRepository`.
+
+    Filter plans, ordering, soft-delete filtering, keyset conditions, loading
+    specs and count cache keys only read the model, and a `Select` has the
+    same `filter`/`order_by` API as a `Query`, so both repositories build their
+    statements through these methods. Classes using it set `model`,
+    `_filter_plan` and `_loading_specs`.
+    """
+
+    count_cache_ttl: float = 60.0
+    count_cache_max_entries: int = 1024
+
+    def _loading(self, loading: Loading) -> Optional[LoadingSpec]:
+        """Compiles a mapping spec once and reuses it for later calls."""
+        if loading is None or isinstance(loading, LoadingSpec):
+            return loading
+        key = frozenset(loading.items())
+        spec = self._loading_specs.get(key)
+        if spec is None:
+            spec = self._loading_specs[key] = LoadingSpec(self.model, loading)
+        return spec
+
+    def _filter_soft_deleted(self, query, include_soft_deleted: bool):
+        """Adds a filter to exclude or include soft-deleted records."""
+        if not include_soft_deleted and hasattr(self.model, "deleted_at"):
+            return query.filter(self.model.deleted_at.is_(None))
+        return query
+
+    def _apply_filters(self, query, filters: Optional[Dict[str, Any]]):
+        """
+        Applies a dictionary of filters to the query using advanced operators.
+
+        Operators can be specified using `__` notation, e.g., `price__gte=100`.
+        Supported operators: eq, ne, lt, lte, gt, gte, like, ilike, in.
+        If no operator is specified, 'eq' (equals) is assumed. String values are
+        coerced to the column's Python type via the model's precompiled filter plan.
+        """
+        if not filters:
+            return query
+
+        def warn_unknown(op: str) -> None:
+            # If operator is unknown, skip this filter
+            current_app.logger.warning(f"Unknown filter operator: {op}")
+
+        clauses = self._filter_plan.build(filters, warn_unknown)
+        return query.filter(*clauses) if clauses else query
+
+    def _resolve_ordering(self, order_by: Optional[List[str]]) -> List[Tuple[str, bool]]:
+        """
+        Normalizes an `order_by` list into `(field_name, descending)` pairs.
+
+        Fields that don't exist on the model are silently dropped.
+        """
+        resolved = []
+        for field in order_by or []:
+            descending = field.startswith("-")
+            column_name = field[1:] if descending else field
+            if hasattr(self.model, column_name):
+                resolved.append((column_name, descending))
+        return resolved
+
+    def _apply_ordering(self, query, order_by: Optional[List[str]] = None):
+        """Applies sorting to the query based on a list of fields."""
+        for column_name, descending in self._resolve_ordering(order_by):
+            column = getattr(self.model, column_name)
+            query = query.order_by(column.desc() if descending else column.asc())
+        return query
+
+    def _keyset_ordering(self, order_by: Optional[List[str]]) -> List[Tuple[str, bool]]:
+        """Returns the keyset sort keys: the resolved ordering plus `id` as a tiebreaker."""
+        keys = self._resolve_ordering(order_by)
+        if not any(name == "id" for name, _ in keys):
+            keys.append(("id", False))
+        return keys
+
+    def _keyset_condition(self, keys: List[Tuple[str, bool]], values: List[Any], backwards: bool):
+        """
+        Builds the WHERE clause selecting rows strictly after (or before) a keyset position.
+
+        Uses a row-value comparison when every key sorts in the same direction, which
+        lets the database seek directly on a composite index; mixed directions fall
+        back to the equivalent OR-of-ANDs expansion.
+        """
+        columns = [getattr(self.model, name) for name, _ in keys]
+        directions = {descending for _, descending in keys}
+        if len(directions) == 1:
+            descending = directions.pop()
+            lhs, rhs = tuple_(*columns), tuple_(*values)
+            return lhs < rhs if descending != backwards else lhs > rhs
+
+        clauses = []
+        for i, (column, (_, descending)) in enumerate(zip(columns, keys)):
+            beyond = column < values[i] if descending != backwards else column > values[i]
+            clauses.append(and_(*(columns[j] == values[j] for j in range(i)), beyond))
+        return or_(*clauses)
+
+    def _visible(self, entity: Optional[T], include_soft_deleted: bool) -> Optional[T]:
+        """Applies the soft-delete rule to an already loaded entity."""
+        if entity is None or include_soft_deleted:
+            return entity
+        if getattr(entity, "deleted_at", None) is not None:
+            return None
+        return entity
+
+    @staticmethod
+    def _normalize_filter_value(value: Any) -> Any:
+        """Turns a filter value into a hashable, order-insensitive cache key part."""
+        if isinstance(value, (list, tuple, set)):
+            return tuple(sorted(map(str, value)))
+        return value if isinstance(value, (str, int, float, bool, type(None))) else str(value)
+
+    def _count_cache_key(self, filters: Dict[str, Any], include_soft_deleted: bool) -> Tuple:
+        normalized = tuple(
+            sorted((k, self._normalize_filter_value(v)) for k, v in filters.items())
+        )
+        return include_soft_deleted, normalized
+
+
+class BaseRepository(QueryBuildingMixin, Generic[T]):
     """
     Generic repository providing common CRUD operations for a SQLAlchemy model.
 
@@ -69,90 +336,168 @@ class BaseRepository(Generic[T]):
 
     Transactions (commits) are not handled by the repository itself and should
     be managed by the Service layer.
+
+    Subclasses may tune the `count="cached"` pagination strategy through the
+    `count_cache_ttl` (seconds) and `count_cache_max_entries` class attributes
+    (see `QueryBuildingMixin`).
+
+    When a `cache` backend is given, `get_by_id`, `get_by_uuid`/`get_by_unique`
+    and `paginate` results are kept there as column snapshots and rebuilt into
+    session-bound instances on hits. `BaseService` invalidates the model's
+    entries on every write (see `dev_kit.database.cache`).
+
+    The read methods accept a `loading` spec (a `LoadingSpec` or a mapping of
+    relationship paths to strategies, see `dev_kit.database.loading`) naming the
+    relationships to eager-load with the entities. They also accept `columns`,
+    a projection: only those columns are selected and plain rows (with one
+    attribute per column) are returned instead of entities, skipping ORM
+    hydration. Entities already in the session are returned as they are.
+
+    The read methods run in a `replica_reads` scope, so on a `ReplicaSession`
+    they query the read replica (see `dev_kit.database.replicas`).
     """
 
-    def __init__(self, model: Type[T], db_session: Session):
+    def __init__(
+        self,
+        model: Type[T],
+        db_session: Session,
+        cache: Optional[CacheBackend] = None,
+        cache_ttl: Optional[float] = None,
+    ):
         """
         Initializes the repository with a specific SQLAlchemy model and session.
 
         Args:
             model: The SQLAlchemy model class.
             db_session: The SQLAlchemy Session object.
+            cache (optional): A second-level cache backend for reads.
+            cache_ttl (optional): Lifetime of cached entries in seconds; defaults
+                                  to the backend's own TTL.
         """
         self.model = model
         self._db_session = db_session
+        self.cache: Optional[ModelCache] = None
+        if cache is not None and model is not None:
+            self.cache = ModelCache(cache, model.__tablename__, ttl=cache_ttl)
+        self._filter_plan = compile_filter_plan(model) if model is not None else None
+        self._count_cache: Dict[Tuple, Tuple[float, int]] = {}
+        self._count_cache_lock = threading.Lock()
+        self._unique_fields = frozenset(unique_attributes(model))
+        self._loading_specs: Dict[frozenset, LoadingSpec] = {}
+        column_attrs = inspect(model).column_attrs if model is not None else ()
+        self._column_keys = frozenset(attr.key for attr in column_attrs)
 
     def _query(self):
         """Returns a base query object for the repository's model."""
         return self._db_session.query(self.model)
 
-    def _filter_soft_deleted(self, query, include_soft_deleted: bool):
-        """Adds a filter to exclude or include soft-deleted records."""
-        if not include_soft_deleted and hasattr(self.model, "deleted_at"):
-            return query.filter(self.model.deleted_at.is_(None))
-        return query
+    def _with_loading(self, query, loading: Optional[LoadingSpec]):
+        return query.options(*loading.options) if loading is not None else query
 
-    def _apply_filters(self, query, filters: Optional[Dict[str, Any]]):
+    def _project(self, query, columns: Sequence[str]):
         """
-        Applies a dictionary of filters to the query using advanced operators.
+        Narrows `query` to the given columns, so it returns rows instead of entities.
 
-        Operators can be specified using `__` notation, e.g., `price__gte=100`.
-        Supported operators: eq, ne, lt, lte, gt, gte, like, ilike, in.
-        If no operator is specified, 'eq' (equals) is assumed.
+        Raises:
+            BusinessLogicError: If a name is not a column of the model.
         """
-        if not filters:
-            return query
+        unknown = [name for name in columns if name not in self._column_keys]
+        if unknown:
+            raise BusinessLogicError(f"Unknown column(s): {', '.join(unknown)}.")
+        return query.with_entities(*(getattr(self.model, name).label(name) for name in columns))
 
-        for key, value in filters.items():
-            parts = key.split("__")
-            field_name = parts[0]
-            op = parts[1] if len(parts) > 1 else "eq"
+    def _get_row(self, field: str, value: Any, columns: Sequence[str], include_soft_deleted: bool):
+        """Projected single-record lookup; a session or cache hit is returned as an entity."""
+        entity = self._cached_entity(field, value)
+        if entity is not None:
+            return self._visible(entity, include_soft_deleted)
+        query = self._filter_soft_deleted(self._query(), include_soft_deleted)
+        query = query.filter(getattr(self.model, field) == value)
+        return self._project(query, columns).first()
 
-            if not hasattr(self.model, field_name):
+    def _identity_index(self) -> Dict[Tuple, Tuple]:
+        """
+        The session's secondary index: `(model, field, value)` -> identity key.
+
+        It lives in `Session.info`, so it is scoped to the session (and thus to
+        the request with Flask-SQLAlchemy's scoped session).
+        """
+        return self._db_session.info.setdefault(IDENTITY_INDEX_KEY, {})
+
+    def _remember(self, entities) -> None:
+        """Records the unique-column values of loaded entities in the identity index."""
+        if not self._unique_fields:
+            return
+        index = self._identity_index()
+        for entity in entities:
+            state = inspect(entity)
+            if state.key is None:
                 continue
+            for field in self._unique_fields:
+                value = state.dict.get(field, _MISSING)
+                if value is not _MISSING and value is not None:
+                    index[(self.model, field, value)] = state.key
 
-            column = getattr(self.model, field_name)
-
-            if op == "in":
-                # For 'in' operator, accept both lists and comma-separated strings.
-                if isinstance(value, str):
-                    parsed = [v for v in (x.strip() for x in value.split(",")) if v]
-                else:
-                    parsed = list(value) if isinstance(value, (list, tuple, set)) else [value]
-                query = query.filter(column.in_(parsed))
-            elif op == "like":
-                query = query.filter(column.like(f"%{value}%"))
-            elif op == "ilike":
-                query = query.filter(column.ilike(f"%{value}%"))
-            else:
-                # Standard comparison operators
-                try:
-                    attr = {
-                        "eq": "__eq__",
-                        "ne": "__ne__",
-                        "lt": "__lt__",
-                        "lte": "__le__",
-                        "gt": "__gt__",
-                        "gte": "__ge__",
-                    }[op]
-                    query = query.filter(getattr(column, attr)(value))
-                except KeyError:
-                    # If operator is unknown, skip this filter
-                    current_app.logger.warning(f"Unknown filter operator: {op}")
-        return query
+    def _lookup(self, field: str, value: Any) -> Optional[T]:
+        """
+        Returns the entity already present in the session whose `field` equals `value`.
 
-    def _apply_ordering(self, query, order_by: Optional[List[str]] = None):
-        """Applies sorting to the query based on a list of fields."""
-        if order_by:
-            for field in order_by:
-                if field.startswith("-"):
-                    column_name = field[1:]
-                    if hasattr(self.model, column_name):
-                        query = query.order_by(getattr(self.model, column_name).desc())
-                else:
-                    if hasattr(self.model, field):
-                        query = query.order_by(getattr(self.model, field).asc())
-        return query
+        Only loaded, unexpired values are trusted: an entry whose instance left the
+        session, was expired (e.g. by a commit) or changed its value is a miss.
+        """
+        if field == "id":
+            key = self._db_session.identity_key(self.model, value)
+        else:
+            key = self._identity_index().get((self.model, field, value))
+        if key is None:
+            return None
+        entity = self._db_session.identity_map.get(key)
+        if entity is None or inspect(entity).dict.get(field, _MISSING) != value:
+            return None
+        return entity
+
+    def _is_indexed(self, field: str) -> bool:
+        return field == "id" or field in self._unique_fields
+
+    def _snapshot(self, entity: T) -> Dict[str, Any]:
+        """The column values of `entity`, as stored in the second-level cache."""
+        return {attr.key: getattr(entity, attr.key) for attr in inspect(self.model).column_attrs}
+
+    def _restore(self, snapshot: Dict[str, Any]) -> T:
+        """Rebuilds a cached snapshot into an instance attached to the session, without a query."""
+        identity = self._db_session.identity_key(self.model, snapshot["id"])
+        entity = self._db_session.identity_map.get(identity)
+        if entity is not None:
+            return entity
+        entity = inspect(self.model).class_manager.new_instance()
+        for key, value in snapshot.items():
+            set_committed_value(entity, key, value)
+        make_transient_to_detached(entity)
+        entity = self._db_session.merge(entity, load=False)
+        self._remember([entity])
+        return entity
+
+    def _can_populate_cache(self) -> bool:
+        """
+        Whether reads may be written to the cache.
+
+        Not while this session holds uncommitted writes to the model: other
+        sessions must never be served state that may still be rolled back.
+        """
+        return self.cache.invalidate not in self._db_session.info.get(PENDING_INVALIDATIONS_KEY, ())
+
+    def _cached_entity(self, field: str, value: Any) -> Optional[T]:
+        """Looks `field == value` up in the session, then in the second-level cache."""
+        entity = self._lookup(field, value) if self._is_indexed(field) else None
+        if entity is None and self.cache is not None:
+            snapshot = self.cache.get((field, value))
+            if snapshot is not MISS:
+                entity = self._restore(snapshot)
+        return entity
+
+    def _cache_entity(self, field: str, value: Any, entity: Optional[T]) -> None:
+        if entity is not None and self.cache is not None and self._can_populate_cache():
+            self.cache.set((field, value), self._snapshot(entity))
 
     @handle_db_errors
     def create(self, data: Dict[str, Any]) -> T:
@@ -162,18 +507,113 @@ class BaseRepository(Generic[T]):
         return entity
 
     @handle_db_errors
-    def get_by_id(self, id_: Any, include_soft_deleted: bool = False) -> Optional[T]:
-        """Fetches a single record by its primary key."""
-        query = self._query().filter_by(id=id_)
-        query = self._filter_soft_deleted(query, include_soft_deleted)
-        return query.first()
+    @replica_read
+    def get_by_id(
+        self,
+        id_: Any,
+        include_soft_deleted: bool = False,
+        loading: Loading = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Optional[T]:
+        """
+        Fetches a single record by its primary key.
+
+        Uses `Session.get`, so a record already loaded in this session is returned
+        from the identity map without a query (and without applying `loading`).
+        """
+        if columns:
+            return self._get_row("id", id_, columns, include_soft_deleted)
+        loading = self._loading(loading)
+        entity = self._cached_entity("id", id_) if self.cache is not None else None
+        if entity is None:
+            options = loading.options if loading is not None else None
+            entity = self._db_session.get(self.model, id_, options=options)
+            if entity is not None:
+                self._remember([entity])
+                self._cache_entity("id", id_, entity)
+        return self._visible(entity, include_soft_deleted)
 
     @handle_db_errors
-    def get_by_uuid(self, uuid: str, include_soft_deleted: bool = False) -> Optional[T]:
+    @replica_read
+    def get_by_unique(
+        self,
+        field: str,
+        value: Any,
+        include_soft_deleted: bool = False,
+        loading: Loading = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Optional[T]:
+        """
+        Fetches a single record by a unique column (e.g. `uuid` or `username`).
+
+        The session's identity index is consulted first, so looking up the same
+        record several times in one request issues a single query.
+        """
+        if field == "id":
+            return self.get_by_id(value, include_soft_deleted, loading, columns)
+        if columns:
+            return self._get_row(field, value, columns, include_soft_deleted)
+        entity = self._cached_entity(field, value)
+        if entity is None:
+            query = self._with_loading(self._query(), self._loading(loading))
+            entity = query.filter(getattr(self.model, field) == value).first()
+            if entity is not None:
+                self._remember([entity])
+                self._cache_entity(field, value, entity)
+        return self._visible(entity, include_soft_deleted)
+
+    def get_by_uuid(
+        self,
+        uuid: str,
+        include_soft_deleted: bool = False,
+        loading: Loading = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Optional[T]:
         """Fetches a single record by its UUID."""
-        query = self._query().filter_by(uuid=uuid)
-        query = self._filter_soft_deleted(query, include_soft_deleted)
-        return query.first()
+        return self.get_by_unique("uuid", uuid, include_soft_deleted, loading, columns)
+
+    @handle_db_errors
+    @replica_read
+    def get_version(
+        self, field: str, value: Any, include_soft_deleted: bool = False
+    ) -> Optional[Tuple[Any, Optional[datetime.datetime], Optional[int]]]:
+        """
+        Returns `(id, updated_at, version)` for the record whose `field` equals `value`.
+
+        A cheap probe for conditional requests: only those columns are read
+        (nothing when the record is already loaded). `updated_at` and `version`
+        are None for models without the column (see `VersionMixin`). Returns
+        None when there is no such record.
+        """
+        columns = tuple(c for c in ("id", "updated_at", "version") if c in self._column_keys)
+        found = self._get_row(field, value, columns, include_soft_deleted)
+        if found is None:
+            return None
+        return found.id, getattr(found, "updated_at", None), getattr(found, "version", None)
+
+    @handle_db_errors
+    @replica_read
+    def get_collection_version(
+        self, filters: Optional[Dict[str, Any]] = None, include_soft_deleted: bool = False
+    ) -> Tuple[int, Optional[datetime.datetime], Optional[int]]:
+        """
+        Returns `(count, max(updated_at), sum(version))` over the records matching `filters`.
+
+        One aggregate query. `sum(version)` is None for models without a
+        `version` column (see `VersionMixin`); with one, the triple changes
+        whenever a matching record is added, removed or updated, so it can
+        stand in for a result's version. `max(updated_at)` alone misses writes
+        made within its resolution (one second on SQLite).
+        """
+        if "updated_at" not in self._column_keys:
+            raise BusinessLogicError(f"{self.model.__name__} has no updated_at column.")
+        query = self._filter_soft_deleted(self._query(), include_soft_deleted)
+        query = self._apply_filters(query, filters.copy() if filters else {})
+        aggregates = [func.count(), func.max(self.model.updated_at)]
+        if "version" in self._column_keys:
+            aggregates.append(func.coalesce(func.sum(self.model.version), 0))
+        count, last_updated, *version = query.with_entities(*aggregates).one()
+        return count, last_updated, version[0] if version else None
 
     @handle_db_errors
     def delete(self, entity: T, soft: bool = True) -> None:
@@ -191,7 +631,205 @@ class BaseRepository(Generic[T]):
         else:
             self._db_session.delete(entity)
 
+    def invalidate_count_cache(self) -> None:
+        """Drops all memoized totals; called by the service layer after writes."""
+        with self._count_cache_lock:
+            self._count_cache.clear()
+
+    def _exact_count(self, query) -> int:
+        return query.with_entities(func.count(self.model.id)).order_by(None).scalar()
+
+    def _cached_count(self, query, key: Tuple) -> Tuple[int, bool]:
+        """Returns `(total, is_fresh)`, serving from the TTL cache when possible."""
+        now = time.monotonic()
+        entry = self._count_cache.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1], False
+
+        total = self._exact_count(query)
+        with self._count_cache_lock:
+            if len(self._count_cache) >= self.count_cache_max_entries:
+                # Dicts keep insertion order, so this evicts the oldest entry.
+                self._count_cache.pop(next(iter(self._count_cache)), None)
+            self._count_cache[key] = (now + self.count_cache_ttl, total)
+        return total, True
+
+    def _estimated_count(self, query) -> Optional[int]:
+        """
+        Asks the query planner for a row estimate instead of counting.
+
+        Supported on PostgreSQL and MySQL/MariaDB; returns None on other dialects
+        so the caller can fall back to an exact count.
+        """
+        bind = self._db_session.get_bind()
+        dialect = bind.dialect.name
+        if dialect not in {"postgresql", "mysql", "mariadb"}:
+            return None
+
+        try:
+            compiled = query.statement.compile(
+                dialect=bind.dialect, compile_kwargs={"literal_binds": True}
+            )
+        except (CompileError, NotImplementedError):
+            # Some bound values can't be rendered inline; count exactly instead.
+            return None
+        # Sent as is: `text()` would take a ':word' inside a literal for a parameter
+        connection = self._db_session.connection()
+        if dialect == "postgresql":
+            plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}").scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+
+        rows = connection.exec_driver_sql(f"EXPLAIN {compiled}").mappings().all()
+        return int(rows[0]["rows"] or 0) if rows else 0
+
+    # --- Bulk operations ---
+    #
+    # Unlike the single-entity methods, these are not wrapped in
+    # `handle_db_errors`: that decorator rolls back the whole session, while the
+    # service layer runs each chunk in a savepoint and needs the raw SQLAlchemy
+    # error to retry the chunk row by row.
+
+    def _supports_bulk_returning(self) -> bool:
+        dialect = self._db_session.get_bind().dialect
+        return bool(getattr(dialect, "insert_executemany_returning", False))
+
+    def bulk_insert(self, rows: List[Dict[str, Any]]) -> List[T]:
+        """
+        Inserts many rows and returns the resulting entities in input order.
+
+        Uses a single executemany `INSERT ... RETURNING` where the dialect
+        supports it, falling back to `add_all()` plus one flush elsewhere.
+        """
+        if not rows:
+            return []
+        if self._supports_bulk_returning():
+            stmt = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+            return list(self._db_session.scalars(stmt, rows).all())
+
+        entities = [self.model(**row) for row in rows]
+        self._db_session.add_all(entities)
+        self._db_session.flush()
+        return entities
+
+    @replica_read
+    def get_many(
+        self,
+        values: List[Any],
+        id_field: str = "id",
+        include_soft_deleted: bool = False,
+        loading: Loading = None,
+    ) -> List[T]:
+        """
+        Fetches every record whose `id_field` is in `values`.
+
+        For the primary key and unique columns, records already in the session are
+        reused and only the misses are loaded, with one `IN` query. Results follow
+        the order of `values`; unknown values are skipped.
+        """
+        if not values:
+            return []
+        base_query = self._with_loading(self._query(), self._loading(loading))
+        if not self._is_indexed(id_field):
+            query = base_query.filter(getattr(self.model, id_field).in_(list(values)))
+            return self._filter_soft_deleted(query, include_soft_deleted).all()
+
+        found: Dict[Any, T] = {}
+        for value in values:
+            entity = self._lookup(id_field, value)
+            if entity is not None:
+                found[value] = entity
+        misses = list(dict.fromkeys(v for v in values if v not in found))
+        if misses:
+            loaded = base_query.filter(getattr(self.model, id_field).in_(misses)).all()
+            self._remember(loaded)
+            found.update((getattr(entity, id_field), entity) for entity in loaded)
+
+        entities = []
+        for value in dict.fromkeys(values):
+            entity = self._visible(found.get(value), include_soft_deleted)
+            if entity is not None:
+                entities.append(entity)
+        return entities
+
+    def get_many_by_uuid(
+        self, uuids: List[str], include_soft_deleted: bool = False, loading: Loading = None
+    ) -> List[T]:
+        """Fetches records by UUID, loading those not already in the session in one query."""
+        return self.get_many(uuids, "uuid", include_soft_deleted, loading)
+
+    @replica_read
+    def existing_ids(
+        self, values: List[Any], id_field: str = "id", include_soft_deleted: bool = False
+    ) -> set:
+        """Returns the subset of `values` that match a record, without loading entities."""
+        if not values:
+            return set()
+        column = getattr(self.model, id_field)
+        stmt = select(column).where(column.in_(list(values)))
+        if not include_soft_deleted and hasattr(self.model, "deleted_at"):
+            stmt = stmt.where(self.model.deleted_at.is_(None))
+        return set(self._db_session.scalars(stmt).all())
+
+    def _delete_dependents(self, condition) -> None:
+        """
+        Does what the ORM would on `session.delete` for the rows matching
+        `condition`, one statement per relationship: drops their many-to-many
+        association rows, deletes the children of one-to-many relationships
+        cascading deletes and nulls the foreign key of the others. The
+        children's own relationships are left to `ON DELETE` actions.
+        """
+        for relationship in inspect(self.model).relationships:
+            if relationship.viewonly or relationship.passive_deletes == "all":
+                continue
+            if relationship.secondary is not None:
+                table = relationship.secondary
+            elif relationship.direction is RelationshipDirection.ONETOMANY:
+                table = relationship.mapper.local_table
+            else:
+                continue
+            parents = [parent for parent, _ in relationship.synchronize_pairs]
+            children = [child for _, child in relationship.synchronize_pairs]
+            referencing = (children[0] if len(children) == 1 else tuple_(*children)).in_(
+                select(*parents).where(condition)
+            )
+            if table is relationship.secondary or "delete" in relationship.cascade:
+                stmt = delete(table).where(referencing)
+            else:
+                stmt = update(table).where(referencing).values({child.key: None for child in children})
+            self._db_session.execute(stmt)
+
+    def bulk_delete(self, values: List[Any], id_field: str = "id", soft: bool = True) -> int:
+        """
+        Deletes every record whose `id_field` is in `values` with one statement.
+
+        Soft deletes set `deleted_at` when the model supports it. Hard deletes are
+        issued as a Core `DELETE`, preceded by one statement per relationship
+        doing what the ORM cascade would (see `_delete_dependents`), so no
+        association rows are orphaned even without foreign key enforcement
+        (SQLite's default).
+
+        Returns:
+            The number of affected rows.
+        """
+        if not values:
+            return 0
+        column = getattr(self.model, id_field)
+        if soft and hasattr(self.model, "deleted_at"):
+            stmt = (
+                update(self.model)
+                .where(column.in_(list(values)), self.model.deleted_at.is_(None))
+                .values(deleted_at=func.now())
+            )
+        else:
+            self._delete_dependents(column.in_(list(values)))
+            stmt = delete(self.model).where(column.in_(list(values)))
+        result = self._db_session.execute(stmt.execution_options(synchronize_session="fetch"))
+        return result.rowcount
+
     @handle_db_errors
+    @replica_read
     def paginate(
         self,
         page: int = 1,
@@ -199,6 +837,9 @@ class BaseRepository(Generic[T]):
         filters: Optional[Dict[str, Any]] = None,
         order_by: Optional[List[str]] = None,
         include_soft_deleted: bool = False,
+        count: str = "exact",
+        loading: Loading = None,
+        columns: Optional[Sequence[str]] = None,
     ) -> PaginationResult[T]:
         """
         Performs a paginated query.
@@ -209,31 +850,213 @@ class BaseRepository(Generic[T]):
             filters: A dictionary of filters to apply to the query.
             order_by: A list of fields to sort by.
             include_soft_deleted: Whether to include soft-deleted items.
+            count: How to compute the total, one of `COUNT_STRATEGIES`:
+                   - `exact`: run a `COUNT(*)` query (default).
+                   - `none`: skip counting; `total`/`total_pages` are None and
+                     `has_next` is derived by fetching one extra row.
+                   - `estimated`: use the planner's row estimate where the dialect
+                     supports it, falling back to an exact count elsewhere.
+                   - `cached`: memoize the exact count per normalized filter set for
+                     `count_cache_ttl` seconds; cleared by writes through the service,
+                     and again when their transaction ends.
+            loading: Relationships to eager-load with the page. Pages loaded with
+                     an eager spec bypass the second-level cache, which only
+                     holds column values.
+            columns: Select only these columns and return rows instead of
+                     entities (`loading` is then ignored). Projected pages
+                     bypass the second-level cache.
 
         Returns:
             A PaginationResult named tuple containing the items and pagination info.
         """
-        query = self._query()
-        query = self._filter_soft_deleted(query, include_soft_deleted)
+        if count not in COUNT_STRATEGIES:
+            raise BusinessLogicError(
+                f"Unknown count strategy '{count}'. Expected one of {', '.join(COUNT_STRATEGIES)}."
+            )
 
         filters_copy = filters.copy() if filters else {}
-        query = self._apply_filters(query, filters_copy)
+        loading = self._loading(loading)
+        page_key = None
+        eager = loading is not None and loading.is_eager
+        if self.cache is not None and not eager and not columns:
+            page_key = (
+                "page",
+                page,
+                per_page,
+                self._count_cache_key(filters_copy, include_soft_deleted),
+                tuple(order_by or ()),
+                count,
+            )
+            cached = self.cache.get(page_key)
+            if cached is not MISS:
+                snapshots, fields = cached
+                return PaginationResult(
+                    items=[self._restore(snapshot) for snapshot in snapshots], **fields
+                )
 
-        # Using a subquery for count for performance on complex queries
-        count_query = query.with_entities(func.count(self.model.id))
-        total_count = count_query.scalar()
+        query = self._query()
+        query = self._filter_soft_deleted(query, include_soft_deleted)
+        query = self._apply_filters(query, filters_copy)
 
-        total_pages = math.ceil(total_count / per_page) if total_count > 0 else 0
+        total_count: Optional[int] = None
+        total_is_exact = False
+        if count == "exact":
+            total_count, total_is_exact = self._exact_count(query), True
+        elif count == "cached":
+            key = self._count_cache_key(filters_copy, include_soft_deleted)
+            total_count, total_is_exact = self._cached_count(query, key)
+        elif count == "estimated":
+            total_count = self._estimated_count(query)
+            if total_count is None:
+                total_count, total_is_exact = self._exact_count(query), True
 
         query = self._apply_ordering(query, order_by)
-        items = query.offset((page - 1) * per_page).limit(per_page).all()
+        # Loader options and projections only after counting: the count query
+        # selects its own entity
+        if columns:
+            query = self._project(query, columns)
+        else:
+            query = self._with_loading(query, loading)
+        query = query.offset((page - 1) * per_page)
+
+        if total_is_exact:
+            items = query.limit(per_page).all()
+            total_pages = math.ceil(total_count / per_page) if total_count > 0 else 0
+            has_next = page < total_pages
+        else:
+            # Totals we didn't just count can't be trusted for has_next.
+            rows = query.limit(per_page + 1).all()
+            items, has_next = rows[:per_page], len(rows) > per_page
+            total_pages = (
+                math.ceil(total_count / per_page) if total_count else total_count
+            )
 
-        return PaginationResult(
+        result = PaginationResult(
             items=items,
             total=total_count,
             page=page,
             per_page=per_page,
             total_pages=total_pages,
-            has_next=(page < total_pages),
+            has_next=has_next,
             has_prev=(page > 1),
+            total_is_exact=total_is_exact,
+        )
+        if page_key is not None and self._can_populate_cache():
+            fields = result._asdict()
+            del fields["items"]
+            self.cache.set(page_key, ([self._snapshot(e) for e in items], fields))
+        return result
+
+    def stream(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[List[str]] = None,
+        include_soft_deleted: bool = False,
+        columns: Optional[Sequence[str]] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Any]:
+        """
+        Yields every record matching `filters`, fetched `batch_size` rows at a time.
+
+        The query runs once, on a server-side cursor where the driver supports
+        one (`yield_per`), so memory use doesn't grow with the number of rows;
+        with `columns` it yields plain rows instead of entities. Rows come in
+        `order_by` order, with `id` as a tiebreaker.
+
+        Not wrapped in `handle_db_errors`: errors surface while the caller
+        iterates, after this method has returned.
+        """
+        query = self._query()
+        if columns:
+            query = self._project(query, columns)
+        query = self._filter_soft_deleted(query, include_soft_deleted)
+        query = self._apply_filters(query, filters.copy() if filters else {})
+        for name, descending in self._keyset_ordering(order_by):
+            column = getattr(self.model, name)
+            query = query.order_by(column.desc() if descending else column.asc())
+        with replica_reads(self._db_session):
+            yield from query.yield_per(batch_size)
+
+    @handle_db_errors
+    @replica_read
+    def paginate_by_cursor(
+        self,
+        cursor: Optional[str] = None,
+        per_page: int = 20,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[List[str]] = None,
+        include_soft_deleted: bool = False,
+        loading: Loading = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> CursorPaginationResult[T]:
+        """
+        Performs a keyset (cursor) paginated query.
+
+        Instead of skipping `OFFSET` rows, each page seeks past the sort key of the
+        last row seen, so fetching a deep page costs the same as fetching the first.
+        The sort keys are the `order_by` fields plus `id` as a tiebreaker; they should
+        be non-nullable for the ordering to be total.
+
+        Args:
+            cursor: An opaque cursor from a previous page's `next_cursor` or
+                    `prev_cursor`. `None` (or an empty string) starts at the first page.
+            per_page: The number of items per page.
+            filters: A dictionary of filters to apply to the query.
+            order_by: A list of fields to sort by.
+            include_soft_deleted: Whether to include soft-deleted items.
+            loading: Relationships to eager-load with the page.
+            columns: Select only these columns (plus the sort keys) and return
+                     rows instead of entities.
+
+        Returns:
+            A CursorPaginationResult named tuple containing the items and cursors.
+
+        Raises:
+            BusinessLogicError: If the cursor is malformed or was issued for a
+                                different sort order.
+        """
+        keys = self._keyset_ordering(order_by)
+        order_spec = [f"-{name}" if descending else name for name, descending in keys]
+
+        query = self._query()
+        if columns:
+            # The sort keys are needed to build the cursors
+            columns = list(dict.fromkeys([*columns, *(name for name, _ in keys)]))
+            query = self._project(query, columns)
+        else:
+            query = self._with_loading(query, self._loading(loading))
+        query = self._filter_soft_deleted(query, include_soft_deleted)
+        query = self._apply_filters(query, filters.copy() if filters else {})
+
+        backwards = False
+        if cursor:
+            cursor_spec, values, backwards = decode_cursor(cursor)
+            if cursor_spec != order_spec or len(values) != len(keys):
+                raise BusinessLogicError("Pagination cursor does not match the sort order.")
+            query = query.filter(self._keyset_condition(keys, values, backwards))
+
+        for name, descending in keys:
+            column = getattr(self.model, name)
+            # Walking backwards reads the preceding rows nearest-first.
+            query = query.order_by(column.desc() if descending != backwards else column.asc())
+
+        rows = query.limit(per_page + 1).all()
+        has_more = len(rows) > per_page
+        items = rows[:per_page]
+        if backwards:
+            items.reverse()
+
+        def cursor_for(item, to_previous: bool) -> str:
+            values = [getattr(item, name) for name, _ in keys]
+            return encode_cursor(order_spec, values, backwards=to_previous)
+
+        has_next = True if backwards else has_more
+        has_prev = has_more if backwards else bool(cursor)
+        return CursorPaginationResult(
+            items=items,
+            per_page=per_page,
+            has_next=has_next,
+            has_prev=has_prev,
+            next_cursor=cursor_for(items[-1], False) if items and has_next else None,
+            prev_cursor=cursor_for(items[0], True) if items and has_prev else None,
         )
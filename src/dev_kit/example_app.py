@@ -4,6 +4,7 @@ from flask_jwt_extended import JWTManager
 from dev_kit.database.extensions import db
 from dev_kit.web.jwt import configure_jwt
 from dev_kit.web.decorators import setup_rate_limiting
+from dev_kit.modules.users.hashing import configure_hashing
 from dev_kit.modules.users.routes import auth_bp, users_bp, roles_bp, permissions_bp
 
 
@@ -26,6 +27,8 @@ def create_app() -> APIFlask:
     jwt = JWTManager(app)
     configure_jwt(jwt)
     setup_rate_limiting(app, default_rate="200/minute")
+    # Password hashing runs on a bounded pool (HASHING_* config keys)
+    configure_hashing(app)
 
     # Blueprints
     app.register_blueprint(auth_bp)
@@ -133,3 +133,20 @@ class DatabaseError(AppBaseException):
     ):
         super().__init__(message, status_code=500, error_code=self.error_code)
         self.original_exception = original_exception
+
+
+class ServiceUnavailableError(AppBaseException):
+    """Raised when the server is temporarily overloaded and sheds the request."""
+
+    status_code = 503
+    error_code = "SERVICE_UNAVAILABLE"
+
+    def __init__(
+        self,
+        message: str = "The service is temporarily unavailable.",
+        retry_after: int | None = None,
+    ):
+        super().__init__(message, status_code=503, error_code=self.error_code)
+        self.retry_after = retry_after
+        # Picked up by the blueprint error handlers
+        self.headers = {"Retry-After": str(retry_after)} if retry_after is not None else {}
@@ -0,0 +1,348 @@
+# src/dev_kit/modules/users/hashing.py
+"""
+A bounded worker pool for password hashing.
+
+Password hashes (PBKDF2/scrypt) are deliberately CPU-expensive. Running them
+inline on request threads lets a burst of logins occupy every worker, so the
+users module routes them through a `HashingExecutor` instead:
+
+- At most `max_workers` hashes run at once. The default thread pool is enough
+  because `hashlib.pbkdf2_hmac` and `hashlib.scrypt` release the GIL; a process
+  pool can be used for hash functions that don't.
+- At most `max_pending` more requests wait for a worker. Beyond that the
+  executor refuses work with `ServiceUnavailableError` (HTTP 503 with a
+  `Retry-After` header) instead of queueing without bound.
+- `metrics()` reports in-flight and queued work, rejections and hash latency.
+
+New hashes follow the module-wide `HashingPolicy` (algorithm and cost).
+Hashes made under another policy keep verifying, and `HashingPolicy.needs_rehash`
+tells when one should be replaced; `UserService.login_user` does that in the
+background after a successful login. Background jobs hold the plaintext
+password until they run, so at most `BACKGROUND_MAX_PENDING` of them are
+queued (more are dropped; the next login retries) and a user has at most one.
+
+Apps configure the module-wide executor and policy from their config with
+`configure_hashing(app)`:
+
+    HASHING_MAX_WORKERS      worker count (default: CPU count)
+    HASHING_MAX_PENDING      waiting requests beyond the workers (default: 4 x workers)
+    HASHING_USE_PROCESSES    use a process pool instead of threads (default: False)
+    HASHING_ACQUIRE_TIMEOUT  seconds to wait for a queue slot before a 503 (default: 0)
+    PASSWORD_HASH_METHOD     werkzeug method string, e.g. "scrypt:32768:8:1" or
+                             "pbkdf2:sha256:600000" (default: "scrypt")
+    PASSWORD_SALT_LENGTH     salt length in characters (default: 16)
+
+Use `measure_verify_latency` (or `benchmarks/bench_hashing.py`) to size login
+capacity for a policy on the current machine.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from dev_kit.exceptions import ServiceUnavailableError
+
+
+# werkzeug's defaults for method strings that omit their cost parameters
+_SCRYPT_DEFAULTS = (2**15, 8, 1)
+_PBKDF2_DEFAULT_HASH = "sha256"
+_PBKDF2_DEFAULT_ITERATIONS = 1_000_000
+
+
+def _parse_method(method: str) -> Tuple[str, Tuple]:
+    """
+    Normalizes a werkzeug method string to `(algorithm, params)`.
+
+    Raises:
+        ValueError: If the method or its parameters are not supported.
+    """
+    algorithm, *args = method.split(":")
+    if algorithm == "scrypt":
+        if not args:
+            return algorithm, _SCRYPT_DEFAULTS
+        if len(args) != 3:
+            raise ValueError("'scrypt' takes 3 arguments.")
+        return algorithm, tuple(int(a) for a in args)
+    if algorithm == "pbkdf2":
+        if len(args) > 2:
+            raise ValueError("'pbkdf2' takes 2 arguments.")
+        hash_name = args[0] if args else _PBKDF2_DEFAULT_HASH
+        iterations = int(args[1]) if len(args) == 2 else _PBKDF2_DEFAULT_ITERATIONS
+        return algorithm, (hash_name, iterations)
+    raise ValueError(f"Invalid hash method '{method}'.")
+
+
+class HashingPolicy:
+    """
+    The algorithm and cost parameters new password hashes are generated with.
+
+    Args:
+        method: A werkzeug method string such as "scrypt:32768:8:1" or
+                "pbkdf2:sha256:600000"; omitted parameters take werkzeug's defaults.
+        salt_length: The salt length in characters.
+
+    Raises:
+        ValueError: If `method` is not a supported method string.
+    """
+
+    def __init__(self, method: str = "scrypt", salt_length: int = 16):
+        self.algorithm, self.params = _parse_method(method)
+        self.salt_length = salt_length
+
+    @property
+    def method(self) -> str:
+        """The fully specified method string, as stored in the hash prefix."""
+        return ":".join([self.algorithm, *map(str, self.params)])
+
+    def __repr__(self) -> str:
+        return f"HashingPolicy({self.method!r}, salt_length={self.salt_length})"
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, HashingPolicy)
+            and (self.method, self.salt_length) == (other.method, other.salt_length)
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.method, self.salt_length))
+
+    def hash(self, password: str) -> str:
+        """Hashes `password` under this policy on the calling thread."""
+        return generate_password_hash(password, self.method, self.salt_length)
+
+    def needs_rehash(self, pwhash: Optional[str]) -> bool:
+        """
+        Whether `pwhash` was made under different parameters than this policy.
+
+        Any difference counts, not only weaker ones, so lowering the cost (or
+        switching algorithm) migrates stored hashes as users log in.
+        """
+        if not pwhash:
+            return False
+        try:
+            stored = _parse_method(pwhash.split("$", 1)[0])
+        except ValueError:
+            return True
+        return stored != (self.algorithm, self.params)
+
+
+def measure_verify_latency(policy: HashingPolicy, rounds: int = 5) -> float:
+    """Returns the median time in seconds to verify one password under `policy`."""
+    pwhash = policy.hash("benchmark-password-1")
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        check_password_hash(pwhash, "benchmark-password-1")
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+_policy = HashingPolicy()
+
+
+def get_hashing_policy() -> HashingPolicy:
+    """Returns the module-wide policy new password hashes are generated with."""
+    return _policy
+
+
+def set_hashing_policy(policy: HashingPolicy) -> HashingPolicy:
+    global _policy
+    _policy = policy
+    return policy
+
+
+class HashingExecutor:
+    """
+    Runs password hashing functions on a bounded pool.
+
+    Args:
+        max_workers: Hashes computed concurrently. Defaults to the CPU count.
+        max_pending: Callers allowed to wait for a worker; further calls are
+                     rejected. Defaults to four times `max_workers`.
+        use_processes: Use a process pool instead of threads.
+        acquire_timeout: Seconds a caller may wait for a queue slot before
+                         being rejected; 0 rejects immediately.
+        retry_after: Seconds suggested to rejected clients via `Retry-After`.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        use_processes: bool = False,
+        acquire_timeout: float = 0.0,
+        retry_after: int = 1,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = self.max_workers * 4 if max_pending is None else max_pending
+        self.use_processes = use_processes
+        self.acquire_timeout = acquire_timeout
+        self.retry_after = retry_after
+
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_pending)
+        self._pool: Optional[Executor] = None
+        self._pool_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    def _get_pool(self) -> Executor:
+        # Created lazily so importing the module never spawns workers.
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    pool_cls = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+                    self._pool = pool_cls(max_workers=self.max_workers)
+        return self._pool
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Runs `fn(*args)` on the pool and waits for its result.
+
+        Raises:
+            ServiceUnavailableError: If every worker and queue slot is taken.
+        """
+        if self.acquire_timeout:
+            acquired = self._slots.acquire(timeout=self.acquire_timeout)
+        else:
+            acquired = self._slots.acquire(blocking=False)
+        if not acquired:
+            with self._metrics_lock:
+                self._rejected += 1
+            raise ServiceUnavailableError(
+                "Too many authentication requests, please retry shortly.",
+                retry_after=self.retry_after,
+            )
+        with self._metrics_lock:
+            self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            return self._get_pool().submit(fn, *args).result()
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._metrics_lock:
+                self._in_flight -= 1
+                self._completed += 1
+                self._latency_total += elapsed
+                self._latency_max = max(self._latency_max, elapsed)
+            self._slots.release()
+
+    def generate_password_hash(self, password: str, method: Optional[str] = None) -> str:
+        """Hashes `password` with `method`, or under the current `HashingPolicy`."""
+        if method is None:
+            policy = get_hashing_policy()
+            return self.run(generate_password_hash, password, policy.method, policy.salt_length)
+        return self.run(generate_password_hash, password, method)
+
+    def check_password_hash(self, pwhash: str, password: str) -> bool:
+        return self.run(check_password_hash, pwhash, password)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        A snapshot of the executor's activity.
+
+        `queue_depth` counts callers waiting for a worker; `in_flight` includes
+        both running and waiting calls. Latencies are in seconds and include the
+        time spent queued.
+        """
+        with self._metrics_lock:
+            completed = self._completed
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "in_flight": self._in_flight,
+                "queue_depth": max(self._in_flight - self.max_workers, 0),
+                "completed": completed,
+                "rejected": self._rejected,
+                "latency_avg": self._latency_total / completed if completed else 0.0,
+                "latency_max": self._latency_max,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait)
+                self._pool = None
+
+
+_executor = HashingExecutor()
+_background: Optional[ThreadPoolExecutor] = None
+_background_lock = threading.Lock()
+_background_jobs: Dict[Any, Future] = {}
+
+# Background jobs queued or running at once; more are dropped
+BACKGROUND_MAX_PENDING = 64
+
+
+def run_in_background(fn: Callable[..., Any], *args: Any, key: Any = None) -> Optional[Future]:
+    """
+    Runs maintenance work (such as rehashing) off the request path.
+
+    Jobs run one at a time on a dedicated thread, so they can never take more
+    than one worker's share of the hashing pool. At most
+    `BACKGROUND_MAX_PENDING` jobs are queued or running: beyond that the job
+    is dropped and None returned, so it must be safe to skip (a rehash is
+    retried on the next login). While a job with the same `key` is pending,
+    its future is returned instead of queueing another one.
+    """
+    global _background
+    with _background_lock:
+        if key is not None and key in _background_jobs:
+            return _background_jobs[key]
+        if len(_background_jobs) >= BACKGROUND_MAX_PENDING:
+            return None
+        if _background is None:
+            _background = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dev-kit-rehash")
+        future = _background.submit(fn, *args)
+        # Anonymous jobs count towards the bound under a key of their own
+        job_key = key if key is not None else future
+        _background_jobs[job_key] = future
+
+    def forget(_: Future) -> None:
+        with _background_lock:
+            if _background_jobs.get(job_key) is future:
+                del _background_jobs[job_key]
+
+    future.add_done_callback(forget)
+    return future
+
+
+def get_hashing_executor() -> HashingExecutor:
+    """Returns the module-wide executor used by the users services."""
+    return _executor
+
+
+def set_hashing_executor(executor: HashingExecutor) -> HashingExecutor:
+    """Replaces the module-wide executor, shutting the previous one down."""
+    global _executor
+    previous, _executor = _executor, executor
+    if previous is not executor:
+        previous.shutdown(wait=False)
+    return executor
+
+
+def configure_hashing(app) -> HashingExecutor:
+    """Builds the module-wide executor and policy from `app.config` (see module docs)."""
+    config = app.config
+    set_hashing_policy(
+        HashingPolicy(
+            config.get("PASSWORD_HASH_METHOD", "scrypt"),
+            salt_length=config.get("PASSWORD_SALT_LENGTH", 16),
+        )
+    )
+    return set_hashing_executor(
+        HashingExecutor(
+            max_workers=config.get("HASHING_MAX_WORKERS"),
+            max_pending=config.get("HASHING_MAX_PENDING"),
+            use_processes=config.get("HASHING_USE_PROCESSES", False),
+            acquire_timeout=config.get("HASHING_ACQUIRE_TIMEOUT", 0.0),
+        )
+    )
@@ -1,14 +1,21 @@
 from sqlalchemy import String, Column, VARCHAR, BOOLEAN, TIMESTAMP, INTEGER, Table, ForeignKey, TEXT
 from sqlalchemy import func, text
 from sqlalchemy.orm import declarative_base, relationship
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
 
-from dev_kit.database.mixins import IDMixin, TimestampMixin, UUIDMixin, SoftDeleteMixin
+from dev_kit.database.mixins import (
+    IDMixin,
+    TimestampMixin,
+    UUIDMixin,
+    SoftDeleteMixin,
+    VersionMixin,
+)
+from .hashing import get_hashing_policy
 
 Base = declarative_base()
 
 
-class User(Base, IDMixin, UUIDMixin, TimestampMixin, SoftDeleteMixin):
+class User(Base, IDMixin, UUIDMixin, TimestampMixin, VersionMixin, SoftDeleteMixin):
     __tablename__ = "users"
     username = Column(String(80), unique=True, nullable=False)
     password_hash = Column(VARCHAR(255), nullable=False)
@@ -38,7 +45,7 @@ class User(Base, IDMixin, UUIDMixin, TimestampMixin, SoftDeleteMixin):
     def set_password(self, password):
         if not password:
             raise ValueError("Password cannot be empty.")
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = get_hashing_policy().hash(password)
 
     def check_password(self, password):
         if not self.password_hash or not password:
@@ -48,7 +55,7 @@ class User(Base, IDMixin, UUIDMixin, TimestampMixin, SoftDeleteMixin):
 
 # Association table and role/permission models (lightweight, optional use)
 
-class Role(Base, IDMixin, TimestampMixin):
+class Role(Base, IDMixin, TimestampMixin, VersionMixin):
     __tablename__ = "roles"
     name = Column(VARCHAR(50), unique=True, nullable=False)
     display_name = Column(VARCHAR(50), nullable=False)
@@ -85,8 +92,11 @@ class UserRoleAssociation(Base):
     assigner = relationship("User", foreign_keys=[assigned_by_user_id], back_populates="roles_assigned_by_me")
 
 
-class Permission(Base, IDMixin, TimestampMixin):
+class Permission(Base, IDMixin, TimestampMixin, VersionMixin):
     __tablename__ = "permissions"
+    # Compact tokens use ids as bit positions: never hand a deleted id out again
+    # (migration 0003 rebuilds existing SQLite tables this way)
+    __table_args__ = {"sqlite_autoincrement": True}
     name = Column(VARCHAR(100), unique=True, nullable=False)  # e.g., "create:user"
     description = Column(TEXT, nullable=True)
 
@@ -5,13 +5,15 @@ from flask_jwt_extended import (
     set_refresh_cookies,
     unset_jwt_cookies,
     jwt_required,
+    get_jwt,
     get_jwt_identity,
 )
 
 from dev_kit.web.routing import register_crud_routes
 from dev_kit.web.schemas import MessageSchema
 from dev_kit.web.decorators import permission_required
-from dev_kit.exceptions import AuthenticationError
+from dev_kit.web.jwt import revoke_token
+from dev_kit.exceptions import AppBaseException, AuthenticationError
 from .schemas import (
     user_schemas,
     LoginSchema,
@@ -30,6 +32,13 @@ users_bp = APIBlueprint("users", __name__, url_prefix="/users")
 roles_bp = APIBlueprint("roles", __name__, url_prefix="/roles")
 permissions_bp = APIBlueprint("permissions", __name__, url_prefix="/permissions")
 
+
+@auth_bp.errorhandler(AppBaseException)
+def handle_auth_app_exception(error):
+    # Surfaces auth failures (401) and hashing backpressure (503, with Retry-After)
+    return error.to_dict(), error.status_code, getattr(error, "headers", None) or {}
+
+
 # تسجيل مسارات CRUD تلقائياً لهذه الوحدة
 register_crud_routes(
     bp=users_bp,
@@ -103,11 +112,7 @@ def login(json_data):
 @auth_bp.doc(summary="Current Authenticated User")
 def whoami():
     user_uuid = get_jwt_identity()
-    user = user_service.get_by_uuid(user_uuid) if hasattr(user_service, "get_by_uuid") else None
-    if user is None:
-        from .models import User
-        user = db.session.query(User).filter(User.uuid == user_uuid).first()
-    return user
+    return user_service.get_by_uuid(user_uuid, include_soft_deleted=True)
 
 
 @auth_bp.post("/refresh")
@@ -128,6 +133,10 @@ def refresh():
 @auth_bp.output(MessageSchema)
 @auth_bp.doc(summary="Logout and clear tokens")
 def logout():
+    claims = get_jwt()
+    if claims:
+        # The presented token stays unusable until it expires
+        revoke_token(claims)
     resp = make_response(jsonify({"message": "Logged out"}))
     unset_jwt_cookies(resp)
     return resp
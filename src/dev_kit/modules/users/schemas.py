@@ -16,6 +16,7 @@ user_schemas = create_crud_schemas(
         "last_login_at",
         "password_hash",
         "uuid",
+        "version",
     ],
     exclude_from_update=[
         "created_at",
@@ -24,6 +25,7 @@ user_schemas = create_crud_schemas(
         "last_login_at",
         "password_hash",
         "uuid",
+        "version",
     ],
 )
 
@@ -39,14 +41,18 @@ class AuthTokenSchema(Schema):
     user = Nested(user_schemas["main"], metadata={"description": "Authenticated user."})
 
 
-role_schemas = create_crud_schemas(model_class=Role)
+role_schemas = create_crud_schemas(
+    model_class=Role, exclude_from_input=["version"], exclude_from_update=["version"]
+)
 
 
 class AssignRoleSchema(Schema):
     role_id = Integer(required=True)
 
 
-permission_schemas = create_crud_schemas(model_class=Permission)
+permission_schemas = create_crud_schemas(
+    model_class=Permission, exclude_from_input=["version"], exclude_from_update=["version"]
+)
 
 
 class ChangePasswordSchema(Schema):
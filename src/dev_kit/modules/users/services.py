@@ -1,14 +1,120 @@
+import logging
+from concurrent.futures import Future
 from datetime import datetime, timedelta
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional, Tuple
 
+from flask import current_app
 from flask_jwt_extended import create_access_token, create_refresh_token
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
 
 from dev_kit.services import BaseService
 from dev_kit.database.extensions import db
-from dev_kit.exceptions import AuthenticationError, BusinessLogicError
+from dev_kit.database.cache import MISS, LRUTTLCache, invalidate_on_transaction_end
+from dev_kit.database.repository import BaseRepository
+from dev_kit.exceptions import AppBaseException, AuthenticationError, BusinessLogicError
+from dev_kit.web.permissions import PERMISSION_BITS_CLAIM, permission_bit_registry
+from .hashing import get_hashing_executor, get_hashing_policy, run_in_background
 from .models import User, Role, UserRoleAssociation, Permission
 
+logger = logging.getLogger(__name__)
+
+
+class UserGrants(NamedTuple):
+    """The effective RBAC grants of a user, as embedded in access tokens."""
+
+    roles: List[str]
+    is_super_admin: bool
+    permissions: List[str]
+
+
+class RolePermissionCache:
+    """
+    Memoizes each role's compiled permission set and each user's role ids.
+
+    A user's grants resolve with one joined query on a miss and none on a hit,
+    however many roles they hold. Entries are dropped by the services that
+    change the underlying rows (role/permission assignment, role and permission
+    updates or deletes); the TTL bounds staleness across processes.
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl: Optional[float] = 300.0):
+        self._cache = LRUTTLCache(max_entries=max_entries, ttl=ttl)
+
+    @property
+    def stats(self):
+        return self._cache.stats
+
+    def _cached_roles(self, user_id: int) -> Optional[List[tuple]]:
+        role_ids = self._cache.get(("user", user_id))
+        if role_ids is MISS:
+            return None
+        roles = []
+        for role_id in role_ids:
+            role = self._cache.get(("role", role_id))
+            if role is MISS:
+                return None
+            roles.append(role)
+        return roles
+
+    def _load_roles(self, session, user_id: int) -> List[tuple]:
+        rows = session.execute(
+            select(Role.id, Role.name, Role.is_system_role, Permission.name)
+            .select_from(UserRoleAssociation)
+            .join(Role, Role.id == UserRoleAssociation.role_id)
+            .outerjoin(
+                Permission.role_permissions,
+                Permission.role_permissions.c.role_id == Role.id,
+            )
+            .outerjoin(Permission, Permission.id == Permission.role_permissions.c.permission_id)
+            .where(UserRoleAssociation.user_id == user_id)
+            .order_by(Role.id)
+        )
+        compiled: Dict[int, tuple] = {}
+        for role_id, name, is_system_role, permission in rows:
+            if role_id not in compiled:
+                compiled[role_id] = (name, bool(is_system_role), set())
+            if permission:
+                compiled[role_id][2].add(permission)
+
+        roles = []
+        for role_id, (name, is_system_role, permissions) in compiled.items():
+            role = (name, is_system_role, frozenset(permissions))
+            self._cache.set(("role", role_id), role)
+            roles.append(role)
+        self._cache.set(("user", user_id), tuple(compiled))
+        return roles
+
+    def grants_for_user(self, session, user_id: int) -> UserGrants:
+        """Returns the user's roles, super-admin flag and permission names."""
+        roles = self._cached_roles(user_id)
+        if roles is None:
+            roles = self._load_roles(session, user_id)
+        permissions = set()
+        for _, _, role_permissions in roles:
+            permissions |= role_permissions
+        return UserGrants(
+            roles=[name for name, _, _ in roles],
+            is_super_admin=any(is_system_role for _, is_system_role, _ in roles),
+            permissions=sorted(permissions),
+        )
+
+    def invalidate_roles(self, role_ids: Iterable[int]) -> None:
+        for role_id in role_ids:
+            self._cache.delete(("role", role_id))
+
+    def invalidate_user(self, user_id: int) -> None:
+        self._cache.delete(("user", user_id))
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+role_permission_cache = RolePermissionCache()
+
 class UserService(BaseService[User]):
+    permission_cache: RolePermissionCache = role_permission_cache
+
     @staticmethod
     def _validate_password_strength(password: str) -> None:
         if not password or len(password) < 8:
@@ -18,6 +124,13 @@ class UserService(BaseService[User]):
         if not (has_alpha and has_digit):
             raise BusinessLogicError("Password must include letters and numbers.")
 
+    @staticmethod
+    def _check_password(user: User, password: str) -> bool:
+        # Same contract as User.check_password, computed on the hashing pool
+        if not user.password_hash or not password:
+            return False
+        return get_hashing_executor().check_password_hash(user.password_hash, password)
+
     def _username_exists(self, username: str) -> bool:
         return (
             self._db_session.query(User).filter(User.username == username).first()
@@ -29,19 +142,47 @@ class UserService(BaseService[User]):
         if username and self._username_exists(username):
             raise BusinessLogicError("Username already exists.")
 
+        return self._hash_password_field(data)
+
+    def _hash_password_field(self, data: Dict[str, Any]) -> Dict[str, Any]:
         password = data.pop("password", None)
         if password:
             self._validate_password_strength(password)
-            # Use model's helper for consistency
-            temp_user = User()
-            temp_user.set_password(password)
-            data["password_hash"] = temp_user.password_hash
+            data["password_hash"] = get_hashing_executor().generate_password_hash(password)
         return data
 
+    def pre_create_hook_many(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any] | AppBaseException]:
+        # One query for every username in the batch instead of one per row
+        usernames = [data.get("username") for data in items if data.get("username")]
+        taken = set()
+        if usernames:
+            taken = {
+                name
+                for (name,) in self._db_session.query(User.username).filter(
+                    User.username.in_(usernames)
+                )
+            }
+
+        processed: List[Dict[str, Any] | AppBaseException] = []
+        for data in items:
+            username = data.get("username")
+            if username and username in taken:
+                processed.append(BusinessLogicError("Username already exists."))
+                continue
+            try:
+                data = self._hash_password_field(data)
+            except BusinessLogicError as e:
+                processed.append(e)
+                continue
+            if username:
+                taken.add(username)  # reject duplicates within the batch too
+            processed.append(data)
+        return processed
+
     def login_user(self, username: str, password: str) -> Tuple[User, str]:
         user = self.repo._query().filter(User.username == username).first()
 
-        if not user or not user.check_password(password):
+        if not user or not self._check_password(user, password):
             raise AuthenticationError("Invalid credentials.")
         if not user.is_active:
             raise AuthenticationError("User account is not active.")
@@ -51,24 +192,21 @@ class UserService(BaseService[User]):
         user.last_login_at = datetime.now()
         self._db_session.add(user)
         self._db_session.commit()
+        if get_hashing_policy().needs_rehash(user.password_hash):
+            self._schedule_rehash(user, password)
 
-        roles = list(getattr(user, "roles", []))
-        is_super_admin = any(getattr(role, "is_system_role", False) for role in roles)
-        # Aggregate permissions from roles if available
-        permissions = []
-        for role in roles:
-            for perm in getattr(role, "permissions", []) or []:
-                name = getattr(perm, "name", None)
-                if name:
-                    permissions.append(name)
-        # De-duplicate
-        permissions = sorted(set(permissions))
+        grants = self.permission_cache.grants_for_user(self._db_session, user.id)
         additional_claims = {
             "user_id": user.id,
-            "roles": [role.name for role in roles],
-            "is_super_admin": is_super_admin,
-            "permissions": permissions,
+            "roles": grants.roles,
+            "is_super_admin": grants.is_super_admin,
         }
+        if current_app.config.get("JWT_COMPACT_PERMISSIONS", False):
+            additional_claims[PERMISSION_BITS_CLAIM] = permission_bit_registry.encode(
+                grants.permissions
+            )
+        else:
+            additional_claims["permissions"] = grants.permissions
 
         access_token = create_access_token(
             identity=str(getattr(user, "uuid", user.id)),
@@ -78,16 +216,57 @@ class UserService(BaseService[User]):
         refresh_token = create_refresh_token(identity=str(getattr(user, "uuid", user.id)))
         return user, access_token, refresh_token
 
-    def change_password(self, user_uuid: str, current_password: str, new_password: str) -> None:
-        user = (
-            self._db_session.query(User)
-            .filter(User.uuid == user_uuid)
-            .first()
+    def _schedule_rehash(self, user: User, password: str) -> Optional[Future]:
+        """
+        Upgrades a hash made under an older policy without delaying the login.
+
+        Returns None when the background queue is full; the next login retries.
+        A user's rehash already pending is not queued twice.
+        """
+        bind = self._db_session.get_bind()
+        engine = getattr(bind, "engine", bind)
+        future = run_in_background(
+            self._rehash_password,
+            engine,
+            user.id,
+            user.password_hash,
+            password,
+            key=("rehash", engine.url, user.id),
         )
-        if not user or not user.check_password(current_password):
+        if future is None:
+            logger.info("Password rehash for user %s skipped: background queue full", user.id)
+        return future
+
+    @staticmethod
+    def _rehash_password(engine, user_id: int, old_hash: str, password: str) -> bool:
+        """
+        Replaces `old_hash` with a hash under the current policy.
+
+        The update only applies if the stored hash is still `old_hash`, so a
+        password changed in the meantime is never overwritten. Returns whether
+        the hash was replaced.
+        """
+        try:
+            new_hash = get_hashing_executor().generate_password_hash(password)
+            with Session(engine) as session:
+                result = session.execute(
+                    update(User)
+                    .where(User.id == user_id, User.password_hash == old_hash)
+                    # Not a user-visible change: keep updated_at as it was
+                    .values(password_hash=new_hash, updated_at=User.updated_at)
+                )
+                session.commit()
+                return result.rowcount == 1
+        except Exception:
+            logger.warning("Password rehash failed for user %s", user_id, exc_info=True)
+            return False
+
+    def change_password(self, user_uuid: str, current_password: str, new_password: str) -> None:
+        user = self.repo.get_by_uuid(user_uuid, include_soft_deleted=True)
+        if not user or not self._check_password(user, current_password):
             raise AuthenticationError("Invalid credentials.")
         self._validate_password_strength(new_password)
-        user.set_password(new_password)
+        user.password_hash = get_hashing_executor().generate_password_hash(new_password)
         self._db_session.add(user)
         self._db_session.commit()
 
@@ -96,16 +275,15 @@ user_service = UserService(model=User, db_session=db.session)
 
 
 class RoleService(BaseService[Role]):
+    permission_cache: RolePermissionCache = role_permission_cache
+
     def __init__(self):
         super().__init__(model=Role, db_session=db.session)
+        # Users are looked up by UUID through the session's identity index
+        self.users = BaseRepository(model=User, db_session=self._db_session)
 
     def assign_role(self, user_uuid: str, role_id: int, assigned_by_user_id: int):
-        # Fetch user by UUID using the shared session (Role has no UUID)
-        user = (
-            self._db_session.query(User)
-            .filter(User.uuid == user_uuid)
-            .first()
-        )
+        user = self.users.get_by_uuid(user_uuid, include_soft_deleted=True)
         role = self._db_session.get(Role, role_id)
 
         if not user or not role:
@@ -124,23 +302,24 @@ class RoleService(BaseService[Role]):
         )
         self._db_session.add(association)
         self._db_session.commit()
+        self.permission_cache.invalidate_user(user.id)
+
+    def _after_write(self) -> None:
+        super()._after_write()
+        # Renamed or deleted roles change every holder's grants; logins racing
+        # the commit may cache the old ones, so clear again once it lands
+        invalidate_on_transaction_end(self._db_session, self.permission_cache.clear)
 
     def get_roles_for_user(self, user_uuid: str):
-        user = (
-            self._db_session.query(User)
-            .filter(User.uuid == user_uuid)
-            .first()
+        user = self.users.get_by_uuid(
+            user_uuid, include_soft_deleted=True, loading={"roles": "selectin"}
         )
         if not user:
             return []
         return user.roles
 
     def revoke_role(self, user_uuid: str, role_id: int):
-        user = (
-            self._db_session.query(User)
-            .filter(User.uuid == user_uuid)
-            .first()
-        )
+        user = self.users.get_by_uuid(user_uuid, include_soft_deleted=True)
         if not user:
             return
         assoc = (
@@ -151,11 +330,21 @@ class RoleService(BaseService[Role]):
         if assoc:
             self._db_session.delete(assoc)
             self._db_session.commit()
+            self.permission_cache.invalidate_user(user.id)
 
 
 class PermissionService(BaseService[Permission]):
+    permission_cache: RolePermissionCache = role_permission_cache
+
     def __init__(self):
         super().__init__(model=Permission, db_session=db.session)
+        self.roles = BaseRepository(model=Role, db_session=self._db_session)
+
+    def _after_write(self) -> None:
+        super()._after_write()
+        # A renamed or deleted permission may be part of any role's set
+        invalidate_on_transaction_end(self._db_session, self.permission_cache.clear)
+        permission_bit_registry.invalidate()
 
     def assign_permission_to_role(self, role_id: int, permission_id: int):
         role = self._db_session.get(Role, role_id)
@@ -166,6 +355,7 @@ class PermissionService(BaseService[Permission]):
             role.permissions.append(perm)
             self._db_session.add(role)
             self._db_session.commit()
+            self.permission_cache.invalidate_roles([role_id])
 
     def revoke_permission_from_role(self, role_id: int, permission_id: int):
         role = self._db_session.get(Role, role_id)
@@ -176,11 +366,20 @@ class PermissionService(BaseService[Permission]):
             role.permissions.remove(perm)
             self._db_session.add(role)
             self._db_session.commit()
+            self.permission_cache.invalidate_roles([role_id])
 
     def list_role_permissions(self, role_id: int):
-        role = self._db_session.get(Role, role_id)
+        role = self.roles.get_by_id(role_id, loading={"permissions": "selectin"})
         return [] if not role else role.permissions
 
 
+def load_permission_bits() -> List[Tuple[int, str]]:
+    """Returns the `(id, name)` rows compact token permission bitsets are built from."""
+    return db.session.execute(select(Permission.id, Permission.name)).all()
+
+
+if permission_bit_registry.loader is None:
+    permission_bit_registry.loader = load_permission_bits
+
 role_service = RoleService()
 permission_service = PermissionService()
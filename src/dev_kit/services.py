@@ -7,13 +7,42 @@ operations and manages database transactions through the `handle_session`
 decorator.
 """
 
+import datetime
 from functools import wraps
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
+from sqlalchemy import inspect
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
 
-from dev_kit.database.repository import BaseRepository, PaginationResult
-from dev_kit.exceptions import NotFoundError
+from dev_kit.database.cache import CacheBackend, ModelCache, invalidate_on_transaction_end
+from dev_kit.database.replicas import primary_reads
+from dev_kit.database.repository import (
+    BaseRepository,
+    CursorPaginationResult,
+    Loading,
+    PaginationResult,
+)
+from dev_kit.exceptions import (
+    AppBaseException,
+    BusinessLogicError,
+    DatabaseError,
+    DuplicateEntryError,
+    NotFoundError,
+)
 
 
 def handle_session(func):
@@ -21,35 +50,102 @@ def handle_session(func):
     Decorator to handle database session using nested transactions (savepoints).
     Ensures atomicity for the enclosed operation without committing the outer
     transaction. Uses a context manager for clarity and correctness.
+
+    Every query of the operation runs on the primary, even on a `ReplicaSession`.
     """
 
     @wraps(func)
     def wrapper(self, *args, **kwargs):
         # Using begin_nested as a context manager for savepoint-based transactions
-        with self._db_session.begin_nested():
+        with primary_reads(self._db_session), self._db_session.begin_nested():
             return func(self, *args, **kwargs)
 
     return wrapper
 
 
+def server_generated_attributes(model: Optional[type]) -> Tuple[str, ...]:
+    """
+    Returns the mapped attributes of `model` whose values are produced by the database.
+
+    These are the columns with a server default, a SQL-expression default or
+    onupdate (e.g. `func.now()`), a server-side onupdate, or a computed/identity
+    value. Python-side defaults are applied by the ORM before the statement is
+    sent, so they are never included.
+    """
+    if model is None:
+        return ()
+    names = []
+    for column_attr in inspect(model).column_attrs:
+        for column in column_attr.columns:
+            generated = (
+                column.server_default is not None
+                or column.server_onupdate is not None
+                or column.computed is not None
+                or column.identity is not None
+                or (column.default is not None and column.default.is_clause_element)
+                or (column.onupdate is not None and column.onupdate.is_clause_element)
+            )
+            if generated and not column.primary_key:
+                names.append(column_attr.key)
+                break
+    return tuple(names)
+
+
 TModel = TypeVar("TModel")
 # Allow TRepo to be any subclass of BaseRepository
 TRepo = TypeVar("TRepo", bound=BaseRepository)
 
 
+class BulkFailure(NamedTuple):
+    """A single row that could not be processed by a bulk operation."""
+
+    index: int
+    message: str
+    error_code: str
+
+
+class BulkResult(Generic[TModel], NamedTuple):
+    """The outcome of a bulk operation: the processed items and per-row failures."""
+
+    items: List[Any]
+    failures: List[BulkFailure]
+
+
+def _to_bulk_failure(index: int, error: Exception) -> BulkFailure:
+    """Maps an exception raised while processing one row to a `BulkFailure`."""
+    if isinstance(error, IntegrityError):
+        error = DuplicateEntryError("Duplicate key or unique constraint violated.")
+    elif isinstance(error, SQLAlchemyError):
+        error = DatabaseError(original_exception=error)
+    elif not isinstance(error, AppBaseException):
+        raise error
+    return BulkFailure(index=index, message=error.message, error_code=error.error_code)
+
+
+def _chunked(items: List[Any], size: int):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
 class BaseService(Generic[TModel]):
     """
     A generic service layer that encapsulates business logic and manages transactions.
 
     It creates its own repository instance (or accepts a custom one) and ensures
     that all operations are performed within a single database session.
+
+    Bulk operations process their input in chunks of `bulk_chunk_size` rows,
+    each chunk in its own savepoint.
     """
 
+    bulk_chunk_size: int = 500
+
     def __init__(
         self,
         model: Type[TModel],
         db_session: Session,
         repository_class: Type[TRepo] = None,
+        cache: Optional[CacheBackend] = None,
     ):
         """
         Initializes the service and its underlying repository.
@@ -59,18 +155,70 @@ class BaseService(Generic[TModel]):
             db_session: The SQLAlchemy session to be used for all operations.
             repository_class (optional): A custom repository class to use.
                                          Defaults to BaseRepository.
+            cache (optional): A second-level cache backend for the repository's
+                              reads; invalidated by this service's writes.
         """
         self.model = model
         self._db_session = db_session
 
         # Use the provided repository class or default to BaseRepository
         repo_cls = repository_class or BaseRepository
-        self.repo: TRepo = repo_cls(model=self.model, db_session=self._db_session)
+        repo_kwargs = {"cache": cache} if cache is not None else {}
+        self.repo: TRepo = repo_cls(model=self.model, db_session=self._db_session, **repo_kwargs)
+        self._server_generated = server_generated_attributes(model)
+        self._dependent_caches: List[ModelCache] = []
+
+    def add_dependent_cache(self, cache: ModelCache) -> None:
+        """
+        Registers a cache derived from this service's data (e.g. cached responses).
+
+        It is invalidated like the repository's own cache: after every write
+        through this service, and again when the transaction ends.
+        """
+        self._dependent_caches.append(cache)
+
+    def _after_write(self) -> None:
+        """Called after every successful write so derived read caches can be dropped."""
+        invalidate_on_transaction_end(self._db_session, self.repo.invalidate_count_cache)
+        if self.repo.cache is not None:
+            self.repo.cache.invalidate_on_transaction_end(self._db_session)
+        for cache in self._dependent_caches:
+            cache.invalidate_on_transaction_end(self._db_session)
+
+    def _load_server_generated(self, entity: TModel) -> None:
+        """
+        Loads the server-generated attributes a flush left expired on `entity`.
+
+        Mappers with `eager_defaults` (see `TimestampMixin`) already fetch these
+        through `RETURNING` on dialects that support it, in which case no query
+        is issued; otherwise only the missing columns are selected.
+        """
+        unloaded = inspect(entity).unloaded
+        missing = [name for name in self._server_generated if name in unloaded]
+        if missing:
+            self._db_session.refresh(entity, attribute_names=missing)
 
     def pre_create_hook(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Optional hook to modify data before creating an entity."""
         return data
 
+    def pre_create_hook_many(
+        self, items: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any] | AppBaseException]:
+        """
+        Batched form of `pre_create_hook` used by `bulk_create`.
+
+        Returns one entry per input item: the processed data, or the exception
+        that rejected it. Override to replace per-row checks with set-based ones.
+        """
+        processed: List[Dict[str, Any] | AppBaseException] = []
+        for data in items:
+            try:
+                processed.append(self.pre_create_hook(data))
+            except AppBaseException as e:
+                processed.append(e)
+        return processed
+
     def pre_update_hook(self, instance: TModel, data: Dict[str, Any]):
         """Optional hook to apply updates to an entity instance."""
         for key, value in data.items():
@@ -83,7 +231,8 @@ class BaseService(Generic[TModel]):
         processed_data = self.pre_create_hook(data)
         entity = self.repo.create(processed_data)
         self._db_session.flush()  # Use flush to get the ID before commit
-        self._db_session.refresh(entity)
+        self._load_server_generated(entity)
+        self._after_write()
         return entity
 
     @handle_session
@@ -99,7 +248,8 @@ class BaseService(Generic[TModel]):
 
         self.pre_update_hook(entity, data)
         self._db_session.flush()
-        self._db_session.refresh(entity)
+        self._load_server_generated(entity)
+        self._after_write()
         return entity
 
     @handle_session
@@ -112,20 +262,183 @@ class BaseService(Generic[TModel]):
             raise NotFoundError(entity_name=self.model.__name__, entity_id=entity_id)
 
         self.repo.delete(entity, soft=soft)
+        self._after_write()
         return None
 
+    def _run_chunk(
+        self,
+        rows: List[tuple],
+        apply: Callable[[List[tuple]], List[Any]],
+        failures: List[BulkFailure],
+    ) -> List[tuple]:
+        """
+        Applies `apply` to a chunk of `(index, payload)` rows inside a savepoint.
+
+        If the chunk fails as a whole, it is retried row by row (each in its own
+        savepoint) so a single bad row doesn't abort its neighbours. Returns the
+        `(index, result)` pairs that succeeded.
+        """
+        try:
+            with primary_reads(self._db_session), self._db_session.begin_nested():
+                return list(zip((i for i, _ in rows), apply(rows)))
+        except (SQLAlchemyError, AppBaseException) as e:
+            if len(rows) == 1:
+                failures.append(_to_bulk_failure(rows[0][0], e))
+                return []
+
+        succeeded = []
+        for row in rows:
+            try:
+                with primary_reads(self._db_session), self._db_session.begin_nested():
+                    succeeded.extend(zip([row[0]], apply([row])))
+            except (SQLAlchemyError, AppBaseException) as e:
+                failures.append(_to_bulk_failure(row[0], e))
+        return succeeded
+
+    def bulk_create(
+        self, items: List[Dict[str, Any]], chunk_size: Optional[int] = None
+    ) -> BulkResult[TModel]:
+        """
+        Creates many entities, reporting rows that fail instead of aborting.
+
+        Rows go through `pre_create_hook_many`, then are inserted in chunks with
+        a single executemany `INSERT ... RETURNING` per chunk where supported.
+
+        Returns:
+            A BulkResult with the created entities (in input order) and failures.
+        """
+        failures: List[BulkFailure] = []
+        rows = []
+        for index, data in enumerate(self.pre_create_hook_many(list(items))):
+            if isinstance(data, AppBaseException):
+                failures.append(_to_bulk_failure(index, data))
+            else:
+                rows.append((index, data))
+
+        def insert_rows(chunk):
+            return self.repo.bulk_insert([data for _, data in chunk])
+
+        created = []
+        for chunk in _chunked(rows, chunk_size or self.bulk_chunk_size):
+            created.extend(self._run_chunk(chunk, insert_rows, failures))
+
+        if created:
+            self._after_write()
+        failures.sort(key=lambda f: f.index)
+        return BulkResult(items=[entity for _, entity in sorted(created)], failures=failures)
+
+    def bulk_update(
+        self,
+        items: List[Dict[str, Any]],
+        id_field: str = "id",
+        chunk_size: Optional[int] = None,
+    ) -> BulkResult[TModel]:
+        """
+        Updates many entities identified by `id_field` ('id' or 'uuid').
+
+        Each item is a dict holding the identifier under `id_field` and the
+        changes under `data`. Entities of a chunk are loaded with one `IN` query,
+        updated through `pre_update_hook` and flushed together.
+        """
+        failures: List[BulkFailure] = []
+        rows = []
+        for index, item in enumerate(items):
+            if item.get(id_field) is None:
+                failures.append(
+                    _to_bulk_failure(index, BusinessLogicError(f"Missing '{id_field}'."))
+                )
+            else:
+                rows.append((index, item))
+
+        def update_rows(chunk):
+            found = {
+                getattr(e, id_field): e
+                for e in self.repo.get_many([item[id_field] for _, item in chunk], id_field)
+            }
+            entities = []
+            for _, item in chunk:
+                entity = found.get(item[id_field])
+                if entity is None:
+                    raise NotFoundError(entity_name=self.model.__name__, entity_id=item[id_field])
+                self.pre_update_hook(entity, item.get("data", {}))
+                entities.append(entity)
+            self._db_session.flush()
+            return entities
+
+        updated = []
+        for chunk in _chunked(rows, chunk_size or self.bulk_chunk_size):
+            updated.extend(self._run_chunk(chunk, update_rows, failures))
+
+        if updated:
+            self._after_write()
+        failures.sort(key=lambda f: f.index)
+        return BulkResult(items=[entity for _, entity in sorted(updated)], failures=failures)
+
+    def bulk_delete(
+        self,
+        ids: List[Any],
+        id_field: str = "id",
+        soft: bool = True,
+        chunk_size: Optional[int] = None,
+    ) -> BulkResult[TModel]:
+        """
+        Deletes many entities identified by `id_field` with one statement per chunk.
+
+        Returns:
+            A BulkResult whose items are the identifiers that were deleted.
+        """
+        failures: List[BulkFailure] = []
+
+        def delete_rows(chunk):
+            values = [value for _, value in chunk]
+            existing = self.repo.existing_ids(values, id_field)
+            missing = [value for value in values if value not in existing]
+            if missing:
+                raise NotFoundError(entity_name=self.model.__name__, entity_id=missing[0])
+            self.repo.bulk_delete(values, id_field, soft=soft)
+            return values
+
+        deleted = []
+        for chunk in _chunked(list(enumerate(ids)), chunk_size or self.bulk_chunk_size):
+            deleted.extend(self._run_chunk(chunk, delete_rows, failures))
+
+        if deleted:
+            self._after_write()
+        failures.sort(key=lambda f: f.index)
+        return BulkResult(items=[value for _, value in sorted(deleted)], failures=failures)
+
     # The rest of the methods are read-only and can delegate directly to the repository
     def get_by_id(
-        self, id_: Any, include_soft_deleted: bool = False
+        self,
+        id_: Any,
+        include_soft_deleted: bool = False,
+        loading: Loading = None,
+        columns: Optional[Sequence[str]] = None,
     ) -> Optional[TModel]:
-        """Fetches a single record by its ID."""
-        return self.repo.get_by_id(id_, include_soft_deleted)
+        """Fetches a single record by its ID (a row of `columns` when given)."""
+        return self.repo.get_by_id(id_, include_soft_deleted, loading=loading, columns=columns)
 
     def get_by_uuid(
-        self, uuid_: str, include_soft_deleted: bool = False
+        self,
+        uuid_: str,
+        include_soft_deleted: bool = False,
+        loading: Loading = None,
+        columns: Optional[Sequence[str]] = None,
     ) -> Optional[TModel]:
-        """Fetches a single record by its UUID."""
-        return self.repo.get_by_uuid(uuid_, include_soft_deleted)
+        """Fetches a single record by its UUID (a row of `columns` when given)."""
+        return self.repo.get_by_uuid(uuid_, include_soft_deleted, loading=loading, columns=columns)
+
+    def get_version(
+        self, entity_id: Any, id_field: str = "id", include_soft_deleted: bool = False
+    ) -> Optional[Tuple[Any, Optional[datetime.datetime], Optional[int]]]:
+        """Returns `(id, updated_at, version)` of a record, or None. See `BaseRepository.get_version`."""
+        return self.repo.get_version(id_field, entity_id, include_soft_deleted)
+
+    def get_collection_version(
+        self, filters: Optional[Dict[str, Any]] = None, include_soft_deleted: bool = False
+    ) -> Tuple[int, Optional[datetime.datetime], Optional[int]]:
+        """Returns `(count, max(updated_at), sum(version))` of the matching records."""
+        return self.repo.get_collection_version(filters, include_soft_deleted)
 
     def paginate(
         self,
@@ -134,8 +447,50 @@ class BaseService(Generic[TModel]):
         filters: Optional[Dict[str, Any]] = None,
         order_by: Optional[List[str]] = None,
         include_soft_deleted: bool = False,
+        count: str = "exact",
+        loading: Loading = None,
+        columns: Optional[Sequence[str]] = None,
     ) -> PaginationResult[TModel]:
-        """Fetches records with pagination."""
+        """Fetches records with pagination. See `BaseRepository.paginate` for `count`."""
         return self.repo.paginate(
-            page, per_page, filters, order_by, include_soft_deleted
+            page,
+            per_page,
+            filters,
+            order_by,
+            include_soft_deleted,
+            count=count,
+            loading=loading,
+            columns=columns,
         )
+
+    def paginate_by_cursor(
+        self,
+        cursor: Optional[str] = None,
+        per_page: int = 20,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[List[str]] = None,
+        include_soft_deleted: bool = False,
+        loading: Loading = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> CursorPaginationResult[TModel]:
+        """Fetches records with keyset (cursor) pagination."""
+        return self.repo.paginate_by_cursor(
+            cursor,
+            per_page,
+            filters,
+            order_by,
+            include_soft_deleted,
+            loading=loading,
+            columns=columns,
+        )
+
+    def stream(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[List[str]] = None,
+        include_soft_deleted: bool = False,
+        columns: Optional[Sequence[str]] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Any]:
+        """Yields every matching record in batches. See `BaseRepository.stream`."""
+        return self.repo.stream(filters, order_by, include_soft_deleted, columns, batch_size)
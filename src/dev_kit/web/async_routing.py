@@ -0,0 +1,288 @@
+# src/dev_kit/web/async_routing.py
+"""
+The asyncio counterpart of `register_crud_routes`, for an `AsyncBaseService`.
+
+The generated views are `async def` functions (Flask runs them with `asgiref`,
+see the `async` extra). Each request works in its own session: pass the
+service an `async_scoped_session` scoped to the current task, so concurrent
+requests never share one. The views serialize their results before the
+session is committed and removed, then return ready-made JSON responses.
+
+Flask gives every async request its own event loop, so connections can't be
+reused from a pool across requests: create the engine with `NullPool` (or
+serve the app through an ASGI adapter that keeps one loop). Open one
+connection before serving, too: SQLAlchemy guards an engine's first connect
+with a lock bound to the loop that takes it, and requests racing for it from
+other loops never wake up.
+"""
+
+from functools import wraps
+from typing import Any, Callable, Dict, List, Tuple, Type
+
+from apiflask import APIBlueprint
+from flask_jwt_extended import jwt_required
+from marshmallow import ValidationError
+from sqlalchemy import inspect
+
+from dev_kit.async_services import AsyncBaseService
+from dev_kit.database.loading import LoadingSpec, loading_for_schema
+from dev_kit.exceptions import NotFoundError
+from dev_kit.web.decorators import permission_required
+from dev_kit.web.routing import read_options, register_error_handlers
+from dev_kit.web.schemas import FieldsQuerySchema, MessageSchema
+from dev_kit.web.serializers import CompiledSerializer, json_response
+
+
+def _request_session(service: AsyncBaseService):
+    """
+    Decorator running an async view as one unit of work.
+
+    Commits the service's session when the view succeeds, rolls it back when
+    it raises, then removes it (scoped sessions) or closes it.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            session = service._db_session
+            try:
+                response = await view(*args, **kwargs)
+                await session.commit()
+                return response
+            except BaseException:
+                await session.rollback()
+                raise
+            finally:
+                remove = getattr(session, "remove", None)
+                await (remove() if remove is not None else session.close())
+
+        return wrapper
+
+    return decorator
+
+
+def register_async_crud_routes(
+    bp: APIBlueprint,
+    service: AsyncBaseService,
+    schemas: Dict[str, Type],
+    entity_name: str,
+    *,
+    id_field: str = "uuid",
+    routes_config: Dict[str, Dict[str, Any]] | None = None,
+):
+    """
+    Registers the standard CRUD routes for an entity as `async` views.
+
+    Takes the same arguments as `register_crud_routes` and produces the same
+    'list', 'get', 'create', 'update' and 'delete' routes, with the same
+    query parameters (filters, `sort_by`, `include_soft_deleted`, `count`,
+    `cursor`, `fields`), auth and permission defaults, and `loading` and
+    `compiled_serializer` settings. `fields` narrows the serialized output;
+    unlike the sync routes it doesn't narrow the SELECT. The opt-in batch,
+    export, conditional and response cache features are only available on
+    the sync routes.
+
+    Transactions differ from the sync routes. Those never commit: their
+    writes run in savepoints of the request's session and committing it is
+    left to the application (e.g. a hook committing `db.session`). Each view
+    here is a unit of work instead: it commits when it succeeds, rolls back
+    when it raises, and removes the session before returning, since Flask
+    closes the request's event loop, and the connection with it, right after.
+    A write is durable once its response is sent, and application hooks that
+    commit or roll back afterwards have nothing to act on.
+    """
+    register_error_handlers(bp)
+
+    main_schema = schemas["main"]
+    input_schema = schemas["input"]
+    update_schema = schemas["update"]
+    query_schema = schemas["query"]
+    pagination_out_schema = schemas["pagination_out"]
+    tags = [entity_name.capitalize()]
+
+    if id_field not in {"id", "uuid"}:
+        raise ValueError("id_field must be either 'id' or 'uuid'")
+
+    cfg: Dict[str, Dict[str, Any]] = routes_config or {}
+
+    def get_route_decorators(
+        route_name: str, default_require_auth: bool, default_permission: str | None
+    ) -> List[Callable]:
+        route_cfg = cfg.get(route_name, {})
+        decorators: List[Callable] = []
+        if route_cfg.get("auth_required", default_require_auth):
+            decorators.append(jwt_required())
+        permission = route_cfg.get("permission", default_permission)
+        if permission:
+            decorators.append(permission_required(permission))
+        # Innermost: the session lives exactly as long as the view
+        decorators.append(_request_session(service))
+        return decorators
+
+    def route_enabled(route_name: str) -> bool:
+        return cfg.get(route_name, {}).get("enabled", True)
+
+    def route_loading(route_name: str) -> LoadingSpec | None:
+        route_cfg = cfg.get(route_name, {})
+        if "loading" not in route_cfg:
+            return loading_for_schema(main_schema, service.model)
+        loading = route_cfg["loading"]
+        if loading is None or isinstance(loading, LoadingSpec):
+            return loading
+        return LoadingSpec(service.model, loading)
+
+    list_loading = route_loading("list")
+    get_loading = route_loading("get")
+
+    column_keys = {attr.key for attr in inspect(service.model).column_attrs}
+    selectable_fields = frozenset(
+        name
+        for name, field in main_schema().fields.items()
+        if not field.load_only and name in column_keys and field.attribute in (None, name)
+    )
+
+    def parse_fields(raw: str | None) -> Tuple[str, ...] | None:
+        if not raw:
+            return None
+        fields = tuple(dict.fromkeys(f.strip() for f in raw.split(",") if f.strip()))
+        unknown = [f for f in fields if f not in selectable_fields]
+        if unknown:
+            raise ValidationError({"fields": [f"Unknown field(s): {', '.join(unknown)}."]})
+        return fields or None
+
+    compiled = CompiledSerializer.for_schema(main_schema, service.model)
+
+    def item_dumper(route_name: str, fields: Tuple[str, ...] | None) -> Callable[[Any], Dict]:
+        if compiled is not None and cfg.get(route_name, {}).get("compiled_serializer", True):
+            return (compiled.only(fields) if fields else compiled).dump
+        return main_schema(only=fields).dump if fields else main_schema().dump
+
+    def page_dump(result, fields: Tuple[str, ...] | None) -> Dict:
+        if compiled is not None and cfg.get("list", {}).get("compiled_serializer", True):
+            return (compiled.only(fields) if fields else compiled).dump_page(result)
+        only = ("pagination", *(f"items.{f}" for f in fields)) if fields else None
+        return pagination_out_schema(only=only).dump(result)
+
+    def _apply_decorators(func, decorators: List[Callable]):
+        for dec in reversed(decorators):
+            func = dec(func)
+        return func
+
+    # --- Route Registration ---
+    async def list_items(query_data):
+        """Retrieve a paginated list of items."""
+        filters = query_data.copy()
+        page = filters.pop("page", 1)
+        per_page = filters.pop("per_page", 10)
+        sort_by_str = filters.pop("sort_by", None)
+        order_by = None
+        if sort_by_str:
+            order_by = [s.strip() for s in sort_by_str.split(",") if s.strip()]
+        include_soft_deleted = filters.pop("include_soft_deleted", False)
+        cursor = filters.pop("cursor", None)
+        count = filters.pop("count", "exact")
+        fields = parse_fields(filters.pop("fields", None))
+
+        if cursor is not None:
+            result = await service.paginate_by_cursor(
+                cursor=cursor or None,
+                per_page=per_page,
+                filters=filters,
+                order_by=order_by,
+                include_soft_deleted=include_soft_deleted,
+                **read_options(service.paginate_by_cursor, list_loading),
+            )
+        else:
+            result = await service.paginate(
+                page=page,
+                per_page=per_page,
+                filters=filters,
+                order_by=order_by,
+                include_soft_deleted=include_soft_deleted,
+                **read_options(service.paginate, list_loading, count=count),
+            )
+        return json_response(page_dump(result, fields))
+
+    async def get_item(query_data=None, **kwargs):
+        """Retrieve a single item by its ID or UUID."""
+        item_id = kwargs[id_field]
+        fields = parse_fields((query_data or {}).get("fields"))
+        method_to_call = getattr(service, f"get_by_{id_field}")
+        item = await method_to_call(item_id, **read_options(method_to_call, get_loading))
+        if item is None:
+            raise NotFoundError(entity_name, item_id)
+        return json_response(item_dumper("get", fields)(item))
+
+    async def create_item(json_data):
+        """Create a new item."""
+        item = await service.create(json_data)
+        return json_response(item_dumper("create", None)(item), status=201)
+
+    async def update_item(json_data, **kwargs):
+        """Update a single item."""
+        item = await service.update(kwargs[id_field], json_data, id_field=id_field)
+        return json_response(item_dumper("update", None)(item))
+
+    async def delete_item(**kwargs):
+        """Delete a single item."""
+        await service.delete(entity_id=kwargs[id_field], id_field=id_field)
+        return json_response({"message": f"{entity_name.capitalize()} deleted successfully."})
+
+    # `@bp.output` documents the responses; the views return them ready-made
+    routes = {
+        "list": (
+            list_items,
+            [
+                bp.get("/"),
+                bp.input(query_schema, location="query"),
+                bp.output(pagination_out_schema),
+                bp.doc(summary=f"List all {entity_name}s", tags=tags),
+            ],
+            None,
+        ),
+        "get": (
+            get_item,
+            [
+                bp.get(f"/<{id_field}>"),
+                bp.input(FieldsQuerySchema, location="query"),
+                bp.output(main_schema),
+                bp.doc(summary=f"Get a single {entity_name}", tags=tags),
+            ],
+            None,
+        ),
+        "create": (
+            create_item,
+            [
+                bp.post("/"),
+                bp.input(input_schema),
+                bp.output(main_schema, status_code=201),
+                bp.doc(summary=f"Create a new {entity_name}", tags=tags),
+            ],
+            f"create:{entity_name}",
+        ),
+        "update": (
+            update_item,
+            [
+                bp.patch(f"/<{id_field}>"),
+                bp.input(update_schema),
+                bp.output(main_schema),
+                bp.doc(summary=f"Update an existing {entity_name}", tags=tags),
+            ],
+            f"update:{entity_name}",
+        ),
+        "delete": (
+            delete_item,
+            [
+                bp.delete(f"/<{id_field}>"),
+                bp.output(MessageSchema, status_code=200),
+                bp.doc(summary=f"Delete an {entity_name}", tags=tags),
+            ],
+            f"delete:{entity_name}",
+        ),
+    }
+    for route_name, (view, decorators, default_permission) in routes.items():
+        if route_enabled(route_name):
+            decorators = decorators + get_route_decorators(
+                route_name, default_require_auth=True, default_permission=default_permission
+            )
+            _apply_decorators(view, decorators)
@@ -0,0 +1,71 @@
+# src/dev_kit/web/conditional.py
+"""
+Helpers for HTTP conditional requests (`ETag` / `Last-Modified`).
+
+When a request carries `If-None-Match` or `If-Modified-Since`, the generated
+CRUD routes run a cheap probe first (`updated_at` and, for models with a
+`version` column, the version of one item, or the count, latest `updated_at`
+and summed versions of a list) and answer `If-Modified-Since`, and
+`If-None-Match` when there is a version, with `304 Not Modified` before loading
+or serializing anything. Other requests skip the probe.
+
+`updated_at` alone can't make an ETag: its resolution is the database's (one
+second on SQLite), so two writes within that second would share one. Models
+without a `version` column get an ETag hashing the serialized body instead
+(`body_etag`), which saves the transfer but not the work.
+
+ETags are weak: they identify the data, not the exact bytes, so they survive
+content encoding. Naive `updated_at` values are taken to be UTC.
+"""
+
+import datetime
+import hashlib
+from typing import Any, Dict, Optional
+
+from flask import current_app, request
+from werkzeug.http import http_date
+
+
+def make_etag(*parts: Any) -> str:
+    """Hashes `parts` (their `repr`s) into an opaque ETag value."""
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+
+def body_etag(body: bytes) -> str:
+    """Hashes a serialized (uncompressed) response body into an opaque ETag value."""
+    return hashlib.sha1(body).hexdigest()
+
+
+def _as_utc(value: datetime.datetime) -> datetime.datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=datetime.timezone.utc)
+    return value.astimezone(datetime.timezone.utc)
+
+
+def is_not_modified(etag: Optional[str], last_modified: Optional[datetime.datetime]) -> bool:
+    """
+    Whether the current request's validators match the given version.
+
+    `If-None-Match` takes precedence; `If-Modified-Since` is only consulted
+    when it is absent (RFC 9110, section 13.2.2). An `etag` of None (not
+    known yet) never matches.
+    """
+    if request.if_none_match:
+        return etag is not None and request.if_none_match.contains_weak(etag)
+    since = request.if_modified_since
+    if since is None or last_modified is None:
+        return False
+    return _as_utc(last_modified).replace(microsecond=0) <= since
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime.datetime]) -> Dict[str, str]:
+    """The `ETag` (and, when known, `Last-Modified`) headers for a response."""
+    headers = {"ETag": f'W/"{etag}"'}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(_as_utc(last_modified))
+    return headers
+
+
+def not_modified_response(headers: Dict[str, str]):
+    """An empty `304 Not Modified` response carrying the validators."""
+    return current_app.response_class(status=304, headers=headers)
@@ -6,13 +6,20 @@ These decorators provide reusable functionality such as activity logging
 and permission checking for API endpoints.
 """
 
+import inspect
 from functools import wraps
-from flask import current_app, request
+from typing import Hashable, Tuple
+from flask import current_app, g, request
 from flask_jwt_extended import verify_jwt_in_request, get_jwt
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 
 from dev_kit.exceptions import PermissionDeniedError
+from dev_kit.web.permissions import (
+    PERMISSION_BITS_CLAIM,
+    permission_bit_registry,
+    permission_registry,
+)
 
 
 def log_activity(f):
@@ -39,33 +46,126 @@ def log_activity(f):
     return decorated_function
 
 
-def permission_required(permission: str):
+def _verified_claims() -> dict:
     """
-    Decorator factory to ensure a user has a specific permission in their JWT.
+    Returns the claims of the request's JWT, verifying it only if needed.
 
-    It checks for the presence of a valid JWT, then looks for the required
-    permission within the 'permissions' claim. It also allows users with the
-    'is_super_admin' claim to bypass the check.
+    When `jwt_required()` already ran for this request, flask-jwt-extended keeps
+    the decoded token on `g`, so it isn't decoded and checked a second time.
+    """
+    if not getattr(g, "_jwt_extended_jwt", None):
+        verify_jwt_in_request()
+    return get_jwt()
+
+
+def current_permission_mask() -> Tuple[int, bool]:
+    """
+    The caller's permissions as a bitmask, computed once per request.
+
+    Returns the mask and whether it is a compact token bitset (positions from
+    `permission_bit_registry`) rather than a mask over `permission_registry`.
+    Super admins get -1 (all bits set).
+
+    Raises:
+        PermissionDeniedError: If the token's compact permission claim is malformed.
+    """
+    claims = _verified_claims()
+    cached = getattr(g, "_dev_kit_permission_mask", None)
+    if cached is not None and cached[0] is claims:
+        return cached[1]
+    compact = PERMISSION_BITS_CLAIM in claims
+    if claims.get("is_super_admin", False):
+        mask = -1
+    elif compact:
+        try:
+            mask = permission_bit_registry.decode(claims[PERMISSION_BITS_CLAIM])
+        except (TypeError, ValueError):
+            raise PermissionDeniedError("Invalid permission claim.")
+    else:
+        mask = permission_registry.mask(frozenset(claims.get("permissions", ())))
+    g._dev_kit_permission_mask = (claims, (mask, compact))
+    return mask, compact
+
+
+def permission_scope() -> Hashable:
+    """
+    A key identifying the caller's permissions, stable across processes.
+
+    Two callers with the same scope are granted exactly the same permissions,
+    so it can partition caches of permission-dependent data. None when no JWT
+    was verified for the request.
+    """
+    claims = getattr(g, "_jwt_extended_jwt", None)
+    if not claims:
+        return None
+    if claims.get("is_super_admin", False):
+        return "*"
+    if PERMISSION_BITS_CLAIM in claims:
+        return (PERMISSION_BITS_CLAIM, claims[PERMISSION_BITS_CLAIM])
+    return tuple(sorted(claims.get("permissions", ())))
+
+
+def permission_required(*permissions: str, mode: str = "all"):
+    """
+    Decorator factory to ensure a user has specific permissions in their JWT.
+
+    It checks for the presence of a valid JWT (reusing the one already verified
+    for the request, if any), then looks for the required permissions within the
+    'permissions' claim, or in the compact bitset claim of tokens minted with
+    `JWT_COMPACT_PERMISSIONS`. It also allows users with the 'is_super_admin'
+    claim to bypass the check.
+
+    Required permissions are compiled into a bitmask once, and the caller's
+    permissions once per request, so each check is a constant-time operation.
 
     Args:
-        permission: The name of the permission string required to access the route.
+        *permissions: The permission names required to access the route.
+        mode: 'all' to require every permission, 'any' to require at least one.
 
     Raises:
-        PermissionDeniedError: If the user does not have the required permission.
+        PermissionDeniedError: If the user does not have the required permissions.
+        ValueError: If no permission is given or `mode` is unknown.
     """
+    if not permissions:
+        raise ValueError("permission_required needs at least one permission.")
+    if mode not in ("all", "any"):
+        raise ValueError("mode must be either 'all' or 'any'")
+    local_required = permission_registry.mask(permissions)
+    if mode == "all":
+        missing = "Required permission" + ("s" if len(permissions) > 1 else "")
+    else:
+        missing = "One of the permissions"
+    names = "', '".join(permissions)
+
+    def allowed() -> bool:
+        granted, compact = current_permission_mask()
+        if granted == -1:
+            return True
+        if compact:
+            # Bit positions are database ids, only known once the registry is loaded
+            required, complete = permission_bit_registry.mask(permissions)
+        else:
+            required, complete = local_required, True
+        if mode == "all":
+            return complete and granted & required == required
+        return granted & required != 0
 
     def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            # Keeps async views async, so callers awaiting them still can
+
+            @wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if not allowed():
+                    raise PermissionDeniedError(f"{missing} '{names}' is missing.")
+                return await fn(*args, **kwargs)
+
+            return async_wrapper
+
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            verify_jwt_in_request()
-            claims = get_jwt()
-            user_permissions = claims.get("permissions", [])
-            is_super_admin = claims.get("is_super_admin", False)
-
-            if not is_super_admin and permission not in user_permissions:
-                raise PermissionDeniedError(
-                    f"Required permission '{permission}' is missing."
-                )
+            if not allowed():
+                raise PermissionDeniedError(f"{missing} '{names}' is missing.")
             return fn(*args, **kwargs)
 
         return wrapper
@@ -0,0 +1,189 @@
+# src/dev_kit/web/instrumentation.py
+"""
+Opt-in per-request SQL instrumentation.
+
+`init_sql_instrumentation(app)` counts the statements each request runs and
+the time they spend in the database, through SQLAlchemy engine events. At
+the end of the request it:
+
+- warns when the same statement (its SQL text, parameters aside) ran
+  `SQL_N_PLUS_ONE_THRESHOLD` times or more, the usual sign of an N+1 query;
+- warns when the request ran more statements than its budget: the
+  `SQL_QUERY_BUDGETS` entry for its endpoint (e.g. `"users.list_items"`),
+  else `SQL_QUERY_BUDGET`;
+- sends a `Server-Timing` header with the `db`, `serialize` and `total`
+  durations (unless `SERVER_TIMING` is False).
+
+Nothing is registered unless `SQL_INSTRUMENTATION` is True, so a disabled
+app pays nothing. Serialization time is what `timed("serialize")` blocks
+measure plus the time between the return of a `view_timing`-wrapped view
+and the end of the request; the generated CRUD routes use both.
+"""
+
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Optional
+
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+N_PLUS_ONE_THRESHOLD = 5
+
+_STATS_KEY = "_dev_kit_sql_stats"
+_QUERY_STARTS = "dev_kit.query_starts"
+
+_install_lock = threading.Lock()
+_installed = False
+
+
+class RequestSQLStats:
+    """What one request did in the database, and how long its phases took."""
+
+    __slots__ = ("started", "statements", "db_time", "shapes", "phases", "view_ended")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.statements = 0
+        self.db_time = 0.0
+        self.shapes: Counter = Counter()
+        self.phases: Dict[str, float] = {}
+        self.view_ended: Optional[float] = None
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.statements += 1
+        self.db_time += elapsed
+        self.shapes[statement] += 1
+
+    def add_phase(self, name: str, elapsed: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+
+def current_stats() -> Optional[RequestSQLStats]:
+    """The current request's stats, or None outside an instrumented request."""
+    return g.get(_STATS_KEY) if has_app_context() else None
+
+
+@contextmanager
+def timed(phase: str):
+    """Adds the time spent in the block to `phase` of the current request."""
+    stats = current_stats()
+    if stats is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.add_phase(phase, time.perf_counter() - started)
+
+
+def view_timing(view):
+    """Decorator marking when a view returns; what follows counts as serialization."""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        rv = view(*args, **kwargs)
+        stats = current_stats()
+        if stats is not None:
+            stats.view_ended = time.perf_counter()
+        return rv
+
+    return wrapper
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_stats() is not None:
+        conn.info.setdefault(_QUERY_STARTS, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_stats()
+    starts = conn.info.get(_QUERY_STARTS)
+    if stats is not None and starts:
+        stats.record(statement, time.perf_counter() - starts.pop())
+
+
+def _handle_error(context):
+    starts = context.connection.info.get(_QUERY_STARTS) if context.connection is not None else None
+    if starts:
+        starts.pop()
+
+
+def _install_listeners() -> None:
+    global _installed
+    with _install_lock:
+        if not _installed:
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+            event.listen(Engine, "handle_error", _handle_error)
+            _installed = True
+
+
+def query_budget(endpoint: Optional[str]) -> Optional[int]:
+    """The statement budget of `endpoint`, or None when it has none."""
+    config = current_app.config
+    return config.get("SQL_QUERY_BUDGETS", {}).get(endpoint, config.get("SQL_QUERY_BUDGET"))
+
+
+def server_timing(stats: RequestSQLStats, now: float) -> str:
+    """Formats the `Server-Timing` header value for `stats`."""
+    serialize = stats.phases.get("serialize", 0.0)
+    if stats.view_ended is not None:
+        serialize += now - stats.view_ended
+    metrics = [
+        f'db;dur={stats.db_time * 1000:.2f};desc="{stats.statements} queries"',
+        f"serialize;dur={serialize * 1000:.2f}",
+    ]
+    metrics += [
+        f"{name};dur={elapsed * 1000:.2f}" for name, elapsed in stats.phases.items() if name != "serialize"
+    ]
+    metrics.append(f"total;dur={(now - stats.started) * 1000:.2f}")
+    return ", ".join(metrics)
+
+
+def _report(stats: RequestSQLStats) -> None:
+    endpoint = request.endpoint or request.path
+    logger = current_app.logger
+    threshold = current_app.config.get("SQL_N_PLUS_ONE_THRESHOLD", N_PLUS_ONE_THRESHOLD)
+    for statement, count in stats.shapes.items():
+        if count >= threshold:
+            logger.warning(
+                "Possible N+1 query in %s: the same statement ran %d times: %s",
+                endpoint,
+                count,
+                " ".join(statement.split()),
+            )
+    budget = query_budget(request.endpoint)
+    if budget is not None and stats.statements > budget:
+        logger.warning(
+            "Query budget exceeded in %s: %d statements (budget %d), %.1f ms in the database",
+            endpoint,
+            stats.statements,
+            budget,
+            stats.db_time * 1000,
+        )
+
+
+def init_sql_instrumentation(app) -> None:
+    """Instruments `app` when its `SQL_INSTRUMENTATION` config is True (see module docs)."""
+    if not app.config.get("SQL_INSTRUMENTATION", False):
+        return
+    _install_listeners()
+
+    @app.before_request
+    def _start_sql_stats():
+        g.setdefault(_STATS_KEY, RequestSQLStats())
+
+    @app.after_request
+    def _finish_sql_stats(response):
+        stats = g.pop(_STATS_KEY, None)
+        if stats is None:
+            return response
+        _report(stats)
+        if app.config.get("SERVER_TIMING", True):
+            response.headers["Server-Timing"] = server_timing(stats, time.perf_counter())
+        return response
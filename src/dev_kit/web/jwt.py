@@ -1,38 +1,543 @@
 from __future__ import annotations
 
-from typing import Optional
+import hashlib
+import heapq
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
 
-from flask import jsonify
+from flask import current_app, jsonify
 from flask_jwt_extended import JWTManager
+from sqlalchemy import Column, Integer, MetaData, String, Table, delete, insert, or_, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
 
 
-class SimpleTokenBlocklist:
+class TokenBlocklist:
+    """The interface of revoked-token stores used by `configure_jwt`.
+
+    Entries are keyed by the token's `jti` and carry the token's `exp` (epoch
+    seconds): once a token has expired it is rejected by signature checks anyway,
+    so backends are free to forget it. `is_revoked` runs on every authenticated
+    request and must be a constant-time lookup.
+    """
+
+    def add(self, jti: str, expires_at: Optional[float] = None) -> None:
+        """Revokes `jti` until `expires_at` (or for the backend's default lifetime)."""
+        raise NotImplementedError
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        raise NotImplementedError
+
+    def purge(self) -> int:
+        """Drops expired entries and returns how many were removed."""
+        return 0
+
+    def changes_since(self, cursor: Any = None) -> Tuple[Iterable[str], Any]:
+        """Returns the jtis revoked since `cursor` and the cursor to resume from.
+
+        With `cursor=None` every live entry is returned. The result may contain
+        duplicates or entries from slightly before `cursor`, but never misses one.
+        Used by `BloomFilteredBlocklist` to keep its filter in sync.
+        """
+        raise NotImplementedError
+
+
+class SimpleTokenBlocklist(TokenBlocklist):
     """A simple in-memory token blocklist for demo/dev.
 
-    For production, replace with a persistent store (e.g., Redis) and TTLs.
+    It never forgets an entry; prefer `MemoryTokenBlocklist`, which is bounded,
+    or a shared backend for multi-process deployments.
     """
 
     def __init__(self):
         self._revoked_jtis: set[str] = set()
 
-    def add(self, jti: str) -> None:
+    def add(self, jti: str, expires_at: Optional[float] = None) -> None:
         if jti:
             self._revoked_jtis.add(jti)
 
     def is_revoked(self, jti: Optional[str]) -> bool:
         return bool(jti) and jti in self._revoked_jtis
 
+    def changes_since(self, cursor: Any = None) -> Tuple[Iterable[str], Any]:
+        return list(self._revoked_jtis), None
+
+
+class MemoryTokenBlocklist(TokenBlocklist):
+    """A bounded in-process blocklist that forgets entries when their token expires.
+
+    Args:
+        max_entries: Upper bound on stored entries. When full, expired entries are
+            purged first; if that is not enough, the entries closest to expiry are
+            dropped (those tokens would become usable again for the rest of their
+            lifetime, so size this above the expected number of live revocations).
+        default_ttl: Lifetime in seconds of entries added without `expires_at`.
+    """
+
+    def __init__(self, max_entries: int = 100_000, default_ttl: float = 24 * 3600):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._expiry: Dict[str, float] = {}
+        # (expires_at, jti) min-heap; may hold stale pairs for re-added jtis
+        self._heap: list[tuple[float, str]] = []
+        # Recent additions, for `changes_since`; `_added_total` is the cursor
+        self._added: deque[str] = deque(maxlen=max_entries)
+        self._added_total = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    def add(self, jti: str, expires_at: Optional[float] = None) -> None:
+        if not jti:
+            return
+        expires_at = expires_at if expires_at is not None else time.time() + self.default_ttl
+        with self._lock:
+            self._expiry[jti] = expires_at
+            heapq.heappush(self._heap, (expires_at, jti))
+            self._added.append(jti)
+            self._added_total += 1
+            if len(self._expiry) > self.max_entries:
+                self._purge_locked(time.time())
+            while len(self._expiry) > self.max_entries and self._heap:
+                self._pop_earliest()
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        if not jti:
+            return False
+        expires_at = self._expiry.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def _pop_earliest(self) -> bool:
+        expires_at, jti = heapq.heappop(self._heap)
+        if self._expiry.get(jti) == expires_at:
+            del self._expiry[jti]
+            return True
+        return False
+
+    def _purge_locked(self, now: float) -> int:
+        removed = 0
+        while self._heap and self._heap[0][0] <= now:
+            removed += self._pop_earliest()
+        return removed
+
+    def purge(self) -> int:
+        with self._lock:
+            return self._purge_locked(time.time())
+
+    def changes_since(self, cursor: Any = None) -> Tuple[Iterable[str], Any]:
+        with self._lock:
+            missed = self._added_total - (cursor or 0)
+            if cursor is None or missed > len(self._added):
+                return list(self._expiry), self._added_total
+            return list(self._added)[len(self._added) - missed:], self._added_total
+
+
+class SQLTokenBlocklist(TokenBlocklist):
+    """A blocklist stored in a SQL table, shared by every process using the database.
+
+    The table has the `jti` as its primary key (so lookups are an index seek), an
+    indexed `expires_at` used to purge expired rows, which happens at most once
+    per `purge_interval` seconds as a side effect of `add`, and an indexed
+    `revoked_at` that incremental syncs scan from their cursor.
+
+    Args:
+        engine: The engine to use, or a callable returning it (e.g.
+            `lambda: db.engine` with Flask-SQLAlchemy).
+        table_name: Name of the blocklist table.
+        default_ttl: Lifetime in seconds of entries added without `expires_at`.
+        purge_interval: Minimum seconds between automatic purges.
+        create_table: Create the table on first use if it doesn't exist.
+    """
+
+    def __init__(
+        self,
+        engine: Engine | Callable[[], Engine],
+        table_name: str = "token_blocklist",
+        default_ttl: float = 24 * 3600,
+        purge_interval: float = 300.0,
+        create_table: bool = True,
+    ):
+        self._engine = engine
+        self.default_ttl = default_ttl
+        self.purge_interval = purge_interval
+        self.table = Table(
+            table_name,
+            MetaData(),
+            Column("jti", String(64), primary_key=True),
+            Column("expires_at", Integer, nullable=True, index=True),
+            Column("revoked_at", Integer, nullable=False, index=True),
+        )
+        self._create_table = create_table
+        self._table_ready = False
+        self._last_purge = time.monotonic()
+
+    @property
+    def engine(self) -> Engine:
+        return self._engine() if callable(self._engine) else self._engine
+
+    def _ready_engine(self) -> Engine:
+        engine = self.engine
+        if self._create_table and not self._table_ready:
+            self.table.create(engine, checkfirst=True)
+            self._table_ready = True
+        return engine
+
+    def add(self, jti: str, expires_at: Optional[float] = None) -> None:
+        if not jti:
+            return
+        now = time.time()
+        expires_at = expires_at if expires_at is not None else now + self.default_ttl
+        try:
+            with self._ready_engine().begin() as conn:
+                conn.execute(
+                    insert(self.table).values(
+                        jti=jti, expires_at=int(expires_at), revoked_at=int(now)
+                    )
+                )
+        except IntegrityError:
+            pass  # already revoked
+        if time.monotonic() - self._last_purge >= self.purge_interval:
+            self.purge()
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        if not jti:
+            return False
+        stmt = select(self.table.c.jti).where(
+            self.table.c.jti == jti,
+            or_(self.table.c.expires_at.is_(None), self.table.c.expires_at > int(time.time())),
+        )
+        with self._ready_engine().connect() as conn:
+            return conn.execute(stmt).first() is not None
+
+    # Rows are stamped with the writer's clock; re-reading a few seconds back
+    # tolerates skew between processes (duplicates are harmless).
+    clock_skew: int = 5
+
+    def changes_since(self, cursor: Any = None) -> Tuple[Iterable[str], Any]:
+        now = int(time.time())
+        stmt = select(self.table.c.jti).where(
+            or_(self.table.c.expires_at.is_(None), self.table.c.expires_at > now)
+        )
+        if cursor is not None:
+            stmt = stmt.where(self.table.c.revoked_at >= cursor - self.clock_skew)
+        with self._ready_engine().connect() as conn:
+            return conn.execute(stmt).scalars().all(), now
+
+    def purge(self) -> int:
+        self._last_purge = time.monotonic()
+        with self._ready_engine().begin() as conn:
+            result = conn.execute(
+                delete(self.table).where(self.table.c.expires_at <= int(time.time()))
+            )
+        return result.rowcount
+
+
+class InMemoryKeyValueStore:
+    """A tiny stand-in for a Redis client, for tests and single-process development.
+
+    Implements the subset of the redis-py API used by `SharedStoreTokenBlocklist`.
+    """
+
+    def __init__(self):
+        self._data: Dict[str, tuple[Any, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def set(self, name: str, value: Any, ex: Optional[int] = None) -> bool:
+        expires_at = time.time() + ex if ex is not None else None
+        with self._lock:
+            self._data[name] = (value, expires_at)
+        return True
+
+    def get(self, name: str) -> Any:
+        entry = self._data.get(name)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            with self._lock:
+                self._data.pop(name, None)
+            return None
+        return value
+
+    def exists(self, *names: str) -> int:
+        return sum(self.get(name) is not None for name in names)
+
+    def delete(self, *names: str) -> int:
+        with self._lock:
+            return sum(self._data.pop(name, None) is not None for name in names)
+
+    def zadd(self, name: str, mapping: Dict[str, float]) -> int:
+        with self._lock:
+            members = self._data.setdefault(name, ({}, None))[0]
+            added = sum(member not in members for member in mapping)
+            members.update(mapping)
+        return added
+
+    def zrangebyscore(self, name: str, min: float, max: float) -> list:
+        members = (self._data.get(name) or ({}, None))[0]
+        with self._lock:
+            matching = [(score, m) for m, score in members.items() if min <= score <= max]
+        return [member for _, member in sorted(matching)]
+
+    def zremrangebyscore(self, name: str, min: float, max: float) -> int:
+        with self._lock:
+            members = (self._data.get(name) or ({}, None))[0]
+            doomed = [m for m, score in members.items() if min <= score <= max]
+            for member in doomed:
+                del members[member]
+        return len(doomed)
+
+
+class SharedStoreTokenBlocklist(TokenBlocklist):
+    """A blocklist kept in a shared key-value store such as Redis.
+
+    Each revoked `jti` is stored as its own key with the store's native expiry
+    set to the token's remaining lifetime, so the store forgets it on its own.
+    A sorted set scored by revocation time indexes the entries for
+    `changes_since`; it is trimmed after `index_retention` seconds, which must
+    be at least the longest token lifetime (refresh tokens included).
+
+    Args:
+        store: A redis-py compatible client (`set(name, value, ex=...)`,
+            `exists(name)` and the `zadd`/`zrangebyscore`/`zremrangebyscore`
+            sorted-set commands), or `InMemoryKeyValueStore` for tests.
+        prefix: Key prefix for blocklist entries.
+        default_ttl: Lifetime in seconds of entries added without `expires_at`.
+        index_retention: Seconds a revocation stays in the sync index.
+    """
+
+    # See SQLTokenBlocklist.clock_skew
+    clock_skew: int = 5
+
+    def __init__(
+        self,
+        store: Any,
+        prefix: str = "jwt:blocklist:",
+        default_ttl: int = 24 * 3600,
+        index_retention: int = 31 * 24 * 3600,
+    ):
+        self.store = store
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+        self.index_retention = index_retention
+
+    def add(self, jti: str, expires_at: Optional[float] = None) -> None:
+        if not jti:
+            return
+        now = time.time()
+        ttl = int(expires_at - now) + 1 if expires_at is not None else self.default_ttl
+        if ttl > 0:
+            self.store.set(self.prefix + jti, 1, ex=ttl)
+            self.store.zadd(self._index_key, {jti: now})
+            self.store.zremrangebyscore(self._index_key, 0, now - self.index_retention)
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        return bool(jti) and bool(self.store.exists(self.prefix + jti))
+
+    @property
+    def _index_key(self) -> str:
+        return self.prefix + "$index"
+
+    def changes_since(self, cursor: Any = None) -> Tuple[Iterable[str], Any]:
+        now = time.time()
+        start = 0 if cursor is None else cursor - self.clock_skew
+        members = self.store.zrangebyscore(self._index_key, start, float("inf"))
+        return [m.decode() if isinstance(m, bytes) else m for m in members], now
+
+
+class BloomFilter:
+    """A fixed-size Bloom filter over strings.
+
+    Sized for `capacity` items at a false-positive rate of `error_rate`;
+    membership tests never give false negatives.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        # Double hashing (Kirsch-Mitzenmacher) from one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def estimated_error_rate(self) -> float:
+        """The expected false-positive rate at the current fill."""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+
+class BloomFilteredBlocklist(TokenBlocklist):
+    """Answers most `is_revoked` calls from a local Bloom filter instead of the store.
+
+    Almost no presented token is revoked, so the filter's "definitely not"
+    answers skip the authoritative store entirely; only filter positives are
+    confirmed against it. The filter is kept in sync through the store's
+    `changes_since`, at most once per `sync_interval` seconds, and rebuilt from
+    scratch every `rebuild_interval` seconds (or when it outgrows `capacity`)
+    to shed expired entries.
+
+    Revocations made through this instance are visible immediately; those made
+    by other processes become visible within `sync_interval` seconds.
+
+    Args:
+        store: The authoritative blocklist backend.
+        capacity: Expected number of live revocations the filter is sized for.
+        error_rate: Target false-positive rate at `capacity`.
+        sync_interval: Seconds between incremental syncs with the store.
+        rebuild_interval: Seconds between full rebuilds.
+    """
+
+    def __init__(
+        self,
+        store: TokenBlocklist,
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+        sync_interval: float = 1.0,
+        rebuild_interval: float = 3600.0,
+    ):
+        self.store = store
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self._filter: Optional[BloomFilter] = None
+        self._cursor: Any = None
+        self._next_sync = 0.0
+        self._next_rebuild = 0.0
+        self._lock = threading.Lock()
+        self._lookups = 0
+        self._filter_negatives = 0
+        self._false_positives = 0
+
+    def _sync(self) -> BloomFilter:
+        now = time.monotonic()
+        bloom = self._filter
+        if bloom is not None and now < self._next_sync:
+            return bloom
+        with self._lock:
+            if self._filter is not None and now < self._next_sync:
+                return self._filter
+            if self._filter is None or now >= self._next_rebuild:
+                self._rebuild(now)
+            else:
+                jtis, self._cursor = self.store.changes_since(self._cursor)
+                for jti in jtis:
+                    self._filter.add(jti)
+                if self._filter.count > self._filter.capacity:
+                    self._rebuild(now)
+            self._next_sync = now + self.sync_interval
+            return self._filter
+
+    def _rebuild(self, now: float) -> None:
+        jtis, cursor = self.store.changes_since(None)
+        jtis = list(jtis)
+        bloom = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate)
+        for jti in jtis:
+            bloom.add(jti)
+        self._filter, self._cursor = bloom, cursor
+        self._next_rebuild = now + self.rebuild_interval
+
+    def add(self, jti: str, expires_at: Optional[float] = None) -> None:
+        self.store.add(jti, expires_at)
+        if jti:
+            with self._lock:
+                if self._filter is not None:
+                    self._filter.add(jti)
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        if not jti:
+            return False
+        bloom = self._sync()
+        self._lookups += 1
+        if jti not in bloom:
+            self._filter_negatives += 1
+            return False
+        revoked = self.store.is_revoked(jti)
+        if not revoked:
+            self._false_positives += 1
+        return revoked
+
+    def purge(self) -> int:
+        return self.store.purge()
+
+    def changes_since(self, cursor: Any = None) -> Tuple[Iterable[str], Any]:
+        return self.store.changes_since(cursor)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Filter effectiveness counters (approximate under concurrency)."""
+        lookups, negatives = self._lookups, self._filter_negatives
+        store_lookups = lookups - negatives
+        bloom = self._filter
+        return {
+            "lookups": lookups,
+            "filter_negatives": negatives,
+            "store_lookups": store_lookups,
+            "false_positives": self._false_positives,
+            "filter_hit_rate": negatives / lookups if lookups else 0.0,
+            "observed_false_positive_rate": (
+                self._false_positives / (self._false_positives + negatives)
+                if self._false_positives + negatives
+                else 0.0
+            ),
+            "filter_entries": bloom.count if bloom else 0,
+            "estimated_false_positive_rate": bloom.estimated_error_rate() if bloom else 0.0,
+        }
+
 
 # A default singleton blocklist usable by apps that don't inject one
-default_blocklist = SimpleTokenBlocklist()
+default_blocklist = MemoryTokenBlocklist()
+
+
+def get_blocklist() -> TokenBlocklist:
+    """Returns the blocklist `configure_jwt` installed on the current app."""
+    manager = current_app.extensions.get("flask-jwt-extended")
+    blocklist = getattr(manager, "blocklist", None)
+    return blocklist if blocklist is not None else default_blocklist
+
+
+def revoke_token(jwt_payload: Dict[str, Any]) -> None:
+    """Adds a decoded token (e.g. from `get_jwt()`) to the current app's blocklist."""
+    get_blocklist().add(jwt_payload.get("jti"), jwt_payload.get("exp"))
 
 
-def configure_jwt(jwt: JWTManager, blocklist: SimpleTokenBlocklist | None = None) -> None:
+def configure_jwt(
+    jwt: JWTManager,
+    blocklist: TokenBlocklist | None = None,
+    bloom_filter: bool = False,
+    bloom_error_rate: float = 0.001,
+) -> None:
     """Register standard JWT callbacks including blocklist and error handlers.
 
     Call this after creating JWTManager(app). Ensure app config for cookies/CSRF is set separately.
+    Any `TokenBlocklist` backend can be given; it is kept on the manager so
+    `get_blocklist()` and `revoke_token()` find it. With `bloom_filter=True` it
+    is wrapped in a `BloomFilteredBlocklist` targeting `bloom_error_rate`, which
+    pays off for SQL and shared-store backends.
     """
-    blocklist = blocklist or default_blocklist
+    # Not `or`: an empty blocklist with `__len__` is falsy
+    blocklist = blocklist if blocklist is not None else default_blocklist
+    if bloom_filter and not isinstance(blocklist, BloomFilteredBlocklist):
+        blocklist = BloomFilteredBlocklist(blocklist, error_rate=bloom_error_rate)
+    jwt.blocklist = blocklist
 
     @jwt.token_in_blocklist_loader
     def check_if_token_revoked(_jwt_header, jwt_payload):  # type: ignore[override]
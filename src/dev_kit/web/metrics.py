@@ -0,0 +1,477 @@
+# src/dev_kit/web/metrics.py
+"""
+Request metrics for every endpoint of an app, in the Prometheus text format.
+
+`init_metrics(app, db)` records, by method and endpoint (the Flask endpoint
+name, such as `users.list_items` or `auth.login`):
+
+- `dev_kit_http_request_duration_seconds`: a latency histogram;
+- `dev_kit_http_request_size_bytes` / `dev_kit_http_response_size_bytes`:
+  body size histograms (streamed responses have no size);
+- `dev_kit_http_requests_total`: a counter, also by status code;
+- `dev_kit_http_requests_in_flight`: a gauge.
+
+It serves them at `METRICS_PATH` (`/metrics`; None to mount the view
+yourself) along with the connection pools of `db`'s engines
+(`dev_kit_db_pool_connections`) and the counters of the caches passed to
+`AppMetrics.track_cache` (`dev_kit_cache_operations_total`).
+
+Recording takes no lock: each thread updates its own shard of a metric, and
+shards are merged when the metrics are collected (a collection may miss an
+update in progress, never a completed one). Shards of threads that have
+exited are folded into one.
+
+Under a multi-process server (gunicorn workers), set
+`METRICS_MULTIPROC_DIR` to a directory shared by the workers and emptied
+on deploys. Each worker writes its metrics there at most every
+`METRICS_FLUSH_INTERVAL` seconds (1 by default) and when it answers a
+scrape, then serves the sum of every worker's file. Counters and histograms
+of workers that have exited are kept; their gauges are dropped.
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from flask import g, request
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+Labels = Tuple[str, ...]
+
+
+class MetricFamily(NamedTuple):
+    """A collected metric: its samples by label values."""
+
+    name: str
+    kind: str
+    documentation: str
+    labelnames: Tuple[str, ...]
+    samples: Dict[Labels, Any]
+    buckets: Tuple[float, ...] = ()
+
+
+class _Metric:
+    """Base of the sharded metrics: one dict of samples per thread."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, Dict[Labels, Any]]] = []
+        self._retired: Dict[Labels, Any] = {}
+        self._lock = threading.Lock()
+
+    def _shard(self) -> Dict[Labels, Any]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+            return shard
+
+    @staticmethod
+    def _merge(into: Dict[Labels, Any], shard: Dict[Labels, Any]) -> None:
+        for labels, value in list(shard.items()):
+            into[labels] = into.get(labels, 0) + value
+
+    def _copy(self, samples: Dict[Labels, Any]) -> Dict[Labels, Any]:
+        return dict(samples)
+
+    def collect(self) -> MetricFamily:
+        """Merges the shards of every thread."""
+        with self._lock:
+            alive = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    alive.append((thread, shard))
+                else:
+                    self._merge(self._retired, shard)
+            self._shards = alive
+            samples = self._copy(self._retired)
+            for _, shard in alive:
+                self._merge(samples, shard)
+        return self._family(samples)
+
+    def _family(self, samples: Dict[Labels, Any]) -> MetricFamily:
+        return MetricFamily(self.name, self.kind, self.documentation, self.labelnames, samples)
+
+
+class Counter(_Metric):
+    """A monotonically increasing value."""
+
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+
+class Gauge(Counter):
+    """A value that goes up and down, such as the number of requests in flight."""
+
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    """Counts observations in cumulative buckets, plus their sum."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        shard = self._shard()
+        counts = shard.get(labels)
+        if counts is None:
+            # One slot per bucket, one for +Inf, then the sum
+            counts = shard[labels] = [0] * (len(self.buckets) + 2)
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    @staticmethod
+    def _merge(into: Dict[Labels, Any], shard: Dict[Labels, Any]) -> None:
+        for labels, counts in list(shard.items()):
+            merged = into.get(labels)
+            if merged is None:
+                into[labels] = list(counts)
+            else:
+                for i, count in enumerate(counts):
+                    merged[i] += count
+
+    def _copy(self, samples: Dict[Labels, Any]) -> Dict[Labels, Any]:
+        return {labels: list(counts) for labels, counts in samples.items()}
+
+    def _family(self, samples: Dict[Labels, Any]) -> MetricFamily:
+        return MetricFamily(
+            self.name, self.kind, self.documentation, self.labelnames, samples, self.buckets
+        )
+
+
+class MetricsRegistry:
+    """The metrics of an app, plus collectors producing more at collection time."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        """Adds a callable returning `MetricFamily`s, called on every collection."""
+        self._collectors.append(collector)
+
+    def collect(self) -> List[MetricFamily]:
+        families = [metric.collect() for metric in self._metrics]
+        for collector in self._collectors:
+            families.extend(collector())
+        return families
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def render(families: Iterable[MetricFamily]) -> str:
+    """Formats `families` in the Prometheus text exposition format (0.0.4)."""
+    lines = []
+    for family in families:
+        lines.append(f"# HELP {family.name} {_escape(family.documentation)}")
+        lines.append(f"# TYPE {family.name} {family.kind}")
+        for labels, value in sorted(family.samples.items()):
+            if family.kind != "histogram":
+                lines.append(f"{family.name}{_labels(family.labelnames, labels)} {_number(value)}")
+                continue
+            names = (*family.labelnames, "le")
+            cumulative = 0
+            for bound, count in zip((*family.buckets, float("inf")), value):
+                cumulative += count
+                bucket_labels = _labels(names, (*labels, _number(bound)))
+                lines.append(f"{family.name}_bucket{bucket_labels} {cumulative}")
+            label_text = _labels(family.labelnames, labels)
+            lines.append(f"{family.name}_sum{label_text} {_number(value[-1])}")
+            lines.append(f"{family.name}_count{label_text} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MultiProcessStore:
+    """
+    Shares metrics between processes through one JSON file per process in `directory`.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, families: Iterable[MetricFamily]) -> None:
+        """Replaces this process's file with `families`."""
+        pid = os.getpid()
+        payload = {
+            "pid": pid,
+            "families": [
+                {**family._asdict(), "samples": [[list(k), v] for k, v in family.samples.items()]}
+                for family in families
+            ],
+        }
+        path = os.path.join(self.directory, f"metrics-{pid}.json")
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp, path)
+
+    def read_all(self) -> List[MetricFamily]:
+        """The sum of every process's metrics; gauges only of live processes."""
+        merged: Dict[str, MetricFamily] = {}
+        for filename in sorted(os.listdir(self.directory)):
+            if not (filename.startswith("metrics-") and filename.endswith(".json")):
+                continue
+            try:
+                with open(os.path.join(self.directory, filename), encoding="utf-8") as f:
+                    payload = json.load(f)
+            except (OSError, ValueError):
+                continue
+            alive = _pid_alive(payload["pid"])
+            for data in payload["families"]:
+                if data["kind"] == "gauge" and not alive:
+                    continue
+                family = merged.get(data["name"])
+                if family is None:
+                    family = merged[data["name"]] = MetricFamily(
+                        data["name"],
+                        data["kind"],
+                        data["documentation"],
+                        tuple(data["labelnames"]),
+                        {},
+                        tuple(data["buckets"]),
+                    )
+                samples = {tuple(labels): value for labels, value in data["samples"]}
+                if family.kind == "histogram":
+                    Histogram._merge(family.samples, samples)
+                else:
+                    Counter._merge(family.samples, samples)
+        return list(merged.values())
+
+
+def pool_collector(db) -> Callable[[], List[MetricFamily]]:
+    """Collects the connection pool state of every engine of a Flask-SQLAlchemy `db`."""
+
+    def collect() -> List[MetricFamily]:
+        samples: Dict[Labels, Any] = {}
+        for key, engine in db.engines.items():
+            pool = engine.pool
+            for state in ("size", "checkedin", "checkedout", "overflow"):
+                reading = getattr(pool, state, None)
+                if reading is not None:
+                    samples[(key or "default", state)] = reading()
+        return [
+            MetricFamily(
+                "dev_kit_db_pool_connections",
+                "gauge",
+                "Connections of the database pools, by bind and state.",
+                ("bind", "state"),
+                samples,
+            )
+        ]
+
+    return collect
+
+
+class AppMetrics:
+    """The request metrics of an app; see `init_metrics`."""
+
+    def __init__(
+        self,
+        registry: Optional[MetricsRegistry] = None,
+        latency_buckets: Sequence[float] = LATENCY_BUCKETS,
+        store: Optional[MultiProcessStore] = None,
+        flush_interval: float = 1.0,
+    ):
+        self.registry = registry or MetricsRegistry()
+        self.store = store
+        self.flush_interval = flush_interval
+        self._last_flush = 0.0
+        self._flush_lock = threading.Lock()
+        self._caches: Dict[str, Any] = {}
+
+        route = ("method", "endpoint")
+        self.latency = self.registry.histogram(
+            "dev_kit_http_request_duration_seconds", "Request latency.", route, latency_buckets
+        )
+        self.request_size = self.registry.histogram(
+            "dev_kit_http_request_size_bytes", "Request body size.", route, SIZE_BUCKETS
+        )
+        self.response_size = self.registry.histogram(
+            "dev_kit_http_response_size_bytes", "Response body size.", route, SIZE_BUCKETS
+        )
+        self.requests = self.registry.counter(
+            "dev_kit_http_requests_total", "Requests answered.", (*route, "status")
+        )
+        self.in_flight = self.registry.gauge(
+            "dev_kit_http_requests_in_flight", "Requests being processed.", route
+        )
+        self.registry.register_collector(self._collect_caches)
+
+    def track_cache(self, name: str, cache: Any) -> None:
+        """Exposes the hit/miss/eviction counters of a cache (anything with `stats`)."""
+        self._caches[name] = cache
+
+    def _collect_caches(self) -> List[MetricFamily]:
+        samples: Dict[Labels, Any] = {}
+        for name, cache in self._caches.items():
+            for result, value in cache.stats.as_dict().items():
+                samples[(name, result)] = value
+        return [
+            MetricFamily(
+                "dev_kit_cache_operations_total",
+                "counter",
+                "Cache lookups and evictions, by cache and result.",
+                ("cache", "result"),
+                samples,
+            )
+        ]
+
+    def before_request(self) -> None:
+        labels = (request.method, request.endpoint or "unmatched")
+        g._dev_kit_metrics = (time.perf_counter(), labels)
+        self.in_flight.inc(*labels)
+
+    def after_request(self, response):
+        started = g.get("_dev_kit_metrics")
+        if started is None:
+            return response
+        start, labels = started
+        self.latency.observe(time.perf_counter() - start, *labels)
+        self.requests.inc(*labels, str(response.status_code))
+        self.request_size.observe(request.content_length or 0, *labels)
+        if response.content_length is not None:
+            self.response_size.observe(response.content_length, *labels)
+        if self.store is not None and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+        return response
+
+    def teardown_request(self, exc=None) -> None:
+        started = g.pop("_dev_kit_metrics", None)
+        if started is not None:
+            self.in_flight.dec(*started[1])
+
+    def flush(self) -> None:
+        """Writes this process's metrics to the multi-process store."""
+        if self._flush_lock.acquire(blocking=False):
+            try:
+                self._last_flush = time.monotonic()
+                self.store.write(self.registry.collect())
+            finally:
+                self._flush_lock.release()
+
+    def exposition(self) -> str:
+        """The metrics in the Prometheus text format, of every process in multi-process mode."""
+        if self.store is None:
+            return render(self.registry.collect())
+        self.store.write(self.registry.collect())
+        return render(self.store.read_all())
+
+
+def init_metrics(app, db=None, metrics: Optional[AppMetrics] = None) -> AppMetrics:
+    """
+    Records request metrics for `app` and serves them (see module docs).
+
+    Args:
+        app: The Flask app.
+        db (optional): A Flask-SQLAlchemy `db` whose connection pools are reported.
+        metrics (optional): A preconfigured `AppMetrics`; by default one is built
+                            from the `METRICS_LATENCY_BUCKETS`,
+                            `METRICS_MULTIPROC_DIR` (or the
+                            `PROMETHEUS_MULTIPROC_DIR` environment variable)
+                            and `METRICS_FLUSH_INTERVAL` config.
+
+    Returns:
+        The `AppMetrics`, also kept in `app.extensions["dev_kit.metrics"]`.
+    """
+    if metrics is None:
+        directory = app.config.get("METRICS_MULTIPROC_DIR") or os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+        metrics = AppMetrics(
+            latency_buckets=app.config.get("METRICS_LATENCY_BUCKETS", LATENCY_BUCKETS),
+            store=MultiProcessStore(directory) if directory else None,
+            flush_interval=app.config.get("METRICS_FLUSH_INTERVAL", 1.0),
+        )
+    if db is not None:
+        metrics.registry.register_collector(pool_collector(db))
+
+    app.before_request(metrics.before_request)
+    app.after_request(metrics.after_request)
+    app.teardown_request(metrics.teardown_request)
+
+    path = app.config.get("METRICS_PATH", "/metrics")
+    if path:
+
+        def metrics_view():
+            return app.response_class(metrics.exposition(), content_type=CONTENT_TYPE)
+
+        if hasattr(app, "doc"):
+            metrics_view = app.doc(hide=True)(metrics_view)
+        app.add_url_rule(path, "dev_kit_metrics", metrics_view, methods=["GET"])
+
+    app.extensions["dev_kit.metrics"] = metrics
+    return metrics
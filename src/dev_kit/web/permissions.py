@@ -0,0 +1,225 @@
+# src/dev_kit/web/permissions.py
+"""
+Bitmask representation of permission sets for constant-time authorization.
+
+Each permission name gets a bit in a process-local `PermissionRegistry` the
+first time it is seen. `permission_required` compiles its required permissions
+into a mask once, at decoration time, and turns the caller's permissions into
+a mask once per request; checking "all of" or "any of" is then a single
+integer AND.
+
+Access tokens can also carry their permissions in compact form: with
+`JWT_COMPACT_PERMISSIONS` enabled, `login_user` replaces the list of names with
+a versioned bitset (`PERMISSION_BITS_CLAIM`) whose bit positions are the
+permissions' database ids, resolved through the `PermissionBitRegistry` built
+from the `permissions` table. Adding permissions only appends bits, so tokens
+minted earlier keep their meaning; a token's version is the highest id the
+registry knew about when it was minted.
+
+Deleting a permission is different: a database may hand its id to the next
+permission created (SQLite does without `AUTOINCREMENT`, older MySQL versions
+after a restart), and the bit of the deleted permission would then grant the
+new one. Tokens are therefore also stamped with the registry's epoch for their
+version, a digest of the permissions that existed up to it; deleting (or
+renaming) any of them changes the epoch, and tokens carrying the old one are
+rejected.
+"""
+
+import base64
+import hashlib
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class PermissionRegistry:
+    """Assigns a stable bit position to every permission name in this process."""
+
+    def __init__(self):
+        self._bits: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._bits)
+
+    def bit(self, name: str) -> int:
+        """Returns the bit position of `name`, registering it if needed."""
+        position = self._bits.get(name)
+        if position is None:
+            with self._lock:
+                position = self._bits.setdefault(name, len(self._bits))
+        return position
+
+    def mask(self, names: Iterable[str]) -> int:
+        """Returns the mask with the bits of all `names` set."""
+        mask = 0
+        for name in names:
+            mask |= 1 << self.bit(name)
+        return mask
+
+
+# Shared by every `permission_required` check in the process
+permission_registry = PermissionRegistry()
+
+
+# Claim holding a token's compact permission bitset, "<version>.<epoch>.<base64url bits>"
+PERMISSION_BITS_CLAIM = "pbits"
+
+
+class PermissionBitRegistry:
+    """
+    Maps permission names to the bit positions used in compact tokens.
+
+    Positions are the permissions' database ids, loaded through `loader` (a
+    callable returning `(id, name)` rows). The registry reloads itself when it
+    meets a token version it doesn't know, when it meets a name or an epoch it
+    doesn't know (at most once every `min_refresh_interval` seconds), on the
+    next lookup after `invalidate()`, and once its contents are older than
+    `max_age` seconds, so that permissions deleted by other processes are
+    noticed.
+
+    A token is only accepted while the epoch of its version is unchanged, i.e.
+    while every permission up to its version still exists under the same name.
+    Ids freed by a deleted permission and handed to a new one can therefore
+    never grant the new permission to older tokens.
+
+    Args:
+        loader: Returns the `(id, name)` pairs of every permission.
+        min_refresh_interval: Minimum seconds between reloads triggered by
+                              unknown names or epochs.
+        max_age: Seconds after which the registry reloads on its next use;
+                 None keeps it until invalidated.
+    """
+
+    def __init__(
+        self,
+        loader: Optional[Callable[[], Iterable[Tuple[int, str]]]] = None,
+        min_refresh_interval: float = 5.0,
+        max_age: Optional[float] = 60.0,
+    ):
+        self.loader = loader
+        self.min_refresh_interval = min_refresh_interval
+        self.max_age = max_age
+        self.version = 0
+        self._ids: Dict[str, int] = {}
+        self._rows: List[Tuple[int, str]] = []
+        self._epochs: Dict[int, str] = {}
+        self._masks: Dict[Tuple[str, ...], Tuple[int, bool]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def load(self, rows: Iterable[Tuple[int, str]]) -> None:
+        """Replaces the registry's contents with `(id, name)` rows."""
+        rows = sorted((int(permission_id), name) for permission_id, name in rows)
+        with self._lock:
+            self._ids = {name: permission_id for permission_id, name in rows}
+            self._rows = rows
+            self._epochs = {}
+            self._masks = {}
+            self.version = rows[-1][0] if rows else 0
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Forces a reload on the next lookup, e.g. after a permission was renamed."""
+        self._loaded_at = None
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reloads from `loader` unless it ran in the last `min_refresh_interval` seconds."""
+        if self.loader is None:
+            return False
+        loaded_at = self._loaded_at
+        if not force and loaded_at is not None:
+            if time.monotonic() - loaded_at < self.min_refresh_interval:
+                return False
+        self.load(self.loader())
+        return True
+
+    def _ensure_loaded(self) -> None:
+        loaded_at = self._loaded_at
+        if loaded_at is None or (
+            self.max_age is not None and time.monotonic() - loaded_at >= self.max_age
+        ):
+            self.refresh(force=True)
+
+    def epoch(self, version: Optional[int] = None) -> str:
+        """
+        The epoch of `version` (the current one by default).
+
+        It digests the `(id, name)` pairs up to `version`, so it stays the
+        same when permissions are added and changes when one of them is
+        deleted or renamed.
+        """
+        version = self.version if version is None else version
+        epoch = self._epochs.get(version)
+        if epoch is None:
+            digest = hashlib.blake2b(digest_size=6)
+            for permission_id, name in self._rows:
+                if permission_id > version:
+                    break
+                digest.update(f"{permission_id}:{name}\n".encode("utf-8"))
+            epoch = base64.urlsafe_b64encode(digest.digest()).decode("ascii")
+            self._epochs[version] = epoch
+        return epoch
+
+    def mask(self, names: Iterable[str]) -> Tuple[int, bool]:
+        """
+        Returns the bitset of `names` and whether every name was known.
+
+        Unknown names trigger at most one reload before being left out.
+        """
+        self._ensure_loaded()
+        key = tuple(names)
+        cached = self._masks.get(key)
+        if cached is not None:
+            return cached
+        ids = self._ids
+        if any(name not in ids for name in key) and self.refresh():
+            ids = self._ids
+        mask, complete = 0, True
+        for name in key:
+            permission_id = ids.get(name)
+            if permission_id is None:
+                complete = False
+            else:
+                mask |= 1 << permission_id
+        self._masks[key] = (mask, complete)
+        return mask, complete
+
+    def encode(self, names: Iterable[str]) -> str:
+        """Encodes `names` as a compact, versioned token claim."""
+        mask, _ = self.mask(names)
+        raw = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+        bits = base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+        return f"{self.version}.{self.epoch()}.{bits}"
+
+    def decode(self, value: str) -> int:
+        """
+        Returns the bitset of a claim made by `encode`.
+
+        Raises:
+            ValueError: If `value` is not a valid encoded bitset, or was minted
+                        before a permission up to its version was deleted.
+        """
+        version, epoch, bits = value.split(".")
+        version = int(version)
+        raw = base64.urlsafe_b64decode(bits + "=" * (-len(bits) % 4))
+        mask = int.from_bytes(raw, "little")
+        if mask >> (version + 1):
+            raise ValueError("Permission bitset exceeds its version.")
+        self._ensure_loaded()
+        if version > self.version:
+            # Minted by a process that already knows newer permissions
+            self.refresh(force=True)
+        elif epoch != self.epoch(version):
+            # Minted before a deletion, or after one this process hasn't seen yet
+            self.refresh()
+        if version > self.version or epoch != self.epoch(version):
+            raise ValueError("Permission bitset belongs to a retired permission epoch.")
+        return mask
+
+
+# Loaded from the `permissions` table by the users module
+permission_bit_registry = PermissionBitRegistry()
@@ -0,0 +1,58 @@
+# src/dev_kit/web/query_stats.py
+"""
+Admin routes exposing a `QueryStats` table (see `dev_kit.database.query_stats`).
+
+Typical use, on an admin blueprint:
+
+    stats = init_query_stats(app, db)
+    register_query_stats_routes(admin_bp, stats)
+"""
+
+from apiflask import APIBlueprint
+from flask_jwt_extended import jwt_required
+
+from dev_kit.database.query_stats import QueryStats
+from dev_kit.exceptions import AppBaseException
+from dev_kit.web.decorators import permission_required
+from dev_kit.web.schemas import MessageSchema, QueryStatSchema, QueryStatsQuerySchema
+
+
+def register_query_stats_routes(
+    bp: APIBlueprint,
+    stats: QueryStats,
+    *,
+    permission: str = "read:query_stats",
+    reset_permission: str = "reset:query_stats",
+):
+    """
+    Registers `GET /query-stats` and `DELETE /query-stats` on `bp`.
+
+    The first lists the statement fingerprints, slowest first by default
+    (`sort` and `limit` query parameters) and requires a JWT carrying
+    `permission`; the second resets the table and requires
+    `reset_permission`, so read-only access can't wipe the data. Super admins
+    always pass.
+    """
+    tags = ["Admin"]
+
+    @bp.errorhandler(AppBaseException)
+    def handle_app_exception(error):
+        return error.to_dict(), error.status_code, getattr(error, "headers", None) or {}
+
+    @bp.get("/query-stats")
+    @bp.input(QueryStatsQuerySchema, location="query")
+    @bp.output(QueryStatSchema(many=True))
+    @bp.doc(summary="Statement statistics by fingerprint", tags=tags)
+    @jwt_required()
+    @permission_required(permission)
+    def list_query_stats(query_data):
+        return stats.snapshot(sort=query_data["sort"], limit=query_data["limit"])
+
+    @bp.delete("/query-stats")
+    @bp.output(MessageSchema)
+    @bp.doc(summary="Reset the statement statistics", tags=tags)
+    @jwt_required()
+    @permission_required(reset_permission)
+    def reset_query_stats():
+        stats.reset()
+        return {"message": "Query statistics reset."}
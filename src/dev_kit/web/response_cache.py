@@ -0,0 +1,165 @@
+# src/dev_kit/web/response_cache.py
+"""
+A cache of encoded, compressed response bodies for hot GET routes.
+
+`ResponseCache.cached` wraps a view so the bytes it produces (after
+serialization, JSON encoding and compression) are stored and replayed for the
+next identical request. Entries are keyed by route, URL arguments, normalized
+query string, the caller's permission scope and the negotiated content
+encoding, and live in a generation-versioned `ModelCache` namespace, so a
+single `invalidate` drops all of them. Register the cache with the owning
+service (`BaseService.add_dependent_cache`) to have its writes do that.
+
+Bodies are compressed with brotli (when the `brotli` package is installed) or
+gzip, whichever the client prefers, unless they are smaller than `min_size`.
+"""
+
+import gzip
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask import Response, current_app, jsonify, request
+from werkzeug.http import parse_date, unquote_etag
+
+from dev_kit.database.cache import MISS, CacheBackend, ModelCache
+from dev_kit.web.conditional import is_not_modified, not_modified_response
+from dev_kit.web.decorators import permission_scope
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+# Bodies below this many bytes are stored and sent uncompressed.
+COMPRESS_MIN_SIZE = 1024
+
+# Response headers replayed from a cache entry.
+_CACHED_HEADERS = ("ETag", "Last-Modified")
+
+COMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {
+    "gzip": lambda body: gzip.compress(body, compresslevel=6, mtime=0),
+}
+if brotli is not None:  # pragma: no cover - depends on the environment
+    COMPRESSORS = {"br": lambda body: brotli.compress(body, quality=5), **COMPRESSORS}
+
+
+def negotiate_encoding() -> Optional[str]:
+    """The encoding of `COMPRESSORS` the client prefers, or None for identity."""
+    return request.accept_encodings.best_match(list(COMPRESSORS))
+
+
+def _as_response(rv: Any, schema: Optional[type]) -> Response:
+    """Turns a view's return value into a response, dumping data with `schema`."""
+    if isinstance(rv, Response):
+        return rv
+    status, headers = 200, None
+    if isinstance(rv, tuple):
+        rv, status, *rest = rv
+        headers = rest[0] if rest else None
+    if schema is None:
+        raise TypeError("A schema is needed to cache views that don't return a response.")
+    response = jsonify(schema().dump(rv))
+    response.status_code = status
+    if headers:
+        response.headers.update(headers)
+    return response
+
+
+class ResponseCache:
+    """
+    Stores the final bytes of GET responses in a `CacheBackend`.
+
+    Args:
+        backend: Where entries are stored; may be shared with other caches.
+        namespace: Distinguishes this cache's entries (and generation) in `backend`.
+        ttl: Lifetime of entries in seconds (the backend default if None).
+        min_size: Bodies smaller than this are not compressed.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        namespace: str,
+        ttl: Optional[float] = None,
+        min_size: int = COMPRESS_MIN_SIZE,
+    ):
+        self.cache = ModelCache(backend, namespace, ttl=ttl)
+        self.min_size = min_size
+
+    @property
+    def stats(self):
+        return self.cache.stats
+
+    def invalidate(self) -> None:
+        """Drops every cached response."""
+        self.cache.invalidate()
+
+    def cached(self, route_name: str, schema: Optional[type] = None, vary_auth: bool = True):
+        """
+        Decorator caching a view's 200 responses.
+
+        Apply it below the auth/permission decorators, which must still run on
+        every request.
+
+        Args:
+            route_name: Part of the key, so views sharing a cache don't collide.
+            schema: Dumps views returning data instead of a response (as
+                    `@bp.output` would).
+            vary_auth: Whether the response depends on the caller, adding
+                       `Authorization` and `Cookie` to `Vary`.
+        """
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                encoding = negotiate_encoding()
+                key = (
+                    route_name,
+                    tuple(sorted((request.view_args or {}).items())),
+                    tuple(sorted(request.args.items(multi=True))),
+                    permission_scope(),
+                    encoding,
+                )
+                entry = self.cache.get(key)
+                if entry is MISS:
+                    response = _as_response(view(*args, **kwargs), schema)
+                    if response.status_code != 200 or response.is_streamed:
+                        return self._vary(response, vary_auth)
+                    entry = self._encode(response, encoding)
+                    self.cache.set(key, entry)
+                return self._vary(self._replay(entry), vary_auth)
+
+            return wrapper
+
+        return decorator
+
+    def _encode(self, response: Response, encoding: Optional[str]) -> Tuple:
+        body = response.get_data()
+        content_encoding = None
+        if encoding is not None and len(body) >= self.min_size:
+            body = COMPRESSORS[encoding](body)
+            content_encoding = encoding
+        headers = tuple((name, response.headers[name]) for name in _CACHED_HEADERS if name in response.headers)
+        return body, content_encoding, response.mimetype, headers
+
+    @staticmethod
+    def _replay(entry: Tuple) -> Response:
+        body, content_encoding, mimetype, headers = entry
+        headers = dict(headers)
+        if "ETag" in headers:
+            # Entries are dropped on writes, so their validators are current
+            etag = unquote_etag(headers["ETag"])[0]
+            if is_not_modified(etag, parse_date(headers.get("Last-Modified"))):
+                return not_modified_response(headers)
+        response = current_app.response_class(body, mimetype=mimetype, headers=headers)
+        if content_encoding is not None:
+            response.headers["Content-Encoding"] = content_encoding
+        return response
+
+    @staticmethod
+    def _vary(response: Response, vary_auth: bool) -> Response:
+        response.vary.add("Accept-Encoding")
+        if vary_auth:
+            response.vary.add("Authorization")
+            response.vary.add("Cookie")
+        return response
@@ -6,16 +6,81 @@ This module is the culmination of the dev-kit, bringing together services,
 schemas, and decorators to create a full set of API routes from a single call.
 """
 
-from typing import Any, Dict, Type, Callable, List
+import csv
+import io
+from functools import lru_cache
+from inspect import Parameter, signature
+from typing import Any, Dict, Iterator, Type, Callable, List, Tuple
 
 from apiflask import APIBlueprint
+from flask import current_app, jsonify, request, stream_with_context
 from flask_jwt_extended import jwt_required
 from marshmallow import ValidationError
+from sqlalchemy import inspect
 
+from dev_kit.database.cache import CacheBackend
+from dev_kit.database.loading import LoadingSpec, loading_for_schema
+from dev_kit.database.replicas import replica_reads
 from dev_kit.exceptions import AppBaseException, NotFoundError
 from dev_kit.services import BaseService
+from dev_kit.web.conditional import (
+    body_etag,
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    validator_headers,
+)
 from dev_kit.web.decorators import permission_required
-from dev_kit.web.schemas import MessageSchema
+from dev_kit.web.instrumentation import timed, view_timing
+from dev_kit.web.response_cache import ResponseCache
+from dev_kit.web.schemas import (
+    FieldsQuerySchema,
+    MessageSchema,
+    create_bulk_schemas,
+    create_export_query_schema,
+)
+from dev_kit.web.serializers import CompiledSerializer, json_bytes, json_response
+
+EXPORT_MIMETYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@lru_cache(maxsize=256)
+def _keyword_parameters(method: Callable) -> frozenset | None:
+    """The names `method` accepts as keywords, or None when it takes `**kwargs`."""
+    try:
+        parameters = signature(method).parameters.values()
+    except (TypeError, ValueError):
+        return None
+    if any(p.kind is Parameter.VAR_KEYWORD for p in parameters):
+        return None
+    return frozenset(
+        p.name for p in parameters if p.kind in (Parameter.POSITIONAL_OR_KEYWORD, Parameter.KEYWORD_ONLY)
+    )
+
+
+def read_options(
+    method: Callable, loading: Any = None, columns: Any = None, count: str = "exact"
+) -> Dict[str, Any]:
+    """
+    The optional read arguments to pass to a service's `method`.
+
+    Only those differing from their defaults and accepted by `method` are
+    kept, so services overriding `get_by_*`, `paginate` or `paginate_by_cursor`
+    with a signature predating `loading`, `columns` or `count` keep working:
+    their reads load lazily, select every column (the response is still
+    narrowed to the fieldset) and count exactly.
+    """
+    options: Dict[str, Any] = {}
+    if loading is not None:
+        options["loading"] = loading
+    if columns:
+        options["columns"] = columns
+    if count != "exact":
+        options["count"] = count
+    accepted = _keyword_parameters(method) if options else None
+    if accepted is None:
+        return options
+    return {name: value for name, value in options.items() if name in accepted}
 
 
 def register_error_handlers(bp: APIBlueprint):
@@ -27,7 +92,7 @@ def register_error_handlers(bp: APIBlueprint):
 
     @bp.errorhandler(AppBaseException)
     def handle_app_exception(error):
-        return error.to_dict(), error.status_code
+        return error.to_dict(), error.status_code, getattr(error, "headers", None) or {}
 
     @bp.errorhandler(ValidationError)
     def handle_validation_error(error):
@@ -49,6 +114,7 @@ def register_crud_routes(
     *,
     id_field: str = "uuid",
     routes_config: Dict[str, Dict[str, Any]] | None = None,
+    response_cache: CacheBackend | None = None,
 ):
     """
     Registers a standard set of CRUD routes for a given entity.
@@ -59,7 +125,62 @@ def register_crud_routes(
         schemas: A dictionary of schemas generated by `create_crud_schemas`.
         entity_name: The lowercase name of the entity (e.g., "product").
         id_field: The field to use for URL parameters ('id' or 'uuid').
+        response_cache: A cache backend for the encoded, compressed bodies of
+            'list' and 'get' responses (see `dev_kit.web.response_cache`).
+            Entries are keyed by query string and the caller's permission
+            scope, and dropped by every write through `service`. Set
+            `response_cache` to False in a route's `routes_config` entry to
+            leave that route uncached.
         routes_config: A dictionary to customize auth/permissions per route.
+            Each entry may also set `enabled`. The standard routes ('list', 'get',
+            'create', 'update', 'delete') are enabled by default; the batch routes
+            ('bulk_create', 'bulk_update', 'bulk_delete', served at `/batch`) must
+            be enabled explicitly and default to the create/update/delete
+            permissions.
+            The 'list' and 'get' entries may also set `loading`: a loading spec
+            (see `dev_kit.database.loading`) for the relationships serialized
+            with each item, or None to load lazily. By default the spec is
+            derived from the main schema's relationship fields. The spec, the
+            fieldset and the count strategy are only passed to the service's
+            read methods when they accept them (see `read_options`), so
+            overrides written before these arguments existed still work.
+
+    The 'list' and 'get' routes accept a `fields` query parameter (a sparse
+    fieldset such as `fields=uuid,username`): only those columns are selected
+    and serialized. It must name fields of the main schema backed by columns.
+
+    When the main schema only dumps plain column fields, these two routes
+    serialize through a `CompiledSerializer` instead of marshmallow; set
+    `compiled_serializer` to False in their `routes_config` entry to opt out.
+
+    For models with an `updated_at` column, 'list' and 'get' also send weak
+    `ETag` and `Last-Modified` headers. Requests carrying `If-Modified-Since`
+    are answered with 304 after a cheap probe (`updated_at` of the item, or
+    the count and latest `updated_at` of the matching rows), before loading or
+    serializing anything; so are those carrying `If-None-Match` for models
+    with a `version` column (`VersionMixin`), whose probe gives the ETag.
+    Other ETags hash the serialized body, since `updated_at` can't tell apart
+    writes made within its resolution (one second on SQLite): a matching
+    `If-None-Match` then saves the transfer, not the work, and the 304 of a
+    versioned model hands out the probe's ETag for next time. Requests without
+    these headers never run the probe; their validators come from what was
+    read. Set `conditional` to False in their `routes_config` entry to skip
+    all of this. Hard deletes that leave the latest `updated_at` unchanged are
+    only reflected in a list's ETag.
+
+    The opt-in 'export' route (`GET /export`) streams every row matching the
+    list filters as NDJSON or CSV (`format=ndjson|csv`), reading `batch_size`
+    rows at a time (1000 by default) so memory stays flat however large the
+    table is. It exports the main schema's column fields (or `fields`), and
+    its auth/permission settings default to the 'list' entry's.
+
+    The write routes never commit: each write runs in a savepoint (see
+    `handle_session`) and committing the request's transaction is left to
+    the application. `register_async_crud_routes` commits in every view.
+
+    The GET routes ('list', 'get', 'export') read from the replica when
+    `service` works on a `ReplicaSession` with one configured; the writes
+    use the primary (see `dev_kit.database.replicas`).
     """
     register_error_handlers(bp)
 
@@ -77,8 +198,13 @@ def register_crud_routes(
     # Prepare dynamic auth/permission decorators per route
     cfg: Dict[str, Dict[str, Any]] = routes_config or {}
 
-    def get_route_decorators(route_name: str, default_require_auth: bool, default_permission: str | None) -> List[Callable]:
-        route_cfg = cfg.get(route_name, {})
+    def get_route_decorators(
+        route_name: str,
+        default_require_auth: bool,
+        default_permission: str | None,
+        inherit: str | None = None,
+    ) -> List[Callable]:
+        route_cfg = {**cfg.get(inherit, {}), **cfg.get(route_name, {})} if inherit else cfg.get(route_name, {})
         decorators: List[Callable] = []
 
         require_auth = route_cfg.get("auth_required", default_require_auth)
@@ -91,8 +217,141 @@ def register_crud_routes(
 
         return decorators
 
+    def route_enabled(route_name: str, default: bool = True) -> bool:
+        return cfg.get(route_name, {}).get("enabled", default)
+
+    def route_loading(route_name: str) -> LoadingSpec | None:
+        route_cfg = cfg.get(route_name, {})
+        if "loading" not in route_cfg:
+            return loading_for_schema(main_schema, service.model)
+        loading = route_cfg["loading"]
+        if loading is None or isinstance(loading, LoadingSpec):
+            return loading
+        return LoadingSpec(service.model, loading)
+
+    list_loading = route_loading("list")
+    get_loading = route_loading("get")
+
+    # Sparse fieldsets may name the main schema's fields backed by a column
+    column_keys = {attr.key for attr in inspect(service.model).column_attrs}
+    selectable_fields = frozenset(
+        name
+        for name, field in main_schema().fields.items()
+        if not field.load_only and name in column_keys and field.attribute in (None, name)
+    )
+
+    has_updated_at = "updated_at" in column_keys
+    versioned = "version" in column_keys
+
+    def route_conditional(route_name: str) -> bool:
+        conditional = cfg.get(route_name, {}).get("conditional", has_updated_at)
+        if conditional and not has_updated_at:
+            raise ValueError(
+                f"Route '{route_name}' can't be conditional: {service.model.__name__} has no updated_at column."
+            )
+        return conditional
+
+    list_conditional = route_conditional("list")
+    get_conditional = route_conditional("get")
+
+    def wants_probe() -> bool:
+        # Only a version answers If-None-Match; If-Modified-Since is ignored next to it
+        if request.if_none_match:
+            return versioned
+        return request.if_modified_since is not None
+
+    def parse_fields(raw: str | None) -> Tuple[str, ...] | None:
+        if not raw:
+            return None
+        fields = tuple(dict.fromkeys(f.strip() for f in raw.split(",") if f.strip()))
+        unknown = [f for f in fields if f not in selectable_fields]
+        if unknown:
+            raise ValidationError({"fields": [f"Unknown field(s): {', '.join(unknown)}."]})
+        return fields or None
+
+    def route_serializer(route_name: str) -> CompiledSerializer | None:
+        if not cfg.get(route_name, {}).get("compiled_serializer", True):
+            return None
+        if route_name == "list" and getattr(pagination_out_schema, "item_schema", None) is not main_schema:
+            return None
+        return CompiledSerializer.for_schema(main_schema, service.model)
+
+    list_serializer = route_serializer("list")
+    get_serializer = route_serializer("get")
+
+    @lru_cache(maxsize=64)
+    def narrowed(serializer: CompiledSerializer, fields: Tuple[str, ...]) -> CompiledSerializer:
+        return serializer.only(fields)
+
+    # One schema instance per distinct fieldset, instead of one per request
+    @lru_cache(maxsize=64)
+    def item_schema_for(fields: Tuple[str, ...]):
+        return main_schema(only=fields)
+
+    @lru_cache(maxsize=64)
+    def page_schema_for(fields: Tuple[str, ...]):
+        return pagination_out_schema(only=("pagination", *(f"items.{f}" for f in fields)))
+
+    # Export columns: the selectable fields, in the main schema's order
+    export_columns = tuple(name for name in main_schema().fields if name in selectable_fields)
+
+    @lru_cache(maxsize=64)
+    def export_serializer(fields: Tuple[str, ...]) -> CompiledSerializer | None:
+        if not cfg.get("export", {}).get("compiled_serializer", True):
+            return None
+        return CompiledSerializer.for_schema(item_schema_for(fields), service.model)
+
+    def with_headers(response, headers: Dict[str, str]):
+        # `@bp.output` only passes responses through as-is, not (response, status, headers)
+        response.headers.update(headers)
+        return response
+
+    def with_validators(response, etag: str | None, last_updated):
+        """
+        Adds the validators to a response, hashing its body when there is no
+        ETag yet. A body matching `If-None-Match` still gets a 304, carrying
+        the probe's ETag when there is one.
+        """
+        if etag is None or request.if_none_match:
+            hashed = body_etag(response.get_data())
+            if is_not_modified(hashed, last_updated):
+                return not_modified_response(validator_headers(etag or hashed, last_updated))
+            etag = etag or hashed
+        return with_headers(response, validator_headers(etag, last_updated))
+
+    def latest_update(items) -> Any:
+        """The latest `updated_at` among loaded items (rows may not have selected it)."""
+        return max(
+            (value for value in (getattr(item, "updated_at", None) for item in items) if value),
+            default=None,
+        )
+
+    # Conditional responses are serialized here, so their bodies can be hashed
+    @lru_cache(maxsize=1)
+    def full_schemas():
+        return pagination_out_schema(), main_schema()
+
+    responses: ResponseCache | None = None
+    if response_cache is not None:
+        responses = ResponseCache(response_cache, namespace=f"dev_kit.responses.{bp.name}")
+        service.add_dependent_cache(responses.cache)
+
+    def cache_decorators(route_name: str, schema: Type) -> List[Callable]:
+        route_cfg = cfg.get(route_name, {})
+        if responses is None or not route_cfg.get("response_cache", True):
+            return []
+        # Innermost, so auth and permission checks still run on cache hits
+        vary_auth = route_cfg.get("auth_required", True)
+        return [responses.cached(route_name, schema=schema, vary_auth=vary_auth)]
+
+    def read_decorators() -> List[Callable]:
+        # GET routes, serialization included, may query a read replica
+        return [replica_reads(service._db_session)]
+
     # Helper to apply a sequence of decorators in the same order as stacked decorators
     def _apply_decorators(func, decorators: List[Callable]):
+        # Innermost: what runs after the view returns counts as serialization
+        func = view_timing(func)
         for dec in reversed(decorators):
             func = dec(func)
         return func
@@ -108,24 +367,156 @@ def register_crud_routes(
         if sort_by_str:
             order_by = [s.strip() for s in sort_by_str.split(",") if s.strip()]
         include_soft_deleted = filters.pop("include_soft_deleted", False)
-
-        return service.paginate(
-            page=page,
-            per_page=per_page,
-            filters=filters,
-            order_by=order_by,
-            include_soft_deleted=include_soft_deleted,
-        ), 200
-
-    def get_item(**kwargs):
+        cursor = filters.pop("cursor", None)
+        count = filters.pop("count", "exact")
+        fields = parse_fields(filters.pop("fields", None))
+
+        etag, last_updated, probed = None, None, False
+        if list_conditional and wants_probe():
+            probed = True
+            total, last_updated, version = service.get_collection_version(filters, include_soft_deleted)
+            if version is not None:
+                # The query string picks the page, order and fields
+                etag = make_etag(entity_name, total, last_updated, version, sorted(request.args.items(multi=True)))
+            if is_not_modified(etag, last_updated):
+                return not_modified_response(validator_headers(etag, last_updated))
+
+        if cursor is not None:
+            result = service.paginate_by_cursor(
+                cursor=cursor or None,
+                per_page=per_page,
+                filters=filters,
+                order_by=order_by,
+                include_soft_deleted=include_soft_deleted,
+                **read_options(service.paginate_by_cursor, list_loading, fields),
+            )
+        else:
+            result = service.paginate(
+                page=page,
+                per_page=per_page,
+                filters=filters,
+                order_by=order_by,
+                include_soft_deleted=include_soft_deleted,
+                **read_options(service.paginate, list_loading, fields, count),
+            )
+        # A response object skips the full output schema
+        if list_serializer is not None:
+            serializer = narrowed(list_serializer, fields) if fields else list_serializer
+            with timed("serialize"):
+                response = json_response(serializer.dump_page(result))
+        elif fields or list_conditional:
+            schema = page_schema_for(fields) if fields else full_schemas()[0]
+            with timed("serialize"):
+                response = jsonify(schema.dump(result))
+        else:
+            return result
+        if not list_conditional:
+            return response
+        if not probed:
+            last_updated = latest_update(result.items)
+        return with_validators(response, etag, last_updated)
+
+    def get_item(query_data=None, **kwargs):
         """Retrieve a single item by its ID or UUID."""
         item_id = kwargs[id_field]
+        fields = parse_fields((query_data or {}).get("fields"))
+        etag, last_updated, probed = None, None, False
+        if get_conditional and wants_probe():
+            probed = True
+            probe = service.get_version(item_id, id_field=id_field)
+            if probe is None:
+                raise NotFoundError(entity_name, item_id)
+            entity_id, last_updated, version = probe
+            if version is not None:
+                etag = make_etag(entity_name, entity_id, version, fields)
+            if is_not_modified(etag, last_updated):
+                return not_modified_response(validator_headers(etag, last_updated))
         # Use getattr for more dynamic method calling
         method_to_call = getattr(service, f"get_by_{id_field}")
-        item = method_to_call(item_id)
+        item = method_to_call(item_id, **read_options(method_to_call, get_loading, fields))
         if item is None:
             raise NotFoundError(entity_name, item_id)
-        return item
+        if get_serializer is not None:
+            serializer = narrowed(get_serializer, fields) if fields else get_serializer
+            with timed("serialize"):
+                response = json_response(serializer.dump(item))
+        elif fields or get_conditional:
+            schema = item_schema_for(fields) if fields else full_schemas()[1]
+            with timed("serialize"):
+                response = jsonify(schema.dump(item))
+        else:
+            return item
+        if not get_conditional:
+            return response
+        if not probed:
+            # The probe's validators, when the item has the columns behind them
+            last_updated = getattr(item, "updated_at", None)
+            version = getattr(item, "version", None)
+            if version is not None:
+                etag = make_etag(entity_name, getattr(item, "id", None), version, fields)
+        return with_validators(response, etag, last_updated)
+
+    def export_items(query_data):
+        """Stream every matching item as NDJSON or CSV."""
+        filters = query_data.copy()
+        export_format = filters.pop("format", "ndjson")
+        sort_by_str = filters.pop("sort_by", None)
+        order_by = None
+        if sort_by_str:
+            order_by = [s.strip() for s in sort_by_str.split(",") if s.strip()]
+        include_soft_deleted = filters.pop("include_soft_deleted", False)
+        fields = parse_fields(filters.pop("fields", None)) or export_columns
+        batch_size = cfg.get("export", {}).get("batch_size", 1000)
+
+        schema = item_schema_for(fields)
+        serializer = export_serializer(fields)
+        dump = serializer.dump if serializer is not None else schema.dump
+        rows = service.stream(
+            filters=filters,
+            order_by=order_by,
+            include_soft_deleted=include_soft_deleted,
+            columns=fields,
+            batch_size=batch_size,
+        )
+
+        def batches() -> Iterator[List[Any]]:
+            batch = []
+            for row in rows:
+                batch.append(dump(row))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+        def ndjson() -> Iterator[bytes]:
+            for batch in batches():
+                yield b"".join(json_bytes(item) + b"\n" for item in batch)
+
+        def csv_rows() -> Iterator[str]:
+            header = [field.data_key or name for name, field in schema.dump_fields.items()]
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(header)
+            for batch in batches():
+                writer.writerows(
+                    ["" if item[key] is None else item[key] for key in header] for item in batch
+                )
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            # Header only, for an empty export
+            if buffer.tell():
+                yield buffer.getvalue()
+
+        body = ndjson() if export_format == "ndjson" else csv_rows()
+        return current_app.response_class(
+            stream_with_context(body),
+            mimetype=EXPORT_MIMETYPES[export_format],
+            headers={
+                "Content-Disposition": f'attachment; filename="{entity_name}s.{export_format}"'
+            },
+        )
 
     def create_item(json_data):
         """Create a new item."""
@@ -149,14 +540,31 @@ def register_crud_routes(
         bp.output(pagination_out_schema),
         bp.doc(summary=f"List all {entity_name}s", tags=tags),
     ] + get_route_decorators("list", default_require_auth=True, default_permission=None)
-    list_items = _apply_decorators(list_items, list_decorators)
+    list_decorators += cache_decorators("list", pagination_out_schema) + read_decorators()
+    if route_enabled("list"):
+        list_items = _apply_decorators(list_items, list_decorators)
 
     get_decorators: List[Callable] = [
         bp.get(f"/<{id_field}>")
-    , bp.output(main_schema),
+    , bp.input(FieldsQuerySchema, location="query"),
+        bp.output(main_schema),
         bp.doc(summary=f"Get a single {entity_name}", tags=tags),
     ] + get_route_decorators("get", default_require_auth=True, default_permission=None)
-    get_item = _apply_decorators(get_item, get_decorators)
+    get_decorators += cache_decorators("get", main_schema) + read_decorators()
+    if route_enabled("get"):
+        get_item = _apply_decorators(get_item, get_decorators)
+
+    if route_enabled("export", default=False):
+        export_decorators: List[Callable] = [
+            bp.get("/export"),
+            bp.input(create_export_query_schema(query_schema), location="query"),
+            bp.doc(
+                summary=f"Export {entity_name}s",
+                description="Streams every matching item as NDJSON or CSV.",
+                tags=tags,
+            ),
+        ] + get_route_decorators("export", default_require_auth=True, default_permission=None, inherit="list") + read_decorators()
+        export_items = _apply_decorators(export_items, export_decorators)
 
     create_decorators: List[Callable] = [
         bp.post("/"),
@@ -164,7 +572,8 @@ def register_crud_routes(
         bp.output(main_schema, status_code=201),
         bp.doc(summary=f"Create a new {entity_name}", tags=tags),
     ] + get_route_decorators("create", default_require_auth=True, default_permission=f"create:{entity_name}")
-    create_item = _apply_decorators(create_item, create_decorators)
+    if route_enabled("create"):
+        create_item = _apply_decorators(create_item, create_decorators)
 
     update_decorators: List[Callable] = [
         bp.patch(f"/<{id_field}>")
@@ -172,11 +581,59 @@ def register_crud_routes(
         bp.output(main_schema),
         bp.doc(summary=f"Update an existing {entity_name}", tags=tags),
     ] + get_route_decorators("update", default_require_auth=True, default_permission=f"update:{entity_name}")
-    update_item = _apply_decorators(update_item, update_decorators)
+    if route_enabled("update"):
+        update_item = _apply_decorators(update_item, update_decorators)
 
     delete_decorators: List[Callable] = [
         bp.delete(f"/<{id_field}>")
     , bp.output(MessageSchema, status_code=200),
         bp.doc(summary=f"Delete an {entity_name}", tags=tags),
     ] + get_route_decorators("delete", default_require_auth=True, default_permission=f"delete:{entity_name}")
-    delete_item = _apply_decorators(delete_item, delete_decorators)
+    if route_enabled("delete"):
+        delete_item = _apply_decorators(delete_item, delete_decorators)
+
+    # --- Batch Routes (opt-in) ---
+    bulk_routes = ("bulk_create", "bulk_update", "bulk_delete")
+    bulk_schemas: Dict[str, Type] = {}
+    if any(route_enabled(name, default=False) for name in bulk_routes):
+        bulk_schemas = create_bulk_schemas(schemas, id_field=id_field)
+
+    def bulk_create_items(json_data):
+        """Create many items, reporting per-row failures."""
+        return service.bulk_create(json_data["items"]), 200
+
+    def bulk_update_items(json_data):
+        """Update many items, reporting per-row failures."""
+        return service.bulk_update(json_data["items"], id_field=id_field), 200
+
+    def bulk_delete_items(json_data):
+        """Delete many items, reporting per-row failures."""
+        result = service.bulk_delete(json_data["ids"], id_field=id_field, soft=json_data["soft"])
+        return result, 200
+
+    if route_enabled("bulk_create", default=False):
+        bulk_create_decorators: List[Callable] = [
+            bp.post("/batch"),
+            bp.input(bulk_schemas["bulk_input"]),
+            bp.output(bulk_schemas["bulk_out"]),
+            bp.doc(summary=f"Create many {entity_name}s", tags=tags),
+        ] + get_route_decorators("bulk_create", default_require_auth=True, default_permission=f"create:{entity_name}")
+        bulk_create_items = _apply_decorators(bulk_create_items, bulk_create_decorators)
+
+    if route_enabled("bulk_update", default=False):
+        bulk_update_decorators: List[Callable] = [
+            bp.patch("/batch"),
+            bp.input(bulk_schemas["bulk_update"]),
+            bp.output(bulk_schemas["bulk_out"]),
+            bp.doc(summary=f"Update many {entity_name}s", tags=tags),
+        ] + get_route_decorators("bulk_update", default_require_auth=True, default_permission=f"update:{entity_name}")
+        bulk_update_items = _apply_decorators(bulk_update_items, bulk_update_decorators)
+
+    if route_enabled("bulk_delete", default=False):
+        bulk_delete_decorators: List[Callable] = [
+            bp.delete("/batch"),
+            bp.input(bulk_schemas["bulk_delete"]),
+            bp.output(bulk_schemas["bulk_delete_out"]),
+            bp.doc(summary=f"Delete many {entity_name}s", tags=tags),
+        ] + get_route_decorators("bulk_delete", default_require_auth=True, default_permission=f"delete:{entity_name}")
+        bulk_delete_items = _apply_decorators(bulk_delete_items, bulk_delete_decorators)
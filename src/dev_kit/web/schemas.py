@@ -7,12 +7,17 @@ offering tools to auto-generate CRUD schemas from SQLAlchemy models.
 """
 
 from apiflask import Schema
-from apiflask.fields import Boolean, DateTime, Integer, List, Nested, String
-from apiflask.validators import Range
+from apiflask.fields import Boolean, DateTime, Float, Integer, List, Nested, Raw, String
+from apiflask.validators import Length, OneOf, Range
 from marshmallow import ValidationError, pre_dump, validates_schema
 from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
 
-from dev_kit.database.repository import PaginationResult
+from dev_kit.database.repository import (
+    COUNT_STRATEGIES,
+    CursorPaginationResult,
+    PaginationResult,
+)
+from dev_kit.database.query_stats import SORT_KEYS
 
 
 class BaseSchema(Schema):
@@ -45,8 +50,20 @@ class PaginationQuerySchema(Schema):
     )
 
 
-class BaseListQuerySchema(PaginationQuerySchema):
-    """Base schema for list queries, adding sorting and soft-delete control."""
+class FieldsQuerySchema(Schema):
+    """Schema for the sparse fieldset query parameter (fields)."""
+
+    fields = String(
+        required=False,
+        metadata={
+            "description": "Comma-separated fields to return, e.g. 'uuid,username'."
+            " Only those columns are read from the database."
+        },
+    )
+
+
+class BaseListQuerySchema(FieldsQuerySchema, PaginationQuerySchema):
+    """Base schema for list queries, adding sorting, soft-delete control and field selection."""
 
     sort_by = String(
         required=False,
@@ -59,6 +76,22 @@ class BaseListQuerySchema(PaginationQuerySchema):
         load_default=False,
         metadata={"description": "Include soft-deleted items in the results."},
     )
+    count = String(
+        load_default="exact",
+        validate=OneOf(COUNT_STRATEGIES),
+        metadata={
+            "description": "How the total is computed: 'exact', 'none' (skip counting),"
+            " 'estimated' (planner estimate where supported) or 'cached'."
+        },
+    )
+    cursor = String(
+        required=False,
+        metadata={
+            "description": "Switches to cursor pagination. Pass the `next_cursor` or"
+            " `prev_cursor` of a previous page, or an empty value for the first page."
+            " `page` is ignored in this mode."
+        },
+    )
 
 
 class BaseFilterQuerySchema(BaseListQuerySchema):
@@ -77,14 +110,27 @@ class BaseFilterQuerySchema(BaseListQuerySchema):
 class PaginationInfoSchema(BaseSchema):
     """Schema for displaying pagination metadata in the output."""
 
-    total = Integer(metadata={"description": "Total number of items."})
+    total = Integer(allow_none=True, metadata={"description": "Total number of items."})
+    total_is_exact = Boolean(
+        metadata={"description": "False when the total is an estimate or a cached value."}
+    )
     page = Integer(metadata={"description": "Current page number."})
     per_page = Integer(metadata={"description": "Number of items per page."})
-    total_pages = Integer(metadata={"description": "Total number of pages."})
+    total_pages = Integer(
+        allow_none=True, metadata={"description": "Total number of pages."}
+    )
     has_next = Boolean(metadata={"description": "Indicates if there is a next page."})
     has_prev = Boolean(
         metadata={"description": "Indicates if there is a previous page."}
     )
+    next_cursor = String(
+        allow_none=True,
+        metadata={"description": "Cursor for the next page (cursor pagination only)."},
+    )
+    prev_cursor = String(
+        allow_none=True,
+        metadata={"description": "Cursor for the previous page (cursor pagination only)."},
+    )
 
 
 def create_pagination_schema(item_schema: type[Schema]) -> type[Schema]:
@@ -104,6 +150,7 @@ def create_pagination_schema(item_schema: type[Schema]) -> type[Schema]:
                     "items": data.items,
                     "pagination": {
                         "total": data.total,
+                        "total_is_exact": data.total_is_exact,
                         "page": data.page,
                         "per_page": data.per_page,
                         "total_pages": data.total_pages,
@@ -111,12 +158,50 @@ def create_pagination_schema(item_schema: type[Schema]) -> type[Schema]:
                         "has_prev": data.has_prev,
                     },
                 }
+            if isinstance(data, CursorPaginationResult):
+                return {
+                    "items": data.items,
+                    "pagination": {
+                        "per_page": data.per_page,
+                        "has_next": data.has_next,
+                        "has_prev": data.has_prev,
+                        "next_cursor": data.next_cursor,
+                        "prev_cursor": data.prev_cursor,
+                    },
+                }
             return data
 
     GenericPaginationOutSchema.__name__ = f"{item_schema.__name__}PaginationOut"
+    # Lets the CRUD routes recognise the generated wrapper (see `web.serializers`)
+    GenericPaginationOutSchema.item_schema = item_schema
     return GenericPaginationOutSchema
 
 
+EXPORT_FORMATS = ("ndjson", "csv")
+
+
+def create_export_query_schema(query_schema: type[Schema]) -> type[Schema]:
+    """
+    Derives the export route's query schema from a list query schema.
+
+    Keeps the filters, sorting and field selection, drops the pagination
+    parameters (an export covers every matching row) and adds `format`.
+    """
+    meta = getattr(query_schema, "Meta", object)
+    return type(
+        query_schema.__name__.replace("QuerySchema", "") + "ExportQuerySchema",
+        (query_schema,),
+        {
+            "Meta": type("Meta", (meta,), {"exclude": ("page", "per_page", "cursor", "count")}),
+            "format": String(
+                load_default="ndjson",
+                validate=OneOf(EXPORT_FORMATS),
+                metadata={"description": "Output format: 'ndjson' (one JSON object per line) or 'csv'."},
+            ),
+        },
+    )
+
+
 def create_crud_schemas(model_class: type, **kwargs) -> dict:
     """
     Dynamically generates a full set of CRUD schemas for a SQLAlchemy model.
@@ -192,7 +277,110 @@ def create_crud_schemas(model_class: type, **kwargs) -> dict:
     }
 
 
+class BulkErrorSchema(BaseSchema):
+    """Schema describing one row rejected by a bulk operation."""
+
+    index = Integer(metadata={"description": "Position of the row in the request."})
+    message = String()
+    error_code = String()
+
+
+def create_bulk_schemas(schemas: dict, id_field: str = "id") -> dict:
+    """
+    Builds the request/response schemas for the batch CRUD endpoints.
+
+    Args:
+        schemas: The dictionary returned by `create_crud_schemas`.
+        id_field: The identifier field used by the routes ('id' or 'uuid').
+
+    Returns:
+        A dictionary with 'bulk_input', 'bulk_update', 'bulk_delete', 'bulk_out'
+        and 'bulk_delete_out' schemas.
+    """
+    main_schema = schemas["main"]
+    model_name = main_schema.__name__.removesuffix("Schema")
+    id_type = Integer if id_field == "id" else String
+    max_items = {"validate": Length(min=1, max=10000)}
+
+    bulk_input = type(
+        f"{model_name}BulkInputSchema",
+        (BaseSchema,),
+        {"items": List(Nested(schemas["input"]), required=True, **max_items)},
+    )
+    bulk_update_item = type(
+        f"{model_name}BulkUpdateItemSchema",
+        (BaseSchema,),
+        {id_field: id_type(required=True), "data": Nested(schemas["update"](partial=True), required=True)},
+    )
+    bulk_update = type(
+        f"{model_name}BulkUpdateSchema",
+        (BaseSchema,),
+        {"items": List(Nested(bulk_update_item), required=True, **max_items)},
+    )
+    bulk_delete = type(
+        f"{model_name}BulkDeleteSchema",
+        (BaseSchema,),
+        {
+            "ids": List(id_type(), required=True, **max_items),
+            "soft": Boolean(
+                load_default=True,
+                metadata={"description": "Soft delete when the model supports it."},
+            ),
+        },
+    )
+    bulk_out = type(
+        f"{model_name}BulkOutSchema",
+        (BaseSchema,),
+        {
+            "items": List(Nested(main_schema)),
+            "errors": List(Nested(BulkErrorSchema), attribute="failures"),
+        },
+    )
+    bulk_delete_out = type(
+        f"{model_name}BulkDeleteOutSchema",
+        (BaseSchema,),
+        {
+            "deleted": List(Raw(), attribute="items"),
+            "errors": List(Nested(BulkErrorSchema), attribute="failures"),
+        },
+    )
+    return {
+        "bulk_input": bulk_input,
+        "bulk_update": bulk_update,
+        "bulk_delete": bulk_delete,
+        "bulk_out": bulk_out,
+        "bulk_delete_out": bulk_delete_out,
+    }
+
+
 class MessageSchema(Schema):
     """A generic schema for simple message responses."""
 
     message = String()
+
+
+class QueryStatsQuerySchema(Schema):
+    """Schema for the query parameters of the query statistics route."""
+
+    sort = String(
+        load_default="total",
+        validate=OneOf(SORT_KEYS),
+        metadata={"description": "Order of the entries (descending): " + ", ".join(SORT_KEYS) + "."},
+    )
+    limit = Integer(
+        load_default=50,
+        validate=Range(min=1, max=1000),
+        metadata={"description": "Maximum number of entries."},
+    )
+
+
+class QueryStatSchema(BaseSchema):
+    """Schema describing the statistics of one statement fingerprint."""
+
+    fingerprint = String(metadata={"description": "The normalized SQL statement."})
+    calls = Integer()
+    rows = Integer(metadata={"description": "Rows reported by the driver."})
+    total_ms = Float()
+    mean_ms = Float()
+    p95_ms = Float()
+    max_ms = Float()
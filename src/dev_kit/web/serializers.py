@@ -0,0 +1,170 @@
+# src/dev_kit/web/serializers.py
+"""
+A compiled serialization path for the schemas generated by `create_crud_schemas`.
+
+Dumping with marshmallow walks every field of every item through several
+layers of indirection (field lookup, `get_value`, `serialize`, hooks). For a
+schema whose output fields all map straight to model columns that work is the
+same for every row, so `CompiledSerializer` does it once: it precomputes a
+tuple of `(output key, attribute getter, converter)` entries and builds each
+item with a single dict comprehension. The output is identical to the
+schema's.
+
+Responses are encoded with `orjson` when it is installed (the `fast` extra),
+falling back to the app's JSON provider otherwise.
+"""
+
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from flask import current_app
+from marshmallow import fields
+from sqlalchemy import inspect
+
+from dev_kit.database.repository import CursorPaginationResult, PaginationResult
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def _isoformat(value: Any) -> str:
+    return value.isoformat()
+
+
+# Output converters for the field types auto-generated from column types, matching
+# what each field's `_serialize` returns. None means the value is passed through.
+_CONVERTERS: Dict[type, Optional[Callable[[Any], Any]]] = {
+    fields.String: str,
+    fields.Integer: int,
+    fields.Float: float,
+    fields.Boolean: None,
+    fields.Raw: None,
+    fields.UUID: str,
+    fields.DateTime: _isoformat,
+    fields.Date: _isoformat,
+    fields.Time: _isoformat,
+}
+
+
+def _converter_for(field: fields.Field) -> Tuple[bool, Optional[Callable[[Any], Any]]]:
+    """Returns `(supported, converter)` for a schema field."""
+    field_type = type(field)
+    if field_type not in _CONVERTERS:
+        return False, None
+    if getattr(field, "as_string", False):
+        return False, None
+    if isinstance(field, (fields.DateTime, fields.Date, fields.Time)) and field.format not in (
+        None,
+        "iso",
+    ):
+        return False, None
+    return True, _CONVERTERS[field_type]
+
+
+class CompiledSerializer:
+    """
+    Dumps model instances (or projected rows) to plain dicts without marshmallow.
+
+    Build one with `for_schema`, which returns None for schemas it can't
+    reproduce exactly (custom or nested fields, non-ISO formats, dump hooks).
+
+    Args:
+        entries: `(output key, attribute name, converter)` per output field.
+    """
+
+    def __init__(self, entries: Sequence[Tuple[str, str, Optional[Callable[[Any], Any]]]]):
+        self.entries = tuple(entries)
+        self._getters = tuple(
+            (key, attrgetter(attribute), convert) for key, attribute, convert in self.entries
+        )
+
+    @classmethod
+    def for_schema(cls, schema, model: type) -> Optional["CompiledSerializer"]:
+        """
+        Compiles `schema` (a class or instance) for instances of `model`.
+
+        Returns None when the schema has dump hooks or an output field that
+        isn't a plain column field of `model`.
+        """
+        if isinstance(schema, type):
+            schema = schema()
+        hooks = getattr(schema, "_hooks", {})
+        if hooks.get("pre_dump") or hooks.get("post_dump"):
+            return None
+        column_keys = {attr.key for attr in inspect(model).column_attrs}
+        entries = []
+        for name, field in schema.dump_fields.items():
+            attribute = field.attribute or name
+            supported, convert = _converter_for(field)
+            if not supported or attribute not in column_keys:
+                return None
+            entries.append((field.data_key or name, attribute, convert))
+        return cls(entries)
+
+    def only(self, keys: Iterable[str]) -> "CompiledSerializer":
+        """A serializer restricted to `keys`, in this serializer's field order."""
+        wanted = set(keys)
+        return CompiledSerializer([entry for entry in self.entries if entry[0] in wanted])
+
+    def dump(self, obj: Any) -> Dict[str, Any]:
+        loaded = getattr(obj, "__dict__", None)
+        if loaded is None:
+            # Projected rows
+            return {
+                key: value if (value := get(obj)) is None or convert is None else convert(value)
+                for key, get, convert in self._getters
+            }
+        # ORM instances keep loaded column values in `__dict__`; reading them
+        # there skips the instrumented descriptors. Expired ones go through
+        # getattr so they are loaded as usual.
+        return {
+            key: value
+            if (value := loaded[attribute] if attribute in loaded else getattr(obj, attribute))
+            is None
+            or convert is None
+            else convert(value)
+            for key, attribute, convert in self.entries
+        }
+
+    def dump_many(self, objs: Iterable[Any]) -> List[Dict[str, Any]]:
+        dump = self.dump
+        return [dump(obj) for obj in objs]
+
+    def dump_page(self, result: Any) -> Dict[str, Any]:
+        """Dumps a pagination result like `create_pagination_schema`'s output schema."""
+        if isinstance(result, PaginationResult):
+            pagination = {
+                "total": result.total,
+                "total_is_exact": result.total_is_exact,
+                "page": result.page,
+                "per_page": result.per_page,
+                "total_pages": result.total_pages,
+                "has_next": result.has_next,
+                "has_prev": result.has_prev,
+            }
+        elif isinstance(result, CursorPaginationResult):
+            pagination = {
+                "per_page": result.per_page,
+                "has_next": result.has_next,
+                "has_prev": result.has_prev,
+                "next_cursor": result.next_cursor,
+                "prev_cursor": result.prev_cursor,
+            }
+        else:
+            raise TypeError(f"Cannot dump a page from {type(result).__name__}.")
+        return {"items": self.dump_many(result.items), "pagination": pagination}
+
+
+def json_bytes(data: Any) -> bytes:
+    """Encodes `data` as JSON with orjson when available, else the app's provider."""
+    if orjson is not None:
+        # The provider's hook covers the types orjson rejects (e.g. Decimal)
+        return orjson.dumps(data, default=current_app.json.default)
+    return current_app.json.dumps(data).encode("utf-8")
+
+
+def json_response(data: Any, status: int = 200):
+    """Builds a JSON response from already-serialized data."""
+    return current_app.response_class(json_bytes(data), status=status, mimetype="application/json")
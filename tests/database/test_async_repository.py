@@ -0,0 +1,115 @@
+# tests/database/test_async_repository.py
+import asyncio
+
+import pytest
+
+pytest.importorskip("greenlet")
+pytest.importorskip("aiosqlite")
+
+from flask import Flask  # noqa: E402
+from sqlalchemy.exc import IntegrityError  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+
+from dev_kit.async_services import AsyncBaseService  # noqa: E402
+from dev_kit.exceptions import BusinessLogicError, NotFoundError  # noqa: E402
+from dev_kit.modules.users.models import Base, Permission, Role, User  # noqa: E402
+
+
+@pytest.fixture
+def run(tmp_path):
+    """Runs a coroutine factory `fn(session)` against a fresh file-backed database."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}", poolclass=NullPool)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    def _run(fn):
+        async def main():
+            async with factory() as session:
+                return await fn(session)
+
+        with Flask(__name__).app_context():
+            return asyncio.run(main())
+
+    with Flask(__name__).app_context():
+        asyncio.run(setup())
+    yield _run
+    asyncio.run(engine.dispose())
+
+
+async def seed_roles(session, count=12):
+    service = AsyncBaseService(model=Role, db_session=session)
+    for i in range(count):
+        await service.create({"name": f"role{i:02d}", "display_name": f"Role {i}"})
+    await session.commit()
+    return service
+
+
+def test_paginate_matches_sync_semantics(run):
+    async def scenario(session):
+        service = await seed_roles(session)
+        page = await service.paginate(
+            page=2, per_page=5, filters={"name__like": "role"}, order_by=["-name"]
+        )
+        assert (page.total, page.total_pages, page.has_next, page.has_prev) == (12, 3, True, True)
+        assert [r.name for r in page.items] == [f"role{i:02d}" for i in range(6, 1, -1)]
+
+        uncounted = await service.paginate(per_page=5, count="none")
+        assert uncounted.total is None and uncounted.has_next
+        with pytest.raises(BusinessLogicError):
+            await service.paginate(count="guess")
+
+    run(scenario)
+
+
+def test_cursor_pagination_round_trips(run):
+    async def scenario(session):
+        service = await seed_roles(session)
+        first = await service.paginate_by_cursor(per_page=5, order_by=["name"])
+        second = await service.paginate_by_cursor(cursor=first.next_cursor, per_page=5, order_by=["name"])
+        assert [r.name for r in second.items] == [f"role{i:02d}" for i in range(5, 10)]
+        back = await service.paginate_by_cursor(cursor=second.prev_cursor, per_page=5, order_by=["name"])
+        assert [r.id for r in back.items] == [r.id for r in first.items]
+        with pytest.raises(BusinessLogicError):
+            await service.paginate_by_cursor(cursor=first.next_cursor, order_by=["-name"])
+
+    run(scenario)
+
+
+def test_writes_and_soft_deletes(run):
+    async def scenario(session):
+        service = AsyncBaseService(model=User, db_session=session)
+        user = await service.create({"username": "async-user", "password_hash": "x"})
+        assert user.id is not None and user.created_at is not None
+        updated = await service.update(user.uuid, {"username": "renamed"}, id_field="uuid")
+        assert updated.username == "renamed"
+
+        await service.delete(user.id)
+        assert await service.get_by_id(user.id) is None
+        assert (await service.get_by_id(user.id, include_soft_deleted=True)).deleted_at is not None
+        with pytest.raises(NotFoundError):
+            await service.delete(999)
+        with pytest.raises(IntegrityError):
+            await service.create({"username": "renamed", "password_hash": "x"})
+
+    run(scenario)
+
+
+def test_loading_and_streaming(run):
+    async def scenario(session):
+        role = Role(name="loaded", display_name="Loaded")
+        role.permissions = [Permission(name=f"p{i}") for i in range(3)]
+        session.add(role)
+        await session.commit()
+        session.expunge_all()
+
+        service = AsyncBaseService(model=Role, db_session=session)
+        loaded = await service.get_by_id(role.id, loading={"permissions": "selectin"})
+        assert len(loaded.permissions) == 3
+        streamed = [r.name async for r in service.stream(order_by=["-name"], batch_size=1)]
+        assert streamed == ["loaded"]
+
+    run(scenario)
@@ -0,0 +1,71 @@
+# tests/database/test_cursor_pagination.py
+import pytest
+
+from dev_kit.database.repository import BaseRepository, decode_cursor, encode_cursor
+from dev_kit.exceptions import BusinessLogicError
+from dev_kit.modules.users.models import User
+
+
+@pytest.fixture
+def user_repo(db_session):
+    repo = BaseRepository(model=User, db_session=db_session)
+    for i in range(25):
+        repo.create({"username": f"user{i:02d}", "password_hash": "x", "is_active": i % 2 == 0})
+    db_session.flush()
+    return repo
+
+
+def _walk_forward(repo, **kwargs):
+    seen, cursor = [], None
+    while True:
+        result = repo.paginate_by_cursor(cursor=cursor, per_page=10, **kwargs)
+        seen.extend(u.username for u in result.items)
+        if not result.has_next:
+            return seen
+        cursor = result.next_cursor
+
+
+def test_cursor_walk_matches_offset_ordering(user_repo):
+    expected = [u.username for u in user_repo.paginate(per_page=100, order_by=["-username"]).items]
+    assert _walk_forward(user_repo, order_by=["-username"]) == expected
+
+
+def test_cursor_with_mixed_directions_and_filters(user_repo):
+    order_by = ["-is_active", "username"]
+    expected = [
+        u.username
+        for u in user_repo.paginate(per_page=100, order_by=order_by, filters={"username__like": "user1"}).items
+    ]
+    walked = _walk_forward(user_repo, order_by=order_by, filters={"username__like": "user1"})
+    assert walked == expected
+
+
+def test_prev_cursor_returns_previous_page(user_repo):
+    first = user_repo.paginate_by_cursor(per_page=10, order_by=["username"])
+    assert first.has_prev is False and first.prev_cursor is None
+    second = user_repo.paginate_by_cursor(cursor=first.next_cursor, per_page=10, order_by=["username"])
+    assert second.has_prev is True
+
+    back = user_repo.paginate_by_cursor(cursor=second.prev_cursor, per_page=10, order_by=["username"])
+    assert [u.username for u in back.items] == [u.username for u in first.items]
+    assert back.has_prev is False
+    assert back.has_next is True
+
+
+def test_cursor_roundtrips_datetimes():
+    import datetime
+
+    when = datetime.datetime(2024, 1, 2, 3, 4, 5)
+    spec, values, backwards = decode_cursor(encode_cursor(["created_at", "id"], [when, 7], True))
+    assert spec == ["created_at", "id"]
+    assert values == [when, 7]
+    assert backwards is True
+
+
+def test_invalid_or_mismatched_cursor_raises(user_repo):
+    with pytest.raises(BusinessLogicError):
+        user_repo.paginate_by_cursor(cursor="not-a-cursor!!")
+
+    first = user_repo.paginate_by_cursor(per_page=5, order_by=["username"])
+    with pytest.raises(BusinessLogicError):
+        user_repo.paginate_by_cursor(cursor=first.next_cursor, per_page=5, order_by=["-username"])
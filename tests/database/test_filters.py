@@ -0,0 +1,48 @@
+# tests/database/test_filters.py
+import datetime
+
+import pytest
+
+from dev_kit.database.filters import compile_filter_plan
+from dev_kit.database.repository import BaseRepository
+from dev_kit.exceptions import BusinessLogicError
+from dev_kit.modules.users.models import User
+
+
+def test_plan_is_compiled_once_per_model():
+    assert compile_filter_plan(User) is compile_filter_plan(User)
+    plan = compile_filter_plan(User)
+    assert "username" in plan.clauses
+    assert "is_active__in" in plan.clauses
+    assert "roles__eq" not in plan.clauses  # relationships are not filterable
+
+
+def test_unknown_keys_are_ignored_and_unknown_operators_reported():
+    reported = []
+    clauses = compile_filter_plan(User).build(
+        {"no_such_field": 1, "username__between": "a", "username": "x"}, reported.append
+    )
+    assert len(clauses) == 1
+    assert reported == ["between"]
+
+
+def test_string_values_are_coerced_to_column_types(db_session):
+    repo = BaseRepository(model=User, db_session=db_session)
+    repo.create({"username": "filter-active", "password_hash": "x", "is_active": True})
+    repo.create({"username": "filter-inactive", "password_hash": "x", "is_active": False})
+    db_session.flush()
+
+    result = repo.paginate(filters={"username__like": "filter-", "is_active": "false"})
+    assert [u.username for u in result.items] == ["filter-inactive"]
+
+    ids = ",".join(str(u.id) for u in repo.paginate(filters={"username__like": "filter-"}).items)
+    assert repo.paginate(filters={"id__in": ids, "username__like": "filter-"}).total == 2
+
+    later = (datetime.datetime.now() + datetime.timedelta(days=1)).isoformat()
+    assert repo.paginate(filters={"username__like": "filter-", "created_at__lt": later}).total == 2
+
+
+def test_invalid_value_raises_business_error(db_session):
+    repo = BaseRepository(model=User, db_session=db_session)
+    with pytest.raises(BusinessLogicError):
+        repo.paginate(filters={"id__gte": "not-a-number"})
@@ -0,0 +1,81 @@
+# tests/database/test_identity_index.py
+import pytest
+from sqlalchemy import event
+
+from dev_kit.database.repository import BaseRepository, unique_attributes
+from dev_kit.modules.users.models import Role, User
+
+
+@pytest.fixture
+def users(db_session):
+    repo = BaseRepository(model=User, db_session=db_session)
+    created = [repo.create({"username": f"idx{i}", "password_hash": "x"}) for i in range(3)]
+    db_session.flush()
+    return repo, created
+
+
+@pytest.fixture
+def selects(db_session):
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            seen.append(statement)
+
+    connection = db_session.connection()
+    event.listen(connection, "before_cursor_execute", record)
+    yield seen
+    event.remove(connection, "before_cursor_execute", record)
+
+
+def test_unique_attributes():
+    assert set(unique_attributes(User)) == {"uuid", "username"}
+    assert unique_attributes(Role) == ("name",)
+
+
+def test_repeated_uuid_lookups_hit_the_session(db_session, users, selects):
+    repo, created = users
+    uuid = created[0].uuid
+    db_session.expire_all()  # forget everything the flush left loaded
+
+    first = repo.get_by_uuid(uuid)
+    assert len(selects) == 1
+    assert repo.get_by_uuid(uuid) is first
+    assert repo.get_by_id(first.id) is first
+    assert repo.get_by_unique("username", "idx0") is first
+    assert len(selects) == 1
+
+
+def test_expired_or_changed_entries_are_not_trusted(db_session, users, selects):
+    repo, created = users
+    user = repo.get_by_uuid(created[1].uuid)
+    user.username = "renamed"
+    assert repo.get_by_unique("username", "idx1") is None
+
+    db_session.expire(user)
+    assert repo.get_by_uuid(created[1].uuid) is user
+    assert len(selects) >= 2
+
+
+def test_get_many_by_uuid_loads_only_misses(db_session, users, selects):
+    repo, created = users
+    uuids = [u.uuid for u in created]
+    db_session.expire_all()
+    repo.get_by_uuid(uuids[1])
+    selects.clear()
+
+    found = repo.get_many_by_uuid([uuids[2], uuids[1], "missing", uuids[0]])
+    assert [u.uuid for u in found] == [uuids[2], uuids[1], uuids[0]]
+    assert len(selects) == 1
+
+
+def test_soft_deleted_rows_are_hidden_unless_requested(db_session, users):
+    repo, created = users
+    user = created[2]
+    repo.delete(user, soft=True)
+    db_session.flush()
+
+    assert repo.get_by_id(user.id) is None
+    assert repo.get_by_uuid(user.uuid) is None
+    assert repo.get_by_uuid(user.uuid, include_soft_deleted=True) is user
+    assert repo.get_many_by_uuid([user.uuid]) == []
@@ -0,0 +1,112 @@
+# tests/database/test_loading.py
+import uuid
+
+import pytest
+from apiflask.fields import List, Method, Nested
+from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+
+from dev_kit.database.loading import LoadingSpec, loading_for_schema, spec_from_schema
+from dev_kit.database.repository import BaseRepository
+from dev_kit.modules.users.models import Permission, Role, User, UserRoleAssociation
+
+
+class PermissionOut(SQLAlchemyAutoSchema):
+    class Meta:
+        model = Permission
+
+
+class RoleOut(SQLAlchemyAutoSchema):
+    class Meta:
+        model = Role
+
+    permissions = List(Nested(PermissionOut))
+
+
+class UserOut(SQLAlchemyAutoSchema):
+    class Meta:
+        model = User
+        exclude = ("password_hash",)
+
+    roles = List(Nested(RoleOut))
+
+
+@pytest.fixture
+def tag(db_session):
+    """Ten users, each holding two roles with two permissions each."""
+    tag = uuid.uuid4().hex[:8]
+    roles = []
+    for i in range(2):
+        role = Role(name=f"{tag}-r{i}", display_name=str(i))
+        role.permissions = [Permission(name=f"{tag}:r{i}p{j}") for j in range(2)]
+        roles.append(role)
+    users = [User(username=f"{tag}-u{i}", password_hash="x") for i in range(10)]
+    db_session.add_all([*roles, *users])
+    db_session.flush()
+    db_session.add_all(
+        UserRoleAssociation(user_id=u.id, role_id=r.id) for u in users for r in roles
+    )
+    db_session.flush()
+    db_session.expire_all()
+    return tag
+
+
+@pytest.fixture
+def selects(db_session):
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            seen.append(statement)
+
+    connection = db_session.connection()
+    event.listen(connection, "before_cursor_execute", record)
+    yield seen
+    event.remove(connection, "before_cursor_execute", record)
+
+
+def test_spec_from_schema_follows_nested_fields():
+    spec, opaque = spec_from_schema(UserOut, User)
+    assert spec == {"roles": "selectin", "roles.permissions": "selectin"}
+    assert opaque is False
+
+
+def test_method_fields_disable_raise_default():
+    class WithMethod(UserOut):
+        extra = Method("get_extra")
+
+        def get_extra(self, obj):
+            return None
+
+    assert loading_for_schema(WithMethod, User).default is None
+    assert loading_for_schema(UserOut, User).default == "raise"
+
+
+def test_invalid_specs_are_rejected():
+    with pytest.raises(ValueError):
+        LoadingSpec(User, {"nope": "selectin"})
+    with pytest.raises(ValueError):
+        LoadingSpec(User, {"roles": "eager"})
+
+
+def test_page_serializes_in_a_fixed_number_of_queries(db_session, tag, selects):
+    repo = BaseRepository(model=User, db_session=db_session)
+    page = repo.paginate(
+        per_page=10,
+        filters={"username__like": f"{tag}-%"},
+        loading=loading_for_schema(UserOut, User),
+    )
+    dumped = UserOut(many=True).dump(page.items)
+    assert len(dumped) == 10
+    assert all(len(u["roles"]) == 2 and len(u["roles"][0]["permissions"]) == 2 for u in dumped)
+    # count, page, roles, permissions
+    assert len(selects) == 4
+
+
+def test_unlisted_relationships_raise(db_session, tag):
+    repo = BaseRepository(model=User, db_session=db_session)
+    user = repo.get_by_unique("username", f"{tag}-u0", loading={"roles": "joined"})
+    assert len(user.roles) == 2
+    with pytest.raises(InvalidRequestError):
+        user.assigned_roles_details
@@ -3,7 +3,7 @@
 from sqlalchemy import create_engine, String, Column
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-from dev_kit.database.mixins import IDMixin, UUIDMixin, TimestampMixin, SoftDeleteMixin
+from dev_kit.database.mixins import IDMixin, UUIDMixin, TimestampMixin, SoftDeleteMixin, VersionMixin
 
 # --- Test Setup ---
 # 1. Create an in-memory SQLite database for testing
@@ -18,6 +18,11 @@ class SampleEntity(Base, IDMixin, UUIDMixin, TimestampMixin, SoftDeleteMixin):
     name = Column(String, default="test")
 
 
+class VersionedEntity(Base, IDMixin, TimestampMixin, VersionMixin):
+    __tablename__ = "versioned_entities"
+    name = Column(String, default="test")
+
+
 # 3. Create the table in the in-memory database
 Base.metadata.create_all(engine)
 # --- End Test Setup ---
@@ -53,3 +58,17 @@ def test_mixins_populate_fields_on_create():
 
     # Clean up the session
     session.close()
+
+
+def test_version_mixin_counts_updates():
+    session = Session()
+    entity = VersionedEntity()
+    session.add(entity)
+    session.commit()
+    assert entity.version == 1
+
+    for name in ("a", "b"):
+        entity.name = name
+        session.commit()
+    assert entity.version == 3
+    session.close()
@@ -0,0 +1,86 @@
+# tests/database/test_paginate_counts.py
+import time
+import uuid
+
+import pytest
+
+from dev_kit.exceptions import BusinessLogicError
+from dev_kit.modules.users.models import User
+
+
+@pytest.fixture
+def prefix():
+    # Service writes go through savepoints that pysqlite releases eagerly, so
+    # each test scopes its rows with a unique prefix instead of relying on rollback.
+    return f"cnt-{uuid.uuid4().hex[:8]}-"
+
+
+@pytest.fixture
+def seeded_service(user_service, prefix):
+    for i in range(7):
+        user_service.create({"username": f"{prefix}{i}", "password_hash": "x"})
+    return user_service
+
+
+def test_exact_count_is_default(seeded_service, prefix):
+    result = seeded_service.paginate(per_page=3, filters={"username__like": prefix})
+    assert result.total == 7
+    assert result.total_pages == 3
+    assert result.total_is_exact is True
+    assert result.has_next is True
+
+
+def test_none_strategy_skips_count_and_probes_next_page(seeded_service, prefix):
+    filters = {"username__like": prefix}
+    first = seeded_service.paginate(per_page=3, count="none", filters=filters)
+    assert first.total is None and first.total_pages is None
+    assert first.total_is_exact is False
+    assert first.has_next is True
+
+    last = seeded_service.paginate(page=3, per_page=3, count="none", filters=filters)
+    assert len(last.items) == 1
+    assert last.has_next is False
+
+
+def test_estimated_falls_back_to_exact_on_sqlite(seeded_service, prefix):
+    result = seeded_service.paginate(count="estimated", filters={"username__like": prefix})
+    assert result.total == 7
+    assert result.total_is_exact is True
+
+
+def test_cached_count_is_reused_and_invalidated_by_writes(db_session, seeded_service, prefix):
+    filters = {"username__like": prefix}
+    fresh = seeded_service.paginate(count="cached", filters=filters)
+    assert fresh.total == 7 and fresh.total_is_exact is True
+
+    # A write that bypasses the service is not seen until the entry expires...
+    db_session.add(User(username=f"{prefix}sneaky", password_hash="x"))
+    db_session.flush()
+    hit = seeded_service.paginate(count="cached", filters=filters)
+    assert hit.total == 7 and hit.total_is_exact is False
+
+    # ...but a write through the service drops the memoized totals.
+    seeded_service.create({"username": f"{prefix}late", "password_hash": "x"})
+    assert seeded_service.paginate(count="cached", filters=filters).total == 9
+
+
+def test_cached_count_is_dropped_again_when_the_write_commits(db_session, seeded_service, prefix):
+    filters = {"username__like": prefix}
+    seeded_service.create({"username": f"{prefix}late", "password_hash": "x"})
+    # A concurrent reader, not seeing the uncommitted row yet, caches the old total
+    key = seeded_service.repo._count_cache_key(dict(filters), False)
+    seeded_service.repo._count_cache[key] = (time.monotonic() + 60, 7)
+    assert seeded_service.paginate(count="cached", filters=filters).total == 7
+
+    db_session.commit()
+    assert seeded_service.paginate(count="cached", filters=filters).total == 8
+
+
+def test_cached_count_is_keyed_by_filters(seeded_service, prefix):
+    assert seeded_service.paginate(count="cached", filters={"username__like": f"{prefix}1"}).total == 1
+    assert seeded_service.paginate(count="cached", filters={"username__like": prefix}).total == 7
+
+
+def test_unknown_count_strategy_is_rejected(seeded_service):
+    with pytest.raises(BusinessLogicError):
+        seeded_service.paginate(count="guess")
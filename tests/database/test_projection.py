@@ -0,0 +1,68 @@
+# tests/database/test_projection.py
+import uuid
+
+import pytest
+
+from dev_kit.database.repository import BaseRepository
+from dev_kit.exceptions import BusinessLogicError
+from dev_kit.modules.users.models import User
+
+
+@pytest.fixture
+def repo(db_session):
+    repo = BaseRepository(model=User, db_session=db_session)
+    tag = uuid.uuid4().hex[:8]
+    for i in range(5):
+        repo.create({"username": f"{tag}-{i}", "password_hash": "x"})
+    db_session.flush()
+    db_session.expunge_all()
+    return repo, tag
+
+
+def test_paginate_returns_rows_of_the_selected_columns(repo):
+    repo, tag = repo
+    page = repo.paginate(
+        per_page=3, filters={"username__like": f"{tag}-%"}, order_by=["username"], columns=["username"]
+    )
+    assert page.total == 5
+    assert [row.username for row in page.items] == [f"{tag}-{i}" for i in range(3)]
+    assert page.items[0]._fields == ("username",)
+
+
+def test_cursor_pagination_selects_the_sort_keys_too(repo):
+    repo, tag = repo
+    page = repo.paginate_by_cursor(
+        per_page=2, filters={"username__like": f"{tag}-%"}, columns=["uuid"]
+    )
+    assert page.items[0]._fields == ("uuid", "id")
+    following = repo.paginate_by_cursor(
+        cursor=page.next_cursor, per_page=2, filters={"username__like": f"{tag}-%"}, columns=["uuid"]
+    )
+    assert following.items[0].id > page.items[-1].id
+
+
+def test_single_record_projection(repo):
+    repo, tag = repo
+    row = repo.get_by_unique("username", f"{tag}-1", columns=["uuid", "username"])
+    assert row.username == f"{tag}-1"
+    assert not isinstance(row, User)
+    entity = repo.get_by_unique("username", f"{tag}-1")
+    # Already in the session: the entity itself is returned
+    assert repo.get_by_id(entity.id, columns=["username"]) is entity
+
+
+def test_unknown_columns_are_rejected(repo):
+    repo, _ = repo
+    with pytest.raises(BusinessLogicError):
+        repo.paginate(columns=["roles"])
+
+
+def test_stream_yields_every_match_in_batches(repo):
+    repo, tag = repo
+    streamed = list(
+        repo.stream(
+            filters={"username__like": f"{tag}-%"}, order_by=["-username"], columns=["username"], batch_size=2
+        )
+    )
+    assert [row.username for row in streamed] == [f"{tag}-{i}" for i in reversed(range(5))]
+    assert isinstance(next(repo.stream(filters={"username__like": f"{tag}-%"})), User)
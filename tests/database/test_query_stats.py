@@ -0,0 +1,138 @@
+# tests/database/test_query_stats.py
+import logging
+
+import pytest
+from sqlalchemy import create_engine, select, text, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from dev_kit.database import query_stats
+from dev_kit.database.query_stats import QueryStats, fingerprint, parameter_shapes
+from dev_kit.database.repository import BaseRepository
+from dev_kit.modules.users.models import Base, Role
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with sessionmaker(engine)() as session:
+        session.add_all(Role(name=f"role{i}", display_name=f"Role {i}") for i in range(5))
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "statement, expected",
+    [
+        ("SELECT * FROM t WHERE a = 1 AND b = 'x''y'", "SELECT * FROM t WHERE a = ? AND b = ?"),
+        ("SELECT * FROM t WHERE id IN (?, ?, ?)", "SELECT * FROM t WHERE id IN (...)"),
+        ("SELECT * FROM t WHERE id IN (%(id_1)s, %(id_2)s)", "SELECT * FROM t WHERE id IN (...)"),
+        ("SELECT a::text FROM t_1 WHERE b = :b\n  LIMIT $1", "SELECT a::text FROM t_1 WHERE b = ? LIMIT ?"),
+        ("INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)", "INSERT INTO t (a, b) VALUES (?, ?), ..."),
+    ],
+)
+def test_fingerprint(statement, expected):
+    assert fingerprint(statement) == expected
+
+
+def test_parameter_shapes_hide_values():
+    assert parameter_shapes({"name": "secret", "ids": [1, 2]}) == {"name": "str", "ids": "list[2]"}
+    assert parameter_shapes(("secret", 3)) == ["str", "int"]
+    assert parameter_shapes([(1,), (2,)], executemany=True) == "2 x ['int']"
+
+
+def test_aggregates_by_fingerprint(engine):
+    stats = QueryStats(slow_threshold=None)
+    stats.attach(engine)
+    repo = BaseRepository(model=Role, db_session=sessionmaker(engine)())
+    for id_ in range(1, 4):
+        repo._db_session.expunge_all()
+        repo.get_by_id(id_)
+    repo.paginate(filters={"name": "role1"})
+    repo.paginate(filters={"name": "role2"})
+
+    entries = {row["fingerprint"]: row for row in stats.snapshot(sort="calls")}
+    by_pk = next(row for key, row in entries.items() if "WHERE roles.id = ?" in key)
+    assert by_pk["calls"] == 3
+    assert by_pk["p95_ms"] <= by_pk["max_ms"]
+    assert by_pk["mean_ms"] == pytest.approx(by_pk["total_ms"] / 3)
+    assert sum(1 for key in entries if "roles.name = ?" in key) == 2  # Count and page
+
+    with engine.begin() as conn:
+        conn.execute(update(Role).values(description="x"))
+    assert next(row for key, row in entries_of(stats) if key.startswith("UPDATE roles"))["rows"] == 5
+
+    stats.detach(engine)
+    repo.get_by_id(4)
+    assert stats.snapshot(sort="calls")[0]["calls"] == 3
+
+
+def test_failed_statements_leave_no_pending_start(engine):
+    stats = QueryStats(slow_threshold=None)
+    stats.attach(engine)
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+        assert not conn.info.get(stats._starts_key)
+        conn.execute(select(Role.id)).all()
+        assert not conn.info.get(stats._starts_key)
+    assert [row["fingerprint"] for row in stats.snapshot()] == ["SELECT roles.id FROM roles"]
+
+
+def entries_of(stats):
+    return [(row["fingerprint"], row) for row in stats.snapshot()]
+
+
+def test_table_is_bounded():
+    stats = QueryStats(max_entries=2)
+    stats.record("SELECT a FROM t", 0.1)
+    stats.record("SELECT a FROM t", 0.1)
+    stats.record("SELECT b FROM t", 0.2)
+    stats.record("SELECT c FROM t", 0.3)
+    assert sorted(row["fingerprint"] for row in stats.snapshot()) == ["SELECT a FROM t", "SELECT c FROM t"]
+    assert stats.snapshot(sort="total", limit=1)[0]["fingerprint"] == "SELECT c FROM t"
+    with pytest.raises(ValueError):
+        stats.snapshot(sort="bogus")
+    stats.reset()
+    assert stats.snapshot() == []
+
+
+def test_slow_queries_are_logged_with_their_plan(engine, caplog):
+    stats = QueryStats(slow_threshold=0)
+    stats.attach(engine)
+    with caplog.at_level(logging.WARNING, logger="dev_kit.database.query_stats"):
+        with engine.connect() as conn:
+            conn.execute(select(Role).where(Role.name == "secret-name")).all()
+    message = caplog.records[-1].getMessage()
+    assert "Slow query" in message
+    assert "WHERE roles.name = ?" in message
+    assert "['str'" in message and "secret-name" not in message
+    assert "SEARCH roles USING INDEX" in message or "SCAN roles" in message
+
+
+def test_plan_capture_leaves_the_transaction_usable(engine, caplog, monkeypatch):
+    stats = QueryStats(slow_threshold=0)
+    stats.attach(engine)
+    # An EXPLAIN the database rejects is rolled back to its savepoint
+    monkeypatch.setitem(query_stats._EXPLAIN_PREFIXES, "sqlite", "EXPLAIN NOT SQL ")
+    with caplog.at_level(logging.WARNING, logger="dev_kit.database.query_stats"):
+        with engine.connect() as conn:
+            conn.execute(update(Role).where(Role.id == 1).values(description="kept"))
+            conn.execute(select(Role.id)).all()
+            assert "(not available)" in caplog.records[-1].getMessage()
+            conn.commit()
+    with engine.connect() as conn:
+        assert conn.execute(select(Role.description).where(Role.id == 1)).scalar() == "kept"
+
+
+def test_streamed_results_are_not_explained(engine, caplog):
+    stats = QueryStats(slow_threshold=0)
+    stats.attach(engine)
+    with caplog.at_level(logging.WARNING, logger="dev_kit.database.query_stats"):
+        with engine.connect() as conn:
+            result = conn.execution_options(stream_results=True).execute(select(Role.id))
+            assert "(not available)" in caplog.records[-1].getMessage()
+            assert len(result.all()) == 5
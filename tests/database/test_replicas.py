@@ -0,0 +1,140 @@
+# tests/database/test_replicas.py
+import pytest
+from apiflask import APIBlueprint, APIFlask
+from flask_jwt_extended import JWTManager, create_access_token
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from dev_kit.database import replicas
+from dev_kit.database.extensions import db
+from dev_kit.database.replicas import ReplicaSession, init_replica_routing, replica_reads
+from dev_kit.modules.users.models import Base, Role
+from dev_kit.services import BaseService
+from dev_kit.web.routing import register_crud_routes
+from dev_kit.web.schemas import create_crud_schemas
+
+
+def _seed(engine, name):
+    Base.metadata.create_all(engine)
+    with sessionmaker(engine)() as session:
+        session.add(Role(name=name, display_name=name))
+        session.commit()
+
+
+@pytest.fixture
+def engines(tmp_path):
+    # The same row under a different name on each side tells where a read went
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    _seed(primary, "primary")
+    _seed(replica, "replica")
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+@pytest.fixture
+def make_session(engines):
+    primary, replica = engines
+
+    def _make(**kwargs):
+        return sessionmaker(primary, class_=ReplicaSession, replica_bind=replica, **kwargs)()
+
+    return _make
+
+
+def test_repository_reads_use_the_replica(make_session):
+    session = make_session()
+    service = BaseService(model=Role, db_session=session)
+
+    assert service.get_by_id(1).name == "replica"
+    assert [r.name for r in service.paginate().items] == ["replica"]
+    # Queries outside the repository stay on the primary
+    session.expunge_all()
+    assert session.scalars(select(Role.name)).one() == "primary"
+
+
+def test_writes_use_the_primary_and_make_reads_sticky(make_session, engines):
+    session = make_session()
+    service = BaseService(model=Role, db_session=session)
+
+    # Found on the primary, although the replica has the row under another name
+    updated = service.update(1, {"display_name": "Updated"})
+    assert updated.name == "primary"
+    session.commit()
+    session.expunge_all()
+    assert service.get_by_id(1).display_name == "Updated"
+    assert replicas.has_written(session)
+
+    session.close()
+    assert not replicas.has_written(session)
+    assert service.get_by_id(1).name == "replica"
+
+
+def test_lag_window_keeps_reads_on_the_primary_after_close(make_session, monkeypatch):
+    session = make_session(replica_lag=5)
+    service = BaseService(model=Role, db_session=session)
+    service.create({"name": "new", "display_name": "New"})
+    session.commit()
+    session.close()
+
+    now = replicas.time.time()
+    assert service.paginate().total == 2
+    session.close()
+
+    monkeypatch.setattr(replicas.time, "time", lambda: now + 10)
+    assert service.paginate().total == 1
+
+
+def test_primary_reads_win_over_replica_reads(make_session):
+    session = make_session()
+    with replicas.primary_reads(session), replica_reads(session):
+        assert session.scalars(select(Role.name)).one() == "primary"
+    with replica_reads(session):
+        assert session.scalars(select(Role.name)).one() == "replica"
+        assert session.scalars(select(Role.name).with_for_update()).one() == "primary"
+
+
+@pytest.fixture
+def app(engines, tmp_path):
+    app = APIFlask(__name__)
+    app.config["TESTING"] = True
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'primary.db'}"
+    app.config["SQLALCHEMY_BINDS"] = {"replica": f"sqlite:///{tmp_path / 'replica.db'}"}
+    app.config["REPLICA_LAG_SECONDS"] = 5
+    app.config["JWT_SECRET_KEY"] = "replica-routes-secret"
+    db.init_app(app)
+    JWTManager(app)
+    init_replica_routing(app, db.session)
+
+    bp = APIBlueprint("items", __name__, url_prefix="/items")
+    service = BaseService(model=Role, db_session=db.session)
+    register_crud_routes(
+        bp=bp, service=service, schemas=create_crud_schemas(Role), entity_name="role", id_field="id"
+    )
+
+    @bp.after_request
+    def commit(response):
+        db.session.commit()
+        return response
+
+    app.register_blueprint(bp)
+    return app
+
+
+def test_get_routes_read_from_the_replica_until_the_client_writes(app):
+    client = app.test_client()
+    with app.app_context():
+        token = create_access_token(identity="tester", additional_claims={"is_super_admin": True})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get("/items/1", headers=headers).get_json()["name"] == "replica"
+
+    resp = client.post("/items/", json={"name": "new", "display_name": "New"}, headers=headers)
+    assert resp.status_code == 201
+    assert replicas.REPLICA_COOKIE in resp.headers["Set-Cookie"]
+
+    # The cookie keeps this client on the primary; others still use the replica
+    assert client.get("/items/", headers=headers).get_json()["pagination"]["total"] == 2
+    other = app.test_client()
+    assert other.get("/items/", headers=headers).get_json()["pagination"]["total"] == 1
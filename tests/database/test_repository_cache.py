@@ -0,0 +1,110 @@
+# tests/database/test_repository_cache.py
+import time
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+from dev_kit.database.cache import MISS, LRUTTLCache, ModelCache
+from dev_kit.modules.users.models import Role
+from dev_kit.services import BaseService
+
+
+@pytest.fixture
+def selects(db_session):
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            seen.append(statement)
+
+    connection = db_session.connection()
+    event.listen(connection, "before_cursor_execute", record)
+    yield seen
+    event.remove(connection, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def cached_roles(db_session):
+    service = BaseService(model=Role, db_session=db_session, cache=LRUTTLCache())
+    prefix = uuid.uuid4().hex[:8]
+    roles = [service.repo.create({"name": f"{prefix}-{i}", "display_name": str(i)}) for i in range(3)]
+    db_session.flush()
+    db_session.expunge_all()
+    return service, prefix, [r.id for r in roles]
+
+
+def test_lru_ttl_cache_counts_hits_misses_and_evictions():
+    cache = LRUTTLCache(max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts "b", the least recently used
+    assert cache.get("b") is MISS
+    cache.set("d", 4, ttl=0.001)
+    time.sleep(0.01)
+    assert cache.get("d") is MISS
+    assert cache.stats.as_dict() == {"hits": 1, "misses": 2, "evictions": 2}
+
+
+def test_model_cache_invalidation_drops_namespace_only():
+    backend = LRUTTLCache()
+    roles, users = ModelCache(backend, "roles"), ModelCache(backend, "users")
+    roles.set("k", 1)
+    users.set("k", 2)
+    roles.invalidate()
+    assert roles.get("k") is MISS
+    assert users.get("k") == 2
+    assert roles.stats.misses == 1 and users.stats.hits == 1
+
+
+def test_get_by_id_is_served_from_cache_in_a_new_session_state(db_session, cached_roles, selects):
+    service, prefix, ids = cached_roles
+    first = service.get_by_id(ids[0])
+    assert len(selects) == 1
+
+    db_session.expunge_all()  # what a new request would see
+    again = service.get_by_id(ids[0])
+    assert len(selects) == 1
+    assert again is not first and again.name == f"{prefix}-0"
+    assert again in db_session
+    assert service.repo.cache.stats.hits == 1
+
+
+def test_paginate_pages_are_cached_per_arguments(db_session, cached_roles, selects):
+    service, prefix, _ = cached_roles
+    filters = {"name__like": prefix}
+    page = service.paginate(per_page=2, filters=filters, order_by=["name"])
+    issued = len(selects)
+    db_session.expunge_all()
+
+    again = service.paginate(per_page=2, filters=dict(filters), order_by=["name"])
+    assert len(selects) == issued
+    assert [r.name for r in again.items] == [r.name for r in page.items]
+    assert again.total == 3
+
+    service.paginate(page=2, per_page=2, filters=filters, order_by=["name"])
+    assert len(selects) > issued
+
+
+def test_service_writes_invalidate_and_skip_populating_until_commit(db_session, cached_roles):
+    service, prefix, ids = cached_roles
+    service.get_by_id(ids[1])
+    service.update(ids[1], {"display_name": "changed"})
+    db_session.expunge_all()
+
+    # Read inside the uncommitted transaction: correct, but not cached.
+    assert service.get_by_id(ids[1]).display_name == "changed"
+    assert service.repo.cache.get(("id", ids[1])) is MISS
+
+    db_session.commit()
+    service.get_by_id(ids[1])
+    assert service.repo.cache.get(("id", ids[1])) is not MISS
+
+
+def test_rollback_invalidates(db_session, cached_roles):
+    service, prefix, ids = cached_roles
+    service.create({"name": f"{prefix}-new", "display_name": "n"})
+    generation = service.repo.cache._generation()
+    db_session.rollback()
+    assert service.repo.cache._generation() != generation
@@ -0,0 +1,78 @@
+import pytest
+from apiflask import APIFlask
+from flask_jwt_extended import JWTManager, decode_token
+
+from dev_kit.database.extensions import db
+from dev_kit.modules.users.models import Base, User, Role, Permission, UserRoleAssociation
+from dev_kit.modules.users.routes import auth_bp, roles_bp
+from dev_kit.modules.users.services import permission_service
+from dev_kit.web.permissions import PERMISSION_BITS_CLAIM, permission_bit_registry
+
+
+@pytest.fixture
+def app():
+    app = APIFlask(__name__)
+    app.config["TESTING"] = True
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["JWT_SECRET_KEY"] = "test-secret"
+    app.config["JWT_COMPACT_PERMISSIONS"] = True
+
+    db.init_app(app)
+    JWTManager(app)
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(roles_bp)
+
+    with app.app_context():
+        Base.metadata.create_all(db.engine)
+        role = Role(name="reader", display_name="Reader")
+        role.permissions.append(Permission(name="read_roles:user"))
+        user = User(username="dora")
+        user.set_password("pw")
+        db.session.add_all([user, role])
+        db.session.flush()
+        db.session.add(UserRoleAssociation(user_id=user.id, role_id=role.id))
+        db.session.commit()
+        # Other tests load the shared registry from their own databases
+        permission_bit_registry.invalidate()
+        yield app
+    permission_bit_registry.invalidate()
+
+
+def test_compact_token_grants_by_bit(app):
+    client = app.test_client()
+    data = client.post("/auth/login", json={"username": "dora", "password": "pw"}).get_json()
+    claims = decode_token(data["access_token"])
+    assert "permissions" not in claims
+    assert claims[PERMISSION_BITS_CLAIM].startswith("1.")
+    headers = {"Authorization": f"Bearer {data['access_token']}"}
+    user_uuid = data["user"]["uuid"]
+
+    assert client.get(f"/roles/users/{user_uuid}", headers=headers).status_code == 200
+    assert client.get("/roles/1/permissions", headers=headers).status_code == 403
+
+    # Permissions added after the token was minted don't change its meaning
+    db.session.add(Permission(name="export:user"))
+    db.session.commit()
+    permission_bit_registry.invalidate()
+    assert client.get(f"/roles/users/{user_uuid}", headers=headers).status_code == 200
+    assert permission_bit_registry.version == 2
+
+
+def test_deleted_permission_bit_is_never_granted_again(app):
+    role = db.session.get(Role, 1)
+    role.permissions.append(Permission(name="retired:user"))
+    db.session.commit()
+    permission_bit_registry.invalidate()
+    client = app.test_client()
+    data = client.post("/auth/login", json={"username": "dora", "password": "pw"}).get_json()
+    headers = {"Authorization": f"Bearer {data['access_token']}"}
+    assert decode_token(data["access_token"])[PERMISSION_BITS_CLAIM].startswith("2.")
+
+    permission_service.delete(2)
+    db.session.add(Permission(name="read_permissions:role"))
+    db.session.commit()
+    assert db.session.query(Permission.id).filter_by(name="read_permissions:role").scalar() == 3
+
+    # The token predates the deletion: its bits no longer mean anything
+    assert client.get("/roles/1/permissions", headers=headers).status_code == 403
+    assert client.get(f"/roles/users/{data['user']['uuid']}", headers=headers).status_code == 403
@@ -0,0 +1,154 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from dev_kit.exceptions import ServiceUnavailableError
+from dev_kit.modules.users import hashing
+from dev_kit.modules.users.hashing import (
+    HashingExecutor,
+    HashingPolicy,
+    configure_hashing,
+    get_hashing_executor,
+    get_hashing_policy,
+    measure_verify_latency,
+    run_in_background,
+    set_hashing_policy,
+)
+from dev_kit.modules.users.models import Base, User
+from dev_kit.modules.users.services import UserService
+
+
+@pytest.fixture
+def executor():
+    executor = HashingExecutor(max_workers=1, max_pending=0)
+    yield executor
+    executor.shutdown()
+
+
+def test_hashes_roundtrip_on_the_pool(executor):
+    pwhash = executor.generate_password_hash("s3cret-pass", "pbkdf2:sha256:1000")
+    assert pwhash.startswith("pbkdf2:sha256:1000")
+    assert executor.check_password_hash(pwhash, "s3cret-pass") is True
+    assert executor.check_password_hash(pwhash, "wrong") is False
+    metrics = executor.metrics()
+    assert metrics["completed"] == 3 and metrics["in_flight"] == 0
+    assert metrics["latency_max"] >= metrics["latency_avg"] > 0
+
+
+def test_saturated_executor_sheds_load(executor):
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+
+    worker = threading.Thread(target=executor.run, args=(slow,))
+    worker.start()
+    started.wait(5)
+    try:
+        with pytest.raises(ServiceUnavailableError) as excinfo:
+            executor.check_password_hash("pbkdf2:sha256:1$x$y", "pw")
+        assert excinfo.value.status_code == 503
+        assert excinfo.value.headers == {"Retry-After": "1"}
+        assert executor.metrics()["in_flight"] == 1
+        assert executor.metrics()["rejected"] == 1
+    finally:
+        release.set()
+        worker.join()
+
+
+def test_configure_hashing_from_app_config():
+    class App:
+        config = {"HASHING_MAX_WORKERS": 2, "HASHING_MAX_PENDING": 3}
+
+    previous = get_hashing_executor()
+    try:
+        executor = configure_hashing(App())
+        assert get_hashing_executor() is executor
+        assert (executor.max_workers, executor.max_pending) == (2, 3)
+    finally:
+        configure_hashing(type("App", (), {"config": {}})())
+        assert get_hashing_executor() is not previous
+
+
+def test_policy_normalizes_method_strings():
+    assert HashingPolicy("scrypt").method == "scrypt:32768:8:1"
+    assert HashingPolicy("pbkdf2").method == "pbkdf2:sha256:1000000"
+    assert HashingPolicy("pbkdf2:sha512:1000") == HashingPolicy("pbkdf2:sha512:1000")
+    with pytest.raises(ValueError):
+        HashingPolicy("md5")
+
+
+def test_needs_rehash_on_any_parameter_change():
+    policy = HashingPolicy("pbkdf2:sha256:1000")
+    assert policy.needs_rehash(policy.hash("pw-123456")) is False
+    assert policy.needs_rehash(HashingPolicy("pbkdf2:sha256:500").hash("pw-123456")) is True
+    assert policy.needs_rehash(HashingPolicy("scrypt:1024:8:1").hash("pw-123456")) is True
+    assert policy.needs_rehash("legacy-unknown$salt$hash") is True
+    assert policy.needs_rehash(None) is False
+
+
+def test_set_password_uses_current_policy():
+    previous = get_hashing_policy()
+    set_hashing_policy(HashingPolicy("pbkdf2:sha256:1000"))
+    try:
+        user = User()
+        user.set_password("pw-123456")
+        assert user.password_hash.startswith("pbkdf2:sha256:1000$")
+        assert user.check_password("pw-123456")
+    finally:
+        set_hashing_policy(previous)
+
+
+def test_rehash_is_compare_and_swap(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'rehash.db'}")
+    Base.metadata.create_all(engine)
+    old_hash = HashingPolicy("pbkdf2:sha256:500").hash("pw-123456")
+    with Session(engine) as session:
+        user = User(username="rehash", password_hash=old_hash)
+        session.add(user)
+        session.commit()
+        user_id, updated_at = user.id, user.updated_at
+
+    previous = get_hashing_policy()
+    set_hashing_policy(HashingPolicy("pbkdf2:sha256:1000"))
+    try:
+        assert UserService._rehash_password(engine, user_id, old_hash, "pw-123456") is True
+        # A second attempt with the stale hash must not overwrite the new one.
+        assert UserService._rehash_password(engine, user_id, old_hash, "pw-123456") is False
+    finally:
+        set_hashing_policy(previous)
+
+    with Session(engine) as session:
+        user = session.get(User, user_id)
+        assert user.password_hash.startswith("pbkdf2:sha256:1000$")
+        assert user.check_password("pw-123456")
+        assert user.updated_at == updated_at
+    engine.dispose()
+
+
+def test_background_jobs_are_bounded_and_deduplicated(monkeypatch):
+    monkeypatch.setattr(hashing, "BACKGROUND_MAX_PENDING", 3)
+    release = threading.Event()
+    run_in_background(release.wait)
+    try:
+        first = run_in_background(lambda: "rehashed", key=("rehash", 1))
+        assert run_in_background(lambda: "again", key=("rehash", 1)) is first
+        assert run_in_background(lambda: None, key=("rehash", 2)) is not None
+        # Full: dropped, to be retried by the next login
+        assert run_in_background(lambda: None, key=("rehash", 3)) is None
+    finally:
+        release.set()
+    assert first.result(timeout=5) == "rehashed"
+    # Finished jobs free their slot
+    deadline = time.monotonic() + 5
+    while hashing._background_jobs and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert run_in_background(lambda: "later", key=("rehash", 3)).result(timeout=5) == "later"
+
+
+def test_measure_verify_latency():
+    assert measure_verify_latency(HashingPolicy("pbkdf2:sha256:1000"), rounds=3) > 0
@@ -0,0 +1,100 @@
+import uuid
+
+import pytest
+from apiflask import APIFlask
+from sqlalchemy import event
+
+from dev_kit.database.extensions import db
+from dev_kit.modules.users import services
+from dev_kit.modules.users.models import Base, Permission, Role, User, UserRoleAssociation
+from dev_kit.modules.users.services import RolePermissionCache
+
+
+@pytest.fixture
+def user_with_roles(db_session):
+    """A user holding three roles with overlapping permissions."""
+    tag = uuid.uuid4().hex[:8]
+    perms = [Permission(name=f"{tag}:p{i}") for i in range(4)]
+    roles = [Role(name=f"{tag}-r{i}", display_name=str(i)) for i in range(3)]
+    roles[0].permissions = perms[:2]
+    roles[1].permissions = perms[1:3]
+    roles[2].is_system_role = True
+    user = User(username=f"{tag}-u", password_hash="x")
+    db_session.add_all([user, *roles, *perms])
+    db_session.flush()
+    db_session.add_all(UserRoleAssociation(user_id=user.id, role_id=r.id) for r in roles)
+    db_session.flush()
+    return user, roles, perms
+
+
+@pytest.fixture
+def selects(db_session):
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            seen.append(statement)
+
+    connection = db_session.connection()
+    event.listen(connection, "before_cursor_execute", record)
+    yield seen
+    event.remove(connection, "before_cursor_execute", record)
+
+
+def test_grants_resolve_in_one_query_then_from_cache(db_session, user_with_roles, selects):
+    user, roles, perms = user_with_roles
+    cache = RolePermissionCache()
+
+    grants = cache.grants_for_user(db_session, user.id)
+    assert grants.roles == [r.name for r in roles]
+    assert grants.permissions == sorted(p.name for p in perms[:3])
+    assert grants.is_super_admin is True
+    assert len(selects) == 1
+
+    assert cache.grants_for_user(db_session, user.id) == grants
+    assert len(selects) == 1
+
+
+def test_invalidating_a_role_reloads_it(db_session, user_with_roles):
+    user, roles, perms = user_with_roles
+    cache = RolePermissionCache()
+    cache.grants_for_user(db_session, user.id)
+
+    roles[2].permissions.append(perms[3])
+    db_session.flush()
+    assert perms[3].name not in cache.grants_for_user(db_session, user.id).permissions
+
+    cache.invalidate_roles([roles[2].id])
+    assert perms[3].name in cache.grants_for_user(db_session, user.id).permissions
+
+
+def test_user_without_roles_has_no_grants(db_session):
+    user = User(username=f"{uuid.uuid4().hex[:8]}-lonely", password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    grants = RolePermissionCache().grants_for_user(db_session, user.id)
+    assert grants.roles == [] and grants.permissions == [] and grants.is_super_admin is False
+
+
+@pytest.mark.parametrize("service_name", ["role_service", "permission_service"])
+def test_role_and_permission_writes_clear_the_cache_again_on_commit(service_name):
+    app = APIFlask(__name__)
+    app.config.update(TESTING=True, SQLALCHEMY_DATABASE_URI="sqlite:///:memory:")
+    db.init_app(app)
+    cache = services.role_permission_cache
+    with app.app_context():
+        Base.metadata.create_all(db.engine)
+        role = Role(name="editor", display_name="Editor")
+        role.permissions.append(Permission(name="update:post"))
+        user = User(username="eve", password_hash="x")
+        db.session.add_all([role, user])
+        db.session.flush()
+        db.session.add(UserRoleAssociation(user_id=user.id, role_id=role.id))
+        db.session.commit()
+
+        getattr(services, service_name).update(1, {"description": "changed"})
+        # A login racing the commit caches what it read before the write landed
+        cache.grants_for_user(db.session, user.id)
+        assert cache._cached_roles(user.id) is not None
+        db.session.commit()
+        assert cache._cached_roles(user.id) is None
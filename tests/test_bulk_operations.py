@@ -0,0 +1,115 @@
+# tests/test_bulk_operations.py
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from dev_kit.modules.users.models import Permission, Role, User, UserRoleAssociation
+from dev_kit.modules.users.services import UserService
+from dev_kit.services import BaseService
+
+
+@pytest.fixture
+def prefix():
+    return f"bulk-{uuid.uuid4().hex[:8]}-"
+
+
+def test_bulk_create_returns_entities_in_order(user_service, prefix):
+    result = user_service.bulk_create(
+        [{"username": f"{prefix}{i}", "password_hash": "x"} for i in range(5)], chunk_size=2
+    )
+    assert result.failures == []
+    assert [u.username for u in result.items] == [f"{prefix}{i}" for i in range(5)]
+    assert all(u.id is not None and u.uuid for u in result.items)
+
+
+def test_bulk_create_reports_failing_rows_without_aborting(user_service, prefix):
+    user_service.create({"username": f"{prefix}taken", "password_hash": "x"})
+    rows = [
+        {"username": f"{prefix}a", "password_hash": "x"},
+        {"username": f"{prefix}taken", "password_hash": "x"},
+        {"username": f"{prefix}b", "password_hash": "x"},
+    ]
+    result = user_service.bulk_create(rows, chunk_size=10)
+    assert [u.username for u in result.items] == [f"{prefix}a", f"{prefix}b"]
+    assert [(f.index, f.error_code) for f in result.failures] == [(1, "DUPLICATE_ENTRY")]
+
+
+def test_user_service_batches_pre_create_checks(db_session, prefix):
+    service = UserService(model=User, db_session=db_session)
+    service.create({"username": f"{prefix}old", "password": "abc12345"})
+    result = service.bulk_create(
+        [
+            {"username": f"{prefix}old", "password": "abc12345"},
+            {"username": f"{prefix}new", "password": "short"},
+            {"username": f"{prefix}ok", "password": "abc12345"},
+            {"username": f"{prefix}ok", "password": "abc12345"},
+        ]
+    )
+    assert [u.username for u in result.items] == [f"{prefix}ok"]
+    assert result.items[0].check_password("abc12345")
+    assert [f.index for f in result.failures] == [0, 1, 3]
+
+
+def test_bulk_update_by_uuid(user_service, prefix):
+    created = user_service.bulk_create(
+        [{"username": f"{prefix}{i}", "password_hash": "x"} for i in range(3)]
+    ).items
+    items = [{"uuid": u.uuid, "data": {"is_active": False}} for u in created]
+    items.append({"uuid": "missing", "data": {"is_active": False}})
+    items.append({"data": {"is_active": False}})
+
+    result = user_service.bulk_update(items, id_field="uuid")
+    assert len(result.items) == 3
+    assert all(u.is_active is False for u in result.items)
+    assert [(f.index, f.error_code) for f in result.failures] == [
+        (3, "NOT_FOUND"),
+        (4, "BUSINESS_LOGIC_ERROR"),
+    ]
+
+
+def test_bulk_delete_soft_and_hard(user_service, prefix):
+    created = user_service.bulk_create(
+        [{"username": f"{prefix}{i}", "password_hash": "x"} for i in range(4)]
+    ).items
+    ids = [u.id for u in created]
+
+    soft = user_service.bulk_delete(ids[:2] + [999_999], soft=True)
+    assert soft.items == ids[:2]
+    assert [f.index for f in soft.failures] == [2]
+    assert user_service.get_by_id(ids[0]) is None
+    assert user_service.get_by_id(ids[0], include_soft_deleted=True) is not None
+
+    hard = user_service.bulk_delete(ids[2:], soft=False)
+    assert hard.items == ids[2:]
+    assert user_service.get_by_id(ids[3], include_soft_deleted=True) is None
+
+
+def test_hard_bulk_delete_leaves_no_orphaned_association_rows(db_session, prefix):
+    permission = Permission(name=f"{prefix}perm")
+    doomed, kept = (Role(name=f"{prefix}{n}", display_name=n, permissions=[permission]) for n in "ab")
+    admin, member = (User(username=f"{prefix}{n}", password_hash="x") for n in ("admin", "member"))
+    db_session.add_all([doomed, kept, admin, member])
+    db_session.flush()
+    db_session.add_all(
+        UserRoleAssociation(user_id=member.id, role_id=role.id, assigned_by_user_id=admin.id)
+        for role in (doomed, kept)
+    )
+    db_session.flush()
+
+    BaseService(model=Role, db_session=db_session).bulk_delete([doomed.id], soft=False)
+    role_permissions = Permission.role_permissions
+    assert db_session.execute(
+        select(role_permissions.c.role_id).where(role_permissions.c.permission_id == permission.id)
+    ).scalars().all() == [kept.id]
+    assert db_session.scalars(
+        select(UserRoleAssociation.role_id).where(UserRoleAssociation.user_id == member.id)
+    ).all() == [kept.id]
+
+    # Users they assigned roles to keep the roles, without an assigner
+    UserService(model=User, db_session=db_session).bulk_delete([admin.id], soft=False)
+    assignment = db_session.scalars(
+        select(UserRoleAssociation).where(UserRoleAssociation.user_id == member.id)
+    ).one()
+    db_session.refresh(assignment)
+    assert assignment.assigned_by_user_id is None
@@ -29,5 +29,10 @@ def test_seed_default_auth_idempotent(tmp_path):
 
     # Smoke test CLI
     runner = CliRunner()
-    result = runner.invoke(cli_main, ["--admin-username", "admin", "--admin-password", "pw"])
+    # Its own database: a stale one would lack columns added by later migrations
+    result = runner.invoke(
+        cli_main,
+        ["--admin-username", "admin", "--admin-password", "pw"],
+        env={"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path}/cli.db"},
+    )
     assert result.exit_code == 0
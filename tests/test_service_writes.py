@@ -0,0 +1,59 @@
+# tests/test_service_writes.py
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+from dev_kit.modules.users.models import Role, User
+from dev_kit.services import BaseService, server_generated_attributes
+
+
+@pytest.fixture
+def statements(db_session):
+    """Records the SQL statements issued on the test connection."""
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    connection = db_session.connection()
+    event.listen(connection, "before_cursor_execute", record)
+    yield seen
+    event.remove(connection, "before_cursor_execute", record)
+
+
+def test_server_generated_attributes():
+    assert set(server_generated_attributes(User)) == {"created_at", "updated_at", "version"}
+    assert server_generated_attributes(None) == ()
+
+
+def _selects(statements):
+    return [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+
+def test_create_and_update_skip_the_refresh_select(db_session, statements):
+    service = BaseService(model=Role, db_session=db_session)
+    name = f"r-{uuid.uuid4().hex[:8]}"
+
+    role = service.create({"name": name, "display_name": "Before"})
+    assert role.created_at is not None and role.updated_at is not None
+    assert _selects(statements) == []
+
+    statements.clear()
+    service.update(role.id, {"display_name": "After"})
+    assert role.display_name == "After"
+    assert role.updated_at is not None
+    # The entity comes from the identity map and nothing is reloaded after the UPDATE.
+    assert _selects(statements) == []
+
+
+def test_missing_server_values_are_loaded_by_column(db_session, statements):
+    service = BaseService(model=Role, db_session=db_session)
+    role = service.create({"name": f"r-{uuid.uuid4().hex[:8]}", "display_name": "X"})
+    db_session.expire(role, ["updated_at"])
+    statements.clear()
+
+    service._load_server_generated(role)
+    assert role.updated_at is not None
+    assert len(statements) == 1
+    assert "roles.updated_at" in statements[0] and "roles.name" not in statements[0]
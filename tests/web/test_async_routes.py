@@ -0,0 +1,103 @@
+# tests/web/test_async_routes.py
+import asyncio
+
+import pytest
+
+pytest.importorskip("greenlet")
+pytest.importorskip("aiosqlite")
+pytest.importorskip("asgiref")
+
+from apiflask import APIBlueprint, APIFlask  # noqa: E402
+from flask_jwt_extended import JWTManager, create_access_token  # noqa: E402
+from sqlalchemy.ext.asyncio import (  # noqa: E402
+    async_scoped_session,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import NullPool  # noqa: E402
+
+from dev_kit.async_services import AsyncBaseService  # noqa: E402
+from dev_kit.modules.users.models import Base, Role  # noqa: E402
+from dev_kit.web.async_routing import register_async_crud_routes  # noqa: E402
+from dev_kit.web.schemas import create_crud_schemas  # noqa: E402
+
+
+@pytest.fixture
+def app(tmp_path):
+    """An app exposing async CRUD routes for `Role` at /items, over aiosqlite."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'routes.db'}", poolclass=NullPool)
+    session = async_scoped_session(
+        async_sessionmaker(engine, expire_on_commit=False), scopefunc=asyncio.current_task
+    )
+
+    async def seed():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(engine)() as s:
+            s.add_all(Role(name=f"role{i:02d}", display_name=f"Role {i}") for i in range(12))
+            await s.commit()
+
+    asyncio.run(seed())
+
+    app = APIFlask(__name__)
+    app.config["TESTING"] = True
+    app.config["JWT_SECRET_KEY"] = "async-routes-secret"
+    JWTManager(app)
+    bp = APIBlueprint("items", __name__, url_prefix="/items")
+    register_async_crud_routes(
+        bp=bp,
+        service=AsyncBaseService(model=Role, db_session=session),
+        schemas=create_crud_schemas(Role),
+        entity_name="role",
+        id_field="id",
+        routes_config={"list": {"compiled_serializer": False}},
+    )
+    app.register_blueprint(bp)
+    yield app
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def headers(app):
+    with app.app_context():
+        token = create_access_token(identity="tester", additional_claims={"is_super_admin": True})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_async_list_and_get(app, headers):
+    client = app.test_client()
+    listed = client.get("/items/?per_page=5&sort_by=-name", headers=headers).get_json()
+    assert listed["pagination"]["total"] == 12
+    assert listed["items"][0]["name"] == "role11"
+
+    cursor_page = client.get("/items/?per_page=5&cursor=&fields=name", headers=headers).get_json()
+    assert cursor_page["items"][0] == {"name": "role00"}
+    assert cursor_page["pagination"]["next_cursor"]
+
+    assert client.get("/items/3", headers=headers).get_json()["name"] == "role02"
+    assert client.get("/items/999", headers=headers).status_code == 404
+    assert client.get("/items/").status_code != 200
+
+
+def test_async_writes_are_committed(app, headers):
+    client = app.test_client()
+    created = client.post("/items/", json={"name": "new", "display_name": "New"}, headers=headers)
+    assert created.status_code == 201
+    item_id = created.get_json()["id"]
+
+    renamed = {"name": "new", "display_name": "Renamed"}
+    updated = client.patch(f"/items/{item_id}", json=renamed, headers=headers)
+    assert updated.get_json()["display_name"] == "Renamed"
+    assert client.get(f"/items/{item_id}", headers=headers).get_json()["display_name"] == "Renamed"
+
+    assert client.delete(f"/items/{item_id}", headers=headers).status_code == 200
+    assert client.get(f"/items/{item_id}", headers=headers).status_code == 404
+
+
+def test_async_permission_checks(app):
+    with app.app_context():
+        token = create_access_token(identity="reader", additional_claims={"permissions": ["x"]})
+    resp = app.test_client().post(
+        "/items/", json={"name": "nope", "display_name": "No"}, headers={"Authorization": f"Bearer {token}"}
+    )
+    assert resp.status_code == 403
@@ -0,0 +1,472 @@
+# tests/web/test_crud_routes.py
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from apiflask import APIBlueprint, APIFlask
+from flask_jwt_extended import JWTManager, create_access_token
+
+from dev_kit.database.cache import LRUTTLCache
+from dev_kit.database.extensions import db
+from dev_kit.modules.users.models import Base, Role
+from dev_kit.services import BaseService
+from dev_kit.web.routing import register_crud_routes
+from dev_kit.web.schemas import create_crud_schemas
+
+
+@pytest.fixture
+def make_app():
+    """Builds an app exposing generic CRUD routes for `Role` at /items."""
+
+    def _make(service_class=BaseService, **register_kwargs):
+        app = APIFlask(__name__)
+        app.config["TESTING"] = True
+        app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+        app.config["JWT_SECRET_KEY"] = "crud-routes-secret"
+        db.init_app(app)
+        JWTManager(app)
+
+        bp = APIBlueprint("items", __name__, url_prefix="/items")
+        service = service_class(model=Role, db_session=db.session)
+        register_crud_routes(
+            bp=bp,
+            service=service,
+            schemas=create_crud_schemas(Role),
+            entity_name="role",
+            id_field="id",
+            **register_kwargs,
+        )
+        app.register_blueprint(bp)
+        with app.app_context():
+            Base.metadata.create_all(db.engine)
+            for i in range(12):
+                db.session.add(Role(name=f"role{i:02d}", display_name=f"Role {i}"))
+            db.session.commit()
+        return app
+
+    return _make
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def headers(app):
+    with app.app_context():
+        token = create_access_token(identity="tester", additional_claims={"is_super_admin": True})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_list_uses_page_numbers_by_default(client, headers):
+    resp = client.get("/items/?per_page=5", headers=headers)
+    assert resp.status_code == 200
+    pagination = resp.get_json()["pagination"]
+    assert pagination["total"] == 12
+    assert pagination["page"] == 1
+    assert "next_cursor" not in pagination
+
+
+def test_list_cursor_mode_exposes_cursors(client, headers):
+    first = client.get("/items/?per_page=5&sort_by=name&cursor=", headers=headers).get_json()
+    assert [r["name"] for r in first["items"]] == [f"role{i:02d}" for i in range(5)]
+    assert "page" not in first["pagination"]
+    assert first["pagination"]["prev_cursor"] is None
+    next_cursor = first["pagination"]["next_cursor"]
+
+    second = client.get(
+        f"/items/?per_page=5&sort_by=name&cursor={next_cursor}", headers=headers
+    ).get_json()
+    assert [r["name"] for r in second["items"]] == [f"role{i:02d}" for i in range(5, 10)]
+    assert second["pagination"]["has_prev"] is True
+
+
+def test_list_rejects_bad_cursor(client, headers):
+    resp = client.get("/items/?cursor=garbage", headers=headers)
+    assert resp.status_code == 400
+
+
+def test_list_count_none_reports_inexact_total(client, headers):
+    resp = client.get("/items/?per_page=5&count=none", headers=headers)
+    pagination = resp.get_json()["pagination"]
+    assert pagination["total"] is None
+    assert pagination["total_is_exact"] is False
+    assert pagination["has_next"] is True
+
+
+def test_list_cached_count(client, headers):
+    pagination = client.get("/items/?count=cached", headers=headers).get_json()["pagination"]
+    assert pagination["total"] == 12
+
+
+def test_batch_routes_are_opt_in(client, headers):
+    assert client.post("/items/batch", json={"items": []}, headers=headers).status_code in (404, 405)
+
+
+def test_batch_routes(make_app):
+    app = make_app(
+        routes_config={
+            "bulk_create": {"enabled": True},
+            "bulk_update": {"enabled": True},
+            "bulk_delete": {"enabled": True},
+        }
+    )
+    client = app.test_client()
+    with app.app_context():
+        token = create_access_token(identity="tester", additional_claims={"is_super_admin": True})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    created = client.post(
+        "/items/batch",
+        json={"items": [{"name": "bulk-a", "display_name": "A"}, {"name": "role00", "display_name": "Dup"}]},
+        headers=headers,
+    )
+    assert created.status_code == 200
+    body = created.get_json()
+    assert [r["name"] for r in body["items"]] == ["bulk-a"]
+    assert body["errors"][0]["index"] == 1
+
+    # The routes don't commit the outer transaction, so work on the seeded rows.
+    updated = client.patch(
+        "/items/batch",
+        json={"items": [{"id": 1, "data": {"display_name": "Renamed"}}]},
+        headers=headers,
+    ).get_json()
+    assert updated["items"][0]["display_name"] == "Renamed"
+
+    deleted = client.delete("/items/batch", json={"ids": [2, 424242]}, headers=headers).get_json()
+    assert deleted["deleted"] == [2]
+    assert deleted["errors"][0]["error_code"] == "NOT_FOUND"
+
+
+def test_loading_spec_is_validated_at_registration(make_app):
+    with pytest.raises(ValueError):
+        make_app(routes_config={"list": {"loading": {"owner": "joined"}}})
+
+
+def test_list_with_explicit_loading(make_app):
+    app = make_app(routes_config={"list": {"loading": {"permissions": "selectin"}}})
+    with app.app_context():
+        token = create_access_token(identity="tester", additional_claims={"is_super_admin": True})
+    resp = app.test_client().get("/items/?per_page=3", headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 200
+    assert len(resp.get_json()["items"]) == 3
+
+
+def test_sparse_fieldsets(client, headers):
+    listed = client.get("/items/?per_page=2&sort_by=name&fields=name,id", headers=headers).get_json()
+    assert listed["items"] == [{"id": 1, "name": "role00"}, {"id": 2, "name": "role01"}]
+    assert listed["pagination"]["total"] == 12
+
+    cursor_page = client.get("/items/?per_page=2&cursor=&fields=name", headers=headers).get_json()
+    assert cursor_page["items"] == [{"name": "role00"}, {"name": "role01"}]
+    assert cursor_page["pagination"]["next_cursor"]
+
+    item = client.get("/items/3?fields=display_name", headers=headers).get_json()
+    assert item == {"display_name": "Role 2"}
+
+
+def test_sparse_fieldsets_reject_unknown_fields(client, headers):
+    resp = client.get("/items/?fields=name,permissions", headers=headers)
+    assert resp.status_code == 422
+    assert "fields" in resp.get_json()["errors"]
+
+
+def test_compiled_serializer_opt_out_gives_the_same_payload(make_app):
+    compiled_app = make_app()
+    schema_app = make_app(
+        routes_config={"list": {"compiled_serializer": False}, "get": {"compiled_serializer": False}}
+    )
+    with compiled_app.app_context():
+        token = create_access_token(identity="tester", additional_claims={"is_super_admin": True})
+    headers = {"Authorization": f"Bearer {token}"}
+    for url in ("/items/?per_page=5", "/items/1", "/items/?fields=name&cursor="):
+        compiled = compiled_app.test_client().get(url, headers=headers)
+        plain = schema_app.test_client().get(url, headers=headers)
+        assert compiled.status_code == plain.status_code == 200
+        assert compiled.get_json() == plain.get_json()
+
+
+def test_export_is_opt_in(client, headers):
+    assert client.get("/items/export", headers=headers).status_code != 200
+
+
+@pytest.fixture
+def export_app(make_app):
+    return make_app(routes_config={"export": {"enabled": True, "batch_size": 5}})
+
+
+def test_export_streams_ndjson(export_app, headers):
+    resp = export_app.test_client().get(
+        "/items/export?sort_by=-name&fields=id,name", headers=headers
+    )
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/x-ndjson"
+    assert resp.is_streamed
+    assert 'filename="roles.ndjson"' in resp.headers["Content-Disposition"]
+    lines = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+    assert len(lines) == 12
+    assert lines[0] == {"id": 12, "name": "role11"}
+
+
+def test_export_csv(export_app, headers):
+    resp = export_app.test_client().get("/items/export?format=csv", headers=headers)
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/csv"
+    rows = list(csv.reader(io.StringIO(resp.get_data(as_text=True))))
+    header, body = rows[0], rows[1:]
+    assert "name" in header and "permissions" not in header
+    assert [row[header.index("name")] for row in body] == [f"role{i:02d}" for i in range(12)]
+    assert body[0][header.index("description")] == ""
+
+
+def test_export_follows_list_auth(make_app):
+    app = make_app(routes_config={"export": {"enabled": True}, "list": {"auth_required": False}})
+    assert app.test_client().get("/items/export?format=csv").status_code == 200
+    client = make_app(routes_config={"export": {"enabled": True}}).test_client()
+    assert client.get("/items/export").status_code == client.get("/items/").status_code != 200
+
+
+def test_get_answers_conditional_requests(client, headers):
+    first = client.get("/items/1", headers=headers)
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert "Last-Modified" in first.headers
+
+    cached = client.get("/items/1", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.data == b""
+
+    since = client.get(
+        "/items/1", headers={**headers, "If-Modified-Since": first.headers["Last-Modified"]}
+    )
+    assert since.status_code == 304
+    narrowed = client.get("/items/1?fields=name", headers={**headers, "If-None-Match": etag})
+    assert narrowed.status_code == 200
+    assert client.get("/items/999", headers={**headers, "If-None-Match": etag}).status_code == 404
+
+
+def test_list_etag_follows_the_query_and_the_rows(client, headers):
+    etag = client.get("/items/?per_page=5", headers=headers).headers["ETag"]
+    conditional = {**headers, "If-None-Match": etag}
+    assert client.get("/items/?per_page=5", headers=conditional).status_code == 304
+    assert client.get("/items/?per_page=5&page=2", headers=conditional).status_code == 200
+
+    client.post("/items/", json={"name": "role12", "display_name": "Role 12"}, headers=headers)
+    assert client.get("/items/?per_page=5", headers=conditional).status_code == 200
+
+
+def test_conditional_can_be_disabled(make_app):
+    app = make_app(routes_config={"get": {"conditional": False}})
+    with app.app_context():
+        token = create_access_token(identity="tester", additional_claims={"is_super_admin": True})
+    resp = app.test_client().get("/items/1", headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 200
+    assert "ETag" not in resp.headers
+
+
+@pytest.fixture
+def cached_app(make_app):
+    return make_app(response_cache=LRUTTLCache(max_entries=100, ttl=None))
+
+
+def test_response_cache_serves_compressed_bytes(cached_app, headers):
+    client = cached_app.test_client()
+    gzipped = {**headers, "Accept-Encoding": "gzip"}
+    first = client.get("/items/?per_page=12", headers=gzipped)
+    assert first.status_code == 200
+    assert first.headers["Content-Encoding"] == "gzip"
+    assert {"Accept-Encoding", "Authorization"} <= set(first.vary)
+    plain = client.get("/items/?per_page=12", headers=headers)
+    assert "Content-Encoding" not in plain.headers
+    assert json.loads(gzip.decompress(first.data)) == plain.get_json()
+
+    second = client.get("/items/?per_page=12", headers=gzipped)
+    assert second.data == first.data
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert client.get("/items/?per_page=12", headers={**gzipped, "If-None-Match": first.headers["ETag"]}).status_code == 304
+
+    tiny = client.get("/items/1?fields=name", headers=gzipped)
+    assert tiny.get_json() == {"name": "role00"}
+    assert "Content-Encoding" not in tiny.headers
+
+
+def test_response_cache_is_invalidated_by_writes(cached_app, headers):
+    client = cached_app.test_client()
+    assert client.get("/items/", headers=headers).get_json()["pagination"]["total"] == 12
+    client.post("/items/", json={"name": "role12", "display_name": "Role 12"}, headers=headers)
+    assert client.get("/items/", headers=headers).get_json()["pagination"]["total"] == 13
+
+
+def test_response_cache_keys_by_permission_scope(cached_app, headers):
+    with cached_app.app_context():
+        token = create_access_token(identity="reader", additional_claims={"permissions": ["read:role"]})
+    client = cached_app.test_client()
+    client.get("/items/", headers=headers)
+    reader = client.get("/items/", headers={"Authorization": f"Bearer {token}"})
+    assert reader.status_code == 200
+    assert client.get("/items/").status_code != 200
+
+
+def test_response_cache_dumps_schema_output(make_app, headers):
+    app = make_app(
+        response_cache=LRUTTLCache(), routes_config={"get": {"compiled_serializer": False}}
+    )
+    client = app.test_client()
+    first = client.get("/items/2", headers=headers)
+    assert first.status_code == 200
+    assert first.get_json()["name"] == "role01"
+    assert client.get("/items/2", headers=headers).data == first.data
+
+
+def test_etags_change_with_writes_in_the_same_second(client, headers):
+    # updated_at has a one-second resolution on SQLite: the ETag can't rely on it
+    for url in ("/items/1", "/items/?per_page=5"):
+        etag = client.get(url, headers=headers).headers["ETag"]
+        conditional = {**headers, "If-None-Match": etag}
+        assert client.get(url, headers=conditional).status_code == 304
+
+        name = f"renamed{len(url)}"
+        resp = client.patch("/items/1", json={"name": name, "display_name": name}, headers=headers)
+        assert resp.status_code == 200
+        fresh = client.get(url, headers=conditional)
+        assert fresh.status_code == 200
+        assert name in fresh.get_data(as_text=True)
+        assert fresh.headers["ETag"] != etag
+
+
+@pytest.fixture
+def note_app(tmp_path):
+    """Builds an app exposing CRUD routes for a `Note` model, with or without a version."""
+    from sqlalchemy import Column, String
+    from sqlalchemy.orm import declarative_base
+
+    from dev_kit.database.mixins import IDMixin, TimestampMixin, VersionMixin
+
+    def _make(versioned: bool):
+        NoteBase = declarative_base()
+        mixins = (IDMixin, TimestampMixin, VersionMixin) if versioned else (IDMixin, TimestampMixin)
+        Note = type(
+            "Note", (NoteBase, *mixins), {"__tablename__": "notes", "title": Column(String(50), nullable=False)}
+        )
+
+        app = APIFlask(__name__)
+        app.config.update(
+            TESTING=True,
+            SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'notes.db'}",
+            JWT_SECRET_KEY="crud-routes-secret",
+        )
+        db.init_app(app)
+        JWTManager(app)
+        bp = APIBlueprint("notes", __name__, url_prefix="/notes")
+        register_crud_routes(
+            bp=bp,
+            service=BaseService(model=Note, db_session=db.session),
+            schemas=create_crud_schemas(Note),
+            entity_name="note",
+            id_field="id",
+        )
+        app.register_blueprint(bp)
+        with app.app_context():
+            NoteBase.metadata.create_all(db.engine)
+            db.session.add(Note(title="draft"))
+            db.session.commit()
+            token = create_access_token(identity="tester", additional_claims={"is_super_admin": True})
+        return app, {"Authorization": f"Bearer {token}"}
+
+    return _make
+
+
+def count_queries(app, client, *args, **kwargs):
+    """Sends a GET and returns the response with the number of statements it ran."""
+    from sqlalchemy import event
+
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        resp = client.get(*args, **kwargs)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return resp, len(seen)
+
+
+def test_versioned_models_answer_if_none_match_from_the_probe(note_app):
+    app, headers = note_app(versioned=True)
+    client = app.test_client()
+
+    for url, reads in (("/notes/1", 1), ("/notes/", 2)):
+        first, queries = count_queries(app, client, url, headers=headers)
+        assert queries == reads
+        conditional = {**headers, "If-None-Match": first.headers["ETag"]}
+        cached = client.get(url, headers=conditional)
+        assert cached.status_code == 304
+        # Now carrying the probe's ETag, if the first one hashed the body
+        conditional = {**headers, "If-None-Match": cached.headers["ETag"]}
+        resp, queries = count_queries(app, client, url, headers=conditional)
+        assert (resp.status_code, queries) == (304, 1)
+
+        client.patch("/notes/1", json={"title": f"final{len(url)}"}, headers=headers)
+        assert client.get(url, headers=conditional).status_code == 200
+
+
+def test_unversioned_etags_change_with_writes_in_the_same_second(note_app):
+    app, headers = note_app(versioned=False)
+    client = app.test_client()
+
+    for url, reads in (("/notes/1", 1), ("/notes/", 2)):
+        first, queries = count_queries(app, client, url, headers=headers)
+        assert queries == reads
+        conditional = {**headers, "If-None-Match": first.headers["ETag"]}
+        # No version to probe: the body is read and hashed again
+        resp, queries = count_queries(app, client, url, headers=conditional)
+        assert (resp.status_code, queries) == (304, reads)
+        assert resp.headers["ETag"] == first.headers["ETag"]
+
+        title = f"final{len(url)}"
+        client.patch("/notes/1", json={"title": title}, headers=headers)
+        fresh = client.get(url, headers=conditional)
+        assert fresh.status_code == 200
+        assert title in fresh.get_data(as_text=True)
+        assert fresh.headers["ETag"] != first.headers["ETag"]
+
+
+def test_requests_without_validators_skip_the_probe(app, client, headers):
+    assert count_queries(app, client, "/items/1", headers=headers)[1] == 1
+    assert count_queries(app, client, "/items/?per_page=5", headers=headers)[1] == 2
+    since = {**headers, "If-Modified-Since": "Thu, 01 Jan 2099 00:00:00 GMT"}
+    resp, queries = count_queries(app, client, "/items/1", headers=since)
+    assert (resp.status_code, queries) == (304, 1)
+
+
+class LegacyService(BaseService):
+    """Overrides written before the read methods took loading/columns/count."""
+
+    def get_by_id(self, id_, include_soft_deleted=False):
+        return super().get_by_id(id_, include_soft_deleted)
+
+    def paginate(self, page=1, per_page=10, filters=None, order_by=None, include_soft_deleted=False):
+        return super().paginate(page, per_page, filters, order_by, include_soft_deleted)
+
+
+def test_legacy_read_overrides_keep_working(make_app, headers):
+    client = make_app(service_class=LegacyService).test_client()
+    assert client.get("/items/1", headers=headers).get_json()["name"] == "role00"
+    assert client.get("/items/1?fields=name", headers=headers).get_json() == {"name": "role00"}
+    resp = client.get("/items/?per_page=5&count=none&fields=name", headers=headers)
+    assert resp.status_code == 200
+    assert resp.get_json()["items"][0] == {"name": "role00"}
@@ -2,10 +2,10 @@
 
 import pytest
 from flask import Flask, jsonify
-from flask_jwt_extended import JWTManager, create_access_token
+from flask_jwt_extended import JWTManager, create_access_token, jwt_required, verify_jwt_in_request
 from unittest.mock import patch
 
-from dev_kit.web.decorators import permission_required, log_activity
+from dev_kit.web.decorators import permission_required, permission_scope, log_activity
 from dev_kit.exceptions import PermissionDeniedError
 
 
@@ -28,6 +28,17 @@ def app():
     def protected_route():
         return jsonify(message="success"), 200
 
+    @app.route("/any")
+    @permission_required("read:data", "read:reports", mode="any")
+    def any_route():
+        return jsonify(message="success"), 200
+
+    @app.route("/all")
+    @jwt_required()
+    @permission_required("read:data", "read:reports")
+    def all_route():
+        return jsonify(message="success"), 200
+
     # Create another route for testing the logger
     @app.route("/logged")
     @log_activity
@@ -90,6 +101,47 @@ def test_permission_granted_for_super_admin(app, client):
     assert response.status_code == 200
 
 
+def _headers(app, permissions):
+    with app.app_context():
+        token = create_access_token(identity="testuser", additional_claims={"permissions": permissions})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_permission_modes(app, client):
+    """Tests 'any' and 'all' modes over several permissions."""
+    assert client.get("/any", headers=_headers(app, ["read:reports"])).status_code == 200
+    assert client.get("/any", headers=_headers(app, ["write:data"])).status_code == 403
+    assert client.get("/all", headers=_headers(app, ["read:data"])).status_code == 403
+    assert client.get("/all", headers=_headers(app, ["read:reports", "read:data"])).status_code == 200
+    assert client.get("/all").status_code == 401
+
+
+def test_token_verified_by_jwt_required_is_reused(app, client):
+    """Tests that a token already verified for the request isn't decoded again."""
+    headers = _headers(app, ["read:data", "read:reports"])
+    with patch("dev_kit.web.decorators.verify_jwt_in_request") as verify:
+        assert client.get("/all", headers=headers).status_code == 200
+        verify.assert_not_called()
+
+
+def test_permission_required_validates_arguments():
+    with pytest.raises(ValueError):
+        permission_required()
+    with pytest.raises(ValueError):
+        permission_required("read:data", mode="some")
+
+
+def test_permission_scope_ignores_permission_order(app):
+    scopes = []
+    for permissions in (["b", "a"], ["a", "b"], ["a"]):
+        with app.test_request_context(headers=_headers(app, permissions)):
+            verify_jwt_in_request()
+            scopes.append(permission_scope())
+    assert scopes[0] == scopes[1] != scopes[2]
+    with app.test_request_context():
+        assert permission_scope() is None
+
+
 # --- Test for log_activity ---
 def test_log_activity_decorator(app, client):
     """Tests that the log_activity decorator calls the logger."""
@@ -0,0 +1,87 @@
+# tests/web/test_instrumentation.py
+import logging
+import re
+
+import pytest
+from apiflask import APIBlueprint, APIFlask
+from flask_jwt_extended import JWTManager, create_access_token
+
+from dev_kit.database.extensions import db
+from dev_kit.modules.users.models import Base, Role
+from dev_kit.services import BaseService
+from dev_kit.web.instrumentation import init_sql_instrumentation
+from dev_kit.web.routing import register_crud_routes
+from dev_kit.web.schemas import create_crud_schemas
+
+
+@pytest.fixture
+def make_app():
+    def _make(**config):
+        app = APIFlask(__name__)
+        app.config.update(
+            TESTING=True,
+            SQLALCHEMY_DATABASE_URI="sqlite:///:memory:",
+            JWT_SECRET_KEY="instrumentation-secret",
+        )
+        app.config.update({"SQL_INSTRUMENTATION": True, **config})
+        db.init_app(app)
+        JWTManager(app)
+        init_sql_instrumentation(app)
+
+        bp = APIBlueprint("items", __name__, url_prefix="/items")
+        service = BaseService(model=Role, db_session=db.session)
+        register_crud_routes(
+            bp=bp, service=service, schemas=create_crud_schemas(Role), entity_name="role", id_field="id"
+        )
+
+        @bp.get("/one-by-one")
+        def one_by_one():
+            for id_ in range(1, 7):
+                db.session.expunge_all()
+                db.session.get(Role, id_)
+            return {"ok": True}
+
+        app.register_blueprint(bp)
+        with app.app_context():
+            Base.metadata.create_all(db.engine)
+            db.session.add_all(Role(name=f"role{i}", display_name=f"Role {i}") for i in range(6))
+            db.session.commit()
+            token = create_access_token(identity="tester", additional_claims={"is_super_admin": True})
+        return app, {"Authorization": f"Bearer {token}"}
+
+    return _make
+
+
+def test_server_timing_header(make_app):
+    app, headers = make_app()
+    resp = app.test_client().get("/items/", headers=headers)
+    assert resp.status_code == 200
+    timing = resp.headers["Server-Timing"]
+    assert re.match(r'db;dur=[\d.]+;desc="\d+ queries", serialize;dur=[\d.]+, total;dur=[\d.]+$', timing)
+    assert 'desc="2 queries"' in timing  # The count and the page
+
+
+def test_repeated_statements_are_reported(make_app, caplog):
+    app, _ = make_app()
+    with caplog.at_level(logging.WARNING):
+        app.test_client().get("/items/one-by-one")
+    messages = [r.getMessage() for r in caplog.records]
+    assert any("Possible N+1 query in items.one_by_one: the same statement ran 6 times" in m for m in messages)
+
+
+def test_query_budgets(make_app, caplog):
+    app, headers = make_app(SQL_QUERY_BUDGET=10, SQL_QUERY_BUDGETS={"items.list_items": 1})
+    client = app.test_client()
+    with caplog.at_level(logging.WARNING):
+        client.get("/items/1", headers=headers)
+        client.get("/items/", headers=headers)
+    messages = [r.getMessage() for r in caplog.records if "Query budget" in r.getMessage()]
+    assert len(messages) == 1
+    assert messages[0].startswith("Query budget exceeded in items.list_items: 2 statements (budget 1)")
+
+
+def test_disabled_by_default(make_app):
+    app, headers = make_app(SQL_INSTRUMENTATION=False)
+    resp = app.test_client().get("/items/", headers=headers)
+    assert resp.status_code == 200
+    assert "Server-Timing" not in resp.headers
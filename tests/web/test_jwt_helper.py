@@ -1,7 +1,22 @@
+import time
+
+import pytest
 from apiflask import APIFlask
-from flask_jwt_extended import JWTManager, create_access_token
+from flask_jwt_extended import JWTManager, create_access_token, get_jwt, jwt_required
+from sqlalchemy import create_engine, inspect
 
-from dev_kit.web.jwt import configure_jwt, default_blocklist
+from dev_kit.web.jwt import (
+    BloomFilter,
+    BloomFilteredBlocklist,
+    InMemoryKeyValueStore,
+    MemoryTokenBlocklist,
+    SharedStoreTokenBlocklist,
+    SQLTokenBlocklist,
+    configure_jwt,
+    default_blocklist,
+    get_blocklist,
+    revoke_token,
+)
 
 
 def test_jwt_configure_and_blocklist(tmp_path):
@@ -20,3 +35,140 @@ def test_jwt_configure_and_blocklist(tmp_path):
     # We need to decode jwt to get jti; here we rely on blocklist API contract (would be handled by a logout endpoint)
     # For test simplicity, we just assert helper registration didn't crash and blocklist is callable
     assert callable(default_blocklist.is_revoked)
+
+
+def test_memory_blocklist_expires_and_stays_bounded():
+    blocklist = MemoryTokenBlocklist(max_entries=3)
+    now = time.time()
+    blocklist.add("expired", now - 1)
+    assert blocklist.is_revoked("expired") is False
+
+    for i in range(5):
+        blocklist.add(f"jti-{i}", now + 100 + i)
+    assert len(blocklist) == 3
+    # The entries closest to expiry were dropped first
+    assert [blocklist.is_revoked(f"jti-{i}") for i in range(5)] == [False, False, True, True, True]
+    assert blocklist.is_revoked(None) is False
+
+
+def test_sql_blocklist_roundtrip_and_purge(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/blocklist.db")
+    blocklist = SQLTokenBlocklist(engine, purge_interval=3600)
+    now = time.time()
+    blocklist.add("live", now + 60)
+    blocklist.add("live", now + 60)  # duplicates are ignored
+    blocklist.add("old", now - 60)
+
+    assert blocklist.is_revoked("live") is True
+    assert blocklist.is_revoked("old") is False
+    assert blocklist.is_revoked("unknown") is False
+    assert blocklist.purge() == 1
+    # Purges scan expires_at, incremental syncs revoked_at
+    indexed = {tuple(ix["column_names"]) for ix in inspect(engine).get_indexes("token_blocklist")}
+    assert {("expires_at",), ("revoked_at",)} <= indexed
+    engine.dispose()
+
+
+def test_shared_store_blocklist_uses_store_expiry():
+    store = InMemoryKeyValueStore()
+    blocklist = SharedStoreTokenBlocklist(store)
+    blocklist.add("live", time.time() + 60)
+    blocklist.add("gone", time.time() - 60)
+    assert blocklist.is_revoked("live") is True
+    assert blocklist.is_revoked("gone") is False
+    assert store.exists("jwt:blocklist:live") == 1
+
+
+def test_logout_revokes_the_presented_token():
+    app = APIFlask(__name__)
+    app.config.update(JWT_SECRET_KEY="secret", SQLALCHEMY_DATABASE_URI="sqlite://")
+    jwt = JWTManager(app)
+    blocklist = MemoryTokenBlocklist()
+    configure_jwt(jwt, blocklist)
+
+    @app.post("/logout")
+    @jwt_required()
+    def logout():
+        revoke_token(get_jwt())
+        return {"message": "ok"}
+
+    @app.get("/private")
+    @jwt_required()
+    def private():
+        return {"message": "ok"}
+
+    with app.app_context():
+        token = create_access_token(identity="uuid-1")
+        assert get_blocklist() is blocklist
+    headers = {"Authorization": f"Bearer {token}"}
+    client = app.test_client()
+    assert client.get("/private", headers=headers).status_code == 200
+    assert client.post("/logout", headers=headers).status_code == 200
+    resp = client.get("/private", headers=headers)
+    assert resp.status_code == 401
+    assert resp.get_json()["error_code"] == "TOKEN_REVOKED"
+
+
+class CountingBlocklist(MemoryTokenBlocklist):
+    def __init__(self):
+        super().__init__()
+        self.lookups = 0
+
+    def is_revoked(self, jti):
+        self.lookups += 1
+        return super().is_revoked(jti)
+
+
+def test_bloom_filter_has_no_false_negatives_and_meets_error_target():
+    bloom = BloomFilter(capacity=2000, error_rate=0.01)
+    members = [f"member-{i}" for i in range(2000)]
+    for member in members:
+        bloom.add(member)
+    assert all(member in bloom for member in members)
+    false_positives = sum(f"other-{i}" in bloom for i in range(20000))
+    assert false_positives / 20000 < 0.02
+    assert 0.005 < bloom.estimated_error_rate() < 0.02
+
+
+def test_bloom_filtered_blocklist_only_consults_store_for_positives():
+    store = CountingBlocklist()
+    store.add("revoked-before", time.time() + 60)
+    blocklist = BloomFilteredBlocklist(store, capacity=100, error_rate=0.001)
+
+    assert blocklist.is_revoked("revoked-before") is True
+    blocklist.add("revoked-after", time.time() + 60)
+    assert blocklist.is_revoked("revoked-after") is True
+    assert store.lookups == 2
+
+    assert not any(blocklist.is_revoked(f"fresh-{i}") for i in range(200))
+    assert store.lookups < 10
+    metrics = blocklist.metrics()
+    assert metrics["lookups"] == 202
+    assert metrics["filter_hit_rate"] > 0.9
+    assert metrics["filter_entries"] == 2
+
+
+@pytest.mark.parametrize("backend", ["sql", "shared"])
+def test_bloom_filter_syncs_revocations_from_other_processes(tmp_path, backend):
+    if backend == "sql":
+        engine = create_engine(f"sqlite:///{tmp_path}/shared.db")
+        make_store = lambda: SQLTokenBlocklist(engine)  # noqa: E731
+    else:
+        kv = InMemoryKeyValueStore()
+        make_store = lambda: SharedStoreTokenBlocklist(kv)  # noqa: E731
+
+    worker_a = BloomFilteredBlocklist(make_store(), sync_interval=0)
+    worker_b = BloomFilteredBlocklist(make_store(), sync_interval=0)
+    assert worker_b.is_revoked("jti-1") is False  # initial build
+
+    worker_a.add("jti-1", time.time() + 60)
+    assert worker_b.is_revoked("jti-1") is True
+    assert worker_b.metrics()["filter_entries"] >= 1
+
+
+def test_configure_jwt_can_wrap_the_blocklist_in_a_bloom_filter():
+    jwt = JWTManager()
+    store = MemoryTokenBlocklist()
+    configure_jwt(jwt, store, bloom_filter=True)
+    assert isinstance(jwt.blocklist, BloomFilteredBlocklist)
+    assert jwt.blocklist.store is store
@@ -0,0 +1,158 @@
+# tests/web/test_metrics.py
+import json
+import re
+import threading
+
+import pytest
+from apiflask import APIBlueprint, APIFlask
+from flask_jwt_extended import JWTManager, create_access_token
+
+from dev_kit.database.cache import LRUTTLCache
+from dev_kit.database.extensions import db
+from dev_kit.modules.users.models import Base, Role
+from dev_kit.services import BaseService
+from dev_kit.web.metrics import (
+    MetricsRegistry,
+    MultiProcessStore,
+    init_metrics,
+    render,
+)
+from dev_kit.web.routing import register_crud_routes
+from dev_kit.web.schemas import create_crud_schemas
+
+
+def test_render_histogram_and_counter():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    hits = registry.counter("hits_total", "Hits.", ("path",))
+    latency.observe(0.05, "a")
+    latency.observe(0.1, "a")
+    latency.observe(5, "a")
+    hits.inc('say "hi"\n')
+
+    text = render(registry.collect())
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{route="a",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{route="a",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{route="a",le="+Inf"} 3' in text
+    assert 'latency_seconds_sum{route="a"} 5.15' in text
+    assert 'latency_seconds_count{route="a"} 3' in text
+    assert 'hits_total{path="say \\"hi\\"\\n"} 1.0' in text
+
+
+def test_thread_shards_are_merged_and_retired():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(1.0,))
+    requests = registry.counter("requests_total", "Requests.")
+
+    def work():
+        for _ in range(1000):
+            latency.observe(0.5)
+            requests.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latency.observe(2.0)
+
+    families = {family.name: family for family in registry.collect()}
+    assert families["requests_total"].samples == {(): 8000}
+    assert families["latency_seconds"].samples[()][:2] == [8000, 1]
+    # Exited threads were folded into a single shard
+    assert len(latency._shards) == 1
+    assert registry.collect()[0].samples[()][:2] == [8000, 1]
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = APIFlask(__name__)
+    app.config.update(
+        TESTING=True,
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'metrics.db'}",
+        JWT_SECRET_KEY="metrics-secret",
+    )
+    db.init_app(app)
+    JWTManager(app)
+    cache = LRUTTLCache()
+    bp = APIBlueprint("items", __name__, url_prefix="/items")
+    register_crud_routes(
+        bp=bp,
+        service=BaseService(model=Role, db_session=db.session, cache=cache),
+        schemas=create_crud_schemas(Role),
+        entity_name="role",
+        id_field="id",
+    )
+    app.register_blueprint(bp)
+    metrics = init_metrics(app, db)
+    metrics.track_cache("roles", cache)
+    with app.app_context():
+        Base.metadata.create_all(db.engine)
+        db.session.add(Role(name="admin", display_name="Admin"))
+        db.session.commit()
+    return app
+
+
+def test_endpoint_metrics_are_exposed(app):
+    client = app.test_client()
+    with app.app_context():
+        token = create_access_token(identity="tester", additional_claims={"is_super_admin": True})
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get("/items/1", headers=headers)
+    client.get("/items/1", headers=headers)
+    client.get("/items/1")
+    client.get("/nowhere")
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.content_type.startswith("text/plain; version=0.0.4")
+    text = resp.get_data(as_text=True)
+    assert 'dev_kit_http_requests_total{method="GET",endpoint="items.get_item",status="200"} 2.0' in text
+    assert 'dev_kit_http_requests_total{method="GET",endpoint="unmatched",status="404"} 1.0' in text
+    assert 'dev_kit_http_request_duration_seconds_count{method="GET",endpoint="items.get_item"} 3' in text
+    assert 'dev_kit_http_response_size_bytes_count{method="GET",endpoint="items.get_item"} 3' in text
+    # Only the scrape itself is in flight
+    assert 'dev_kit_http_requests_in_flight{method="GET",endpoint="items.get_item"} 0.0' in text
+    assert 'dev_kit_http_requests_in_flight{method="GET",endpoint="dev_kit_metrics"} 1.0' in text
+    assert 'dev_kit_db_pool_connections{bind="default",state="checkedout"}' in text
+    assert re.search(r'dev_kit_cache_operations_total\{cache="roles",result="hits"\} [1-9]', text)
+    assert "/metrics" not in app.spec["paths"]
+
+
+def test_multiprocess_mode_sums_processes(app, tmp_path):
+    directory = tmp_path / "metrics"
+    store = MultiProcessStore(str(directory))
+    # A worker that has exited: its counters count, its gauges don't
+    dead = {
+        "pid": 2**22 + 1,
+        "families": [
+            {
+                "name": "dev_kit_http_requests_total",
+                "kind": "counter",
+                "documentation": "Requests answered.",
+                "labelnames": ["method", "endpoint", "status"],
+                "samples": [[["GET", "unmatched", "404"], 5]],
+                "buckets": [],
+            },
+            {
+                "name": "dev_kit_http_requests_in_flight",
+                "kind": "gauge",
+                "documentation": "Requests being processed.",
+                "labelnames": ["method", "endpoint"],
+                "samples": [[["GET", "unmatched"], 3]],
+                "buckets": [],
+            },
+        ],
+    }
+    (directory / f"metrics-{dead['pid']}.json").write_text(json.dumps(dead))
+
+    metrics = app.extensions["dev_kit.metrics"]
+    metrics.store = store
+    client = app.test_client()
+    client.get("/nowhere")
+    text = client.get("/metrics").get_data(as_text=True)
+
+    assert 'dev_kit_http_requests_total{method="GET",endpoint="unmatched",status="404"} 6' in text
+    assert 'dev_kit_http_requests_in_flight{method="GET",endpoint="unmatched"} 0' in text
+    assert any(path.name.startswith("metrics-") for path in directory.iterdir())
@@ -0,0 +1,66 @@
+# tests/web/test_permissions.py
+import pytest
+
+from dev_kit.web.permissions import PermissionBitRegistry, PermissionRegistry
+
+
+def test_registry_assigns_stable_bits():
+    registry = PermissionRegistry()
+    assert registry.mask(["a", "b"]) == 0b11
+    assert registry.mask(["b"]) == 0b10
+    assert len(registry) == 2
+
+
+def test_bitset_round_trip_and_version():
+    rows = [(1, "read"), (2, "write"), (9, "admin")]
+    registry = PermissionBitRegistry(loader=lambda: rows)
+    value = registry.encode(["read", "admin"])
+    assert value.startswith("9.")
+    assert registry.decode(value) == (1 << 1) | (1 << 9)
+    assert registry.mask(["read", "missing"]) == (1 << 1, False)
+
+
+def test_tokens_stay_valid_after_permissions_are_added():
+    rows = [(1, "read"), (2, "write")]
+    registry = PermissionBitRegistry(loader=lambda: list(rows), min_refresh_interval=0)
+    old_token = registry.encode(["write"])
+
+    rows.append((3, "export"))
+    registry.invalidate()
+    assert registry.encode(["export"]).startswith("3.")
+
+    granted = registry.decode(old_token)
+    required, complete = registry.mask(["write"])
+    assert complete and granted & required == required
+    assert not granted & registry.mask(["export"])[0]
+
+
+def test_newer_token_version_reloads_registry():
+    rows = [(1, "read")]
+    registry = PermissionBitRegistry(loader=lambda: list(rows), min_refresh_interval=0)
+    registry.mask(["read"])
+    rows.append((2, "write"))
+    # Minted by a process that had already seen permission 2
+    newer = PermissionBitRegistry(loader=lambda: list(rows))
+    registry.decode(newer.encode(["read", "write"]))
+    assert registry.version == 2
+
+
+def test_decode_rejects_bits_beyond_version():
+    registry = PermissionBitRegistry(loader=lambda: [(1, "read")])
+    registry.refresh()
+    with pytest.raises(ValueError):
+        registry.decode(f"1.{registry.epoch(1)}.CA")
+
+
+def test_tokens_are_retired_when_a_permission_is_deleted():
+    rows = [(1, "read"), (2, "write")]
+    registry = PermissionBitRegistry(loader=lambda: list(rows), min_refresh_interval=0)
+    old_token = registry.encode(["read", "write"])
+
+    # Permission 2 is deleted and its id handed to a new permission
+    rows[1] = (2, "delete")
+    registry.invalidate()
+    assert registry.encode(["delete"]).startswith("2.")
+    with pytest.raises(ValueError):
+        registry.decode(old_token)
@@ -0,0 +1,63 @@
+# tests/web/test_query_stats_routes.py
+import pytest
+from apiflask import APIBlueprint, APIFlask
+from flask_jwt_extended import JWTManager, create_access_token
+
+from dev_kit.database.extensions import db
+from dev_kit.database.query_stats import init_query_stats
+from dev_kit.modules.users.models import Base, Role
+from dev_kit.web.query_stats import register_query_stats_routes
+
+
+@pytest.fixture
+def app():
+    app = APIFlask(__name__)
+    app.config.update(
+        TESTING=True,
+        SQLALCHEMY_DATABASE_URI="sqlite:///:memory:",
+        JWT_SECRET_KEY="query-stats-secret",
+        SLOW_QUERY_THRESHOLD=None,
+    )
+    db.init_app(app)
+    JWTManager(app)
+    stats = init_query_stats(app, db)
+    bp = APIBlueprint("admin", __name__, url_prefix="/admin")
+    register_query_stats_routes(bp, stats)
+    app.register_blueprint(bp)
+    with app.app_context():
+        Base.metadata.create_all(db.engine)
+        db.session.add(Role(name="admin", display_name="Admin"))
+        db.session.commit()
+        db.session.get(Role, 1)
+    return app
+
+
+def _headers(app, **claims):
+    with app.app_context():
+        token = create_access_token(identity="tester", additional_claims=claims)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_admin_lists_and_resets_stats(app):
+    client = app.test_client()
+    headers = _headers(app, is_super_admin=True)
+    resp = client.get("/admin/query-stats?sort=calls", headers=headers)
+    assert resp.status_code == 200
+    entries = resp.get_json()
+    assert len(client.get("/admin/query-stats?limit=1", headers=headers).get_json()) == 1
+    assert {"fingerprint", "calls", "rows", "total_ms", "mean_ms", "p95_ms", "max_ms"} <= set(entries[0])
+    assert any(e["fingerprint"].startswith("INSERT INTO roles") for e in entries)
+
+    assert client.delete("/admin/query-stats", headers=headers).status_code == 200
+    assert client.get("/admin/query-stats", headers=headers).get_json() == []
+
+
+def test_stats_require_the_permission(app):
+    client = app.test_client()
+    assert client.get("/admin/query-stats").status_code == 401
+    assert client.get("/admin/query-stats", headers=_headers(app)).status_code == 403
+    headers = _headers(app, permissions=["read:query_stats"])
+    assert client.get("/admin/query-stats", headers=headers).status_code == 200
+    assert client.delete("/admin/query-stats", headers=headers).status_code == 403
+    resetter = _headers(app, permissions=["reset:query_stats"])
+    assert client.delete("/admin/query-stats", headers=resetter).status_code == 200
@@ -0,0 +1,72 @@
+# tests/web/test_serializers.py
+import datetime
+import json
+
+import pytest
+from apiflask.fields import Method
+from flask import Flask
+from marshmallow import post_dump
+
+from dev_kit.database.repository import CursorPaginationResult, PaginationResult
+from dev_kit.modules.users.models import User
+from dev_kit.modules.users.schemas import user_schemas
+from dev_kit.web.serializers import CompiledSerializer, json_bytes
+
+
+@pytest.fixture
+def users():
+    now = datetime.datetime(2024, 5, 6, 7, 8, 9, 123456)
+    return [
+        User(
+            id=i,
+            uuid=f"uuid-{i}",
+            username=f"user{i}",
+            password_hash="secret",
+            is_active=bool(i % 2),
+            created_at=now,
+            updated_at=now,
+            last_login_at=None if i % 2 else now,
+        )
+        for i in range(3)
+    ]
+
+
+def test_matches_marshmallow_output(users):
+    serializer = CompiledSerializer.for_schema(user_schemas["main"], User)
+    assert serializer is not None
+    expected = user_schemas["main"](many=True).dump(users)
+    assert serializer.dump_many(users) == expected
+    assert list(serializer.dump(users[0])) == list(expected[0])
+    assert "password_hash" not in expected[0]
+
+
+def test_pages_match_the_pagination_schema(users):
+    serializer = CompiledSerializer.for_schema(user_schemas["main"], User)
+    page_schema = user_schemas["pagination_out"]()
+    page = PaginationResult(users, 3, 1, 10, 1, False, False)
+    assert serializer.dump_page(page) == page_schema.dump(page)
+    cursor_page = CursorPaginationResult(users[:1], 1, True, False, "abc", None)
+    assert serializer.dump_page(cursor_page) == page_schema.dump(cursor_page)
+    assert serializer.only(["username"]).dump(users[0]) == {"username": "user0"}
+
+
+def test_custom_schemas_are_not_compiled():
+    class WithMethod(user_schemas["main"]):
+        extra = Method("get_extra")
+
+        def get_extra(self, obj):
+            return None
+
+    class WithHook(user_schemas["main"]):
+        @post_dump
+        def tweak(self, data, **kwargs):
+            return data
+
+    assert CompiledSerializer.for_schema(WithMethod, User) is None
+    assert CompiledSerializer.for_schema(WithHook, User) is None
+
+
+def test_json_bytes():
+    app = Flask(__name__)
+    with app.app_context():
+        assert json.loads(json_bytes({"a": [1, None, "x"]})) == {"a": [1, None, "x"]}